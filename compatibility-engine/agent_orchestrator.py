@@ -2,27 +2,87 @@ import os
 import subprocess
 import json
 import csv
+import time
+import hashlib
+from multiprocessing.util import Finalize
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import SystemMessage, HumanMessage
 from dependency_conflict import find_dependency_conflicts_semantic
+from endpoint_matcher import prefilter_pair, format_local_reasoning, endpoint_path, PrefilterStats
+from endpoint_index import iter_candidate_pairs, count_cross_service_pairs
+from api_conflict import endpoint_payload
+from llm_cache import open_cache
+from llm_dispatch import LLMDispatcher, iter_windowed, DECIDED_BY_LLM
+from result_writer import StreamingResultWriter, jsonl_path_for, jsonl_to_json
+from java_analysis_client import JavaAnalysisClient, JavaAnalysisError
+from repo_manifest import RepoManifest
+from repo_pool import run_per_repo, parse_jobs
+from agentic_dependency_extractor import collect_dependencies, extract_dependencies_llm_per_file, write_extracted_dependencies
+from pipeline_trace import configure_tracing, get_tracer, trace_args, traced
 
 PROJECT_ROOT = os.path.abspath(os.path.dirname(os.path.dirname(__file__)))
 REPOS_DIR = os.path.join(PROJECT_ROOT, "repos")
 SPRINGBOOT_BACKEND_DIR = os.path.join(PROJECT_ROOT, "springboot-backend")
 ANALYSIS_FILENAME = "analysis_result.json"
+DEPENDENCIES_FILENAME = "extracted_dependencies.json"
 JAR_NAME = "springboot-backend-0.0.1-SNAPSHOT-all.jar"
 JAR_PATH = os.path.join(SPRINGBOOT_BACKEND_DIR, "build", "libs", JAR_NAME)
+FINGERPRINT_PATH = JAR_PATH + ".fingerprint"
+# Inputs of the shadowJar build, relative to SPRINGBOOT_BACKEND_DIR
+BUILD_INPUTS = ["build.gradle", "settings.gradle", os.path.join("src", "main")]
 
 
-def build_java_jar():
-    print(f"Building Java analysis JAR (fat JAR with dependencies) in {SPRINGBOOT_BACKEND_DIR} ...")
-    subprocess.run(["./gradlew", "clean", "shadowJar"], cwd=SPRINGBOOT_BACKEND_DIR, check=True)
-    print(f"JAR built at {JAR_PATH}")
+def compute_build_fingerprint():
+    """sha256 over the paths and contents of every build input, in a stable order."""
+    digest = hashlib.sha256()
+    for entry in BUILD_INPUTS:
+        entry_path = os.path.join(SPRINGBOOT_BACKEND_DIR, entry)
+        if os.path.isfile(entry_path):
+            files = [entry_path]
+        else:
+            files = []
+            for root, dirs, names in os.walk(entry_path):
+                dirs.sort()
+                files.extend(os.path.join(root, name) for name in sorted(names))
+        for path in files:
+            digest.update(os.path.relpath(path, SPRINGBOOT_BACKEND_DIR).encode("utf-8") + b"\0")
+            with open(path, "rb") as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+
+def read_build_fingerprint():
+    try:
+        with open(FINGERPRINT_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def build_java_jar(force_rebuild=False):
+    with get_tracer().span("build_java_jar", rebuilt=False) as span:
+        fingerprint = compute_build_fingerprint()
+        previous = read_build_fingerprint()
+        if not force_rebuild and os.path.exists(JAR_PATH) and previous.get("fingerprint") == fingerprint:
+            saved = previous.get("build_seconds")
+            print(f"Java analysis JAR is up to date ({JAR_PATH}); skipping rebuild"
+                  + (f", saved ~{saved:.1f}s" if saved else ""))
+            return False
+        print(f"Building Java analysis JAR (fat JAR with dependencies) in {SPRINGBOOT_BACKEND_DIR} ...")
+        span.set(rebuilt=True)
+        start = time.monotonic()
+        subprocess.run(["./gradlew", "clean", "shadowJar"], cwd=SPRINGBOOT_BACKEND_DIR, check=True)
+        build_seconds = time.monotonic() - start
+    with open(FINGERPRINT_PATH, "w") as f:
+        json.dump({"fingerprint": fingerprint, "build_seconds": build_seconds}, f)
+    print(f"JAR built at {JAR_PATH} in {build_seconds:.1f}s")
+    return True
 
 
 def discover_repos():
     # Return absolute paths to each repo in REPOS_DIR
-    return [os.path.join(REPOS_DIR, d) for d in os.listdir(REPOS_DIR) if os.path.isdir(os.path.join(REPOS_DIR, d))]
+    # Sorted so per-repo work and merged results come out in a stable order
+    return [os.path.join(REPOS_DIR, d) for d in sorted(os.listdir(REPOS_DIR)) if os.path.isdir(os.path.join(REPOS_DIR, d))]
 
 
 def check_analysis_file(repo_path):
@@ -36,14 +96,181 @@ def run_java_analysis(repo_rel_path):
         "java", "-cp", jar_path, "com.example.springboot_backend.RepoAnalysisModule", repo_rel_path
     ]
     print(f"Running Java analysis: {' '.join(java_cmd)} (cwd={PROJECT_ROOT})")
-    subprocess.run(java_cmd, cwd=PROJECT_ROOT)
+    with get_tracer().span("run_java_analysis", repo=repo_rel_path, mode="jvm"):
+        subprocess.run(java_cmd, cwd=PROJECT_ROOT)
     return f"Analysis complete for {repo_rel_path}"
 
 
-def load_all_endpoints():
-    """Load endpoints from all analysis_result.json files, grouped by service (repo name)."""
+def to_repo_arg(repo):
+    # Convert absolute repo path to relative path from PROJECT_ROOT and ensure leading './'
+    rel_repo_path = os.path.relpath(repo, PROJECT_ROOT)
+    if not rel_repo_path.startswith("./"):
+        rel_repo_path = f"./{rel_repo_path}"
+    return rel_repo_path
+
+
+_analysis_client = None
+_analysis_client_pid = None
+_analysis_daemon_disabled = False
+
+
+def get_analysis_client():
+    """One warm analysis server per process (the main process or a pool worker), started on first use."""
+    global _analysis_client, _analysis_client_pid
+    # A forked pool worker inherits the parent's client object but not a usable pipe to it
+    if _analysis_client is None or _analysis_client_pid != os.getpid() or not _analysis_client.alive:
+        _analysis_client = JavaAnalysisClient(JAR_PATH, PROJECT_ROOT)
+        _analysis_client_pid = os.getpid()
+        _analysis_client.ping()
+        # Shut the server down when this process (or pool worker) exits
+        Finalize(None, _analysis_client.close, exitpriority=10)
+    return _analysis_client
+
+
+def close_analysis_client():
+    global _analysis_client
+    if _analysis_client is not None and _analysis_client_pid == os.getpid():
+        _analysis_client.close()
+    _analysis_client = None
+
+
+def read_fresh_analysis(repo, since):
+    """Load analysis_result.json if it was written at or after `since`, else None."""
+    analysis_path = os.path.join(repo, ANALYSIS_FILENAME)
+    if not os.path.exists(analysis_path) or os.path.getmtime(analysis_path) < since - 1:
+        return None
+    with open(analysis_path) as f:
+        return json.load(f)
+
+
+def analyze_repo(repo, use_daemon=True):
+    """
+    Run static analysis for one repo and return its AnalysisResult payload (None on failure).
+    Uses the warm analysis server; falls back to one JVM per repo if the server is unavailable.
+    analysis_result.json is persisted either way for other tools.
+    """
+    global _analysis_daemon_disabled
+    if use_daemon and not _analysis_daemon_disabled:
+        try:
+            client = get_analysis_client()
+            print(f"Analyzing {repo} via analysis server")
+            with get_tracer().span("run_java_analysis", repo=to_repo_arg(repo), mode="server"):
+                return client.analyze(to_repo_arg(repo))
+        except (JavaAnalysisError, OSError) as e:
+            if _analysis_client is not None and _analysis_client.alive:
+                print(f"[WARN] Analysis failed for {repo}: {e}")
+                return None
+            print(f"[WARN] Analysis server unavailable ({e}); falling back to one JVM per repository")
+            _analysis_daemon_disabled = True
+    started = time.time()
+    run_java_analysis(to_repo_arg(repo))
+    return read_fresh_analysis(repo, started)
+
+
+def prepare_repo(repo, analyze=True, extract=False, use_daemon=True):
+    """
+    Per-repo unit of work for the worker pool: static analysis and/or the local part of
+    dependency extraction. Returns {'analysis': payload or None, 'dependencies': list or None,
+    'llm_jobs': [...], 'errors': [...]}; stages fail independently. Build files that need the
+    LLM are left in llm_jobs for the parent, so all workers share one dispatcher's rate limits.
+    """
+    outcome = {"analysis": None, "dependencies": None, "llm_jobs": [], "errors": []}
+    if analyze:
+        outcome["analysis"] = analyze_repo(repo, use_daemon)
+        if outcome["analysis"] is None:
+            outcome["errors"].append("static analysis produced no result")
+    if extract:
+        try:
+            outcome["dependencies"], outcome["llm_jobs"] = collect_dependencies(repo)
+        except Exception as e:
+            print(f"[WARN] Dependency extraction failed for {repo}: {e}")
+            outcome["errors"].append(f"dependency extraction failed: {e}")
+    return outcome
+
+
+def _prepare_stale_repo(repo, stale_analysis, stale_deps, use_daemon):
+    return prepare_repo(repo, analyze=repo in stale_analysis, extract=repo in stale_deps, use_daemon=use_daemon)
+
+
+def refresh_repos(repos, manifest, analyze=True, extract=False, use_daemon=True, jobs=1):
+    """
+    Re-run static analysis and/or dependency extraction only for repos whose hashes changed
+    (or whose outputs are missing). Changed repos are processed jobs at a time.
+    Returns {service: AnalysisResult payload} for freshly analyzed repos.
+    """
+    stale_analysis, stale_deps = set(), set()
+    for repo in repos:
+        if analyze:
+            if not check_analysis_file(repo):
+                print(f"No analysis file found for {repo}. Running static analysis...")
+                stale_analysis.add(repo)
+            elif not manifest.is_current(repo, "analysis"):
+                print(f"Sources changed since last analysis of {repo}. Running static analysis...")
+                stale_analysis.add(repo)
+            else:
+                print(f"Analysis for {repo} is up to date; reusing {ANALYSIS_FILENAME}.")
+        if extract:
+            if os.path.exists(os.path.join(repo, DEPENDENCIES_FILENAME)) and manifest.is_current(repo, "dependencies"):
+                print(f"Dependencies for {repo} are up to date; reusing {DEPENDENCIES_FILENAME}.")
+            else:
+                print(f"Build files changed for {repo}. Extracting dependencies...")
+                stale_deps.add(repo)
+    work = [repo for repo in repos if repo in stale_analysis or repo in stale_deps]
+    outcomes = run_per_repo(
+        _prepare_stale_repo, work, jobs=jobs, label="prepare",
+        args=(frozenset(stale_analysis), frozenset(stale_deps), use_daemon)
+    )
+    close_analysis_client()
+    finished = [outcome for outcome in outcomes if outcome.ok]
+    extract_with_llm_fallback([(o.repo, o.result) for o in finished if o.result["dependencies"] is not None])
+    results = {}
+    for outcome in finished:
+        repo, result = outcome.repo, outcome.result
+        for error in result["errors"]:
+            print(f"[WARN] {os.path.basename(repo)}: {error}")
+        if result["analysis"] is not None:
+            results[os.path.basename(repo)] = result["analysis"]
+            # Maven->Gradle migration can add files to the repo, so record the post-analysis tree
+            manifest.record(repo, "analysis", rehash=True)
+        if result["dependencies"] is not None:
+            manifest.record(repo, "dependencies")
+    manifest.save()
+    return results
+
+
+def extract_with_llm_fallback(collected, dispatcher=None):
+    """
+    Finish dependency extraction for (repo, prepare_repo result) pairs: the build files the
+    workers could not parse go to the LLM in one batch, through one dispatcher, and each
+    repo's extracted_dependencies.json is written here.
+    """
+    jobs = [(repo, job) for repo, result in collected for job in result["llm_jobs"]]
+    if jobs:
+        print(f"Falling back to the LLM for {len(jobs)} build files in {len({repo for repo, _ in jobs})} repos")
+        answers = extract_dependencies_llm_per_file([job for _, job in jobs], dispatcher or LLMDispatcher.from_env())
+        by_repo = dict(collected)
+        for (repo, _), deps in zip(jobs, answers):
+            by_repo[repo]["dependencies"].extend(deps)
+    for repo, result in collected:
+        try:
+            write_extracted_dependencies(repo, result["dependencies"])
+        except OSError as e:
+            print(f"[WARN] {os.path.basename(repo)}: could not write {DEPENDENCIES_FILENAME}: {e}")
+            result["dependencies"] = None
+
+
+def load_all_endpoints(preloaded=None):
+    """
+    Load endpoints from all analysis_result.json files, grouped by service (repo name).
+    Services present in preloaded (results received from the analysis server) are not re-read from disk.
+    """
+    preloaded = preloaded or {}
     endpoints_by_service = {}
     for repo in discover_repos():
+        service = os.path.basename(repo)
+        if service in preloaded:
+            endpoints_by_service[service] = preloaded[service].get("endpoints") or []
+            continue
         analysis_path = os.path.join(repo, ANALYSIS_FILENAME)
         if os.path.exists(analysis_path):
             with open(analysis_path) as f:
@@ -54,26 +281,29 @@ def load_all_endpoints():
 
 
 def get_all_cross_service_pairs(endpoints_by_service):
-    pairs = []
-    services = list(endpoints_by_service.keys())
-    for i, service_a in enumerate(services):
-        for service_b in services[i+1:]:
-            for ep_a in endpoints_by_service[service_a]:
-                for ep_b in endpoints_by_service[service_b]:
-                    pairs.append((service_a, ep_a, service_b, ep_b))
-    return pairs
+    """Lazily yield (service_a, ep_a, service_b, ep_b) for cross-service endpoints whose routes may overlap."""
+    items = ((service, ep) for service, eps in endpoints_by_service.items() for ep in eps)
+    for (service_a, ep_a), (service_b, ep_b) in iter_candidate_pairs(items):
+        yield service_a, ep_a, service_b, ep_b
 
 
-def llm_api_conflict(ep1, ep2, service_a, service_b, llm):
+ORCHESTRATOR_API_SYSTEM_PROMPT = "You are an expert API reviewer. Your job is to determine if two REST API endpoints from different microservices are functionally equivalent, conflicting, or unrelated. Consider HTTP method, path, and context. Respond with 'Conflict', 'Equivalent', or 'No Conflict', and explain your reasoning."
+
+
+def build_api_conflict_request(ep1, ep2, service_a, service_b):
+    """Return (messages, system_prompt, cache payload) for one cross-service endpoint pair."""
     messages = [
-        SystemMessage(content="You are an expert API reviewer. Your job is to determine if two REST API endpoints from different microservices are functionally equivalent, conflicting, or unrelated. Consider HTTP method, path, and context. Respond with 'Conflict', 'Equivalent', or 'No Conflict', and explain your reasoning."),
+        SystemMessage(content=ORCHESTRATOR_API_SYSTEM_PROMPT),
         HumanMessage(content=(
-            f"Service A: {service_a}\nEndpoint 1: {ep1['httpMethod']} {ep1['path']} (Class: {ep1.get('className')}, Method: {ep1.get('methodName')})\n"
-            f"Service B: {service_b}\nEndpoint 2: {ep2['httpMethod']} {ep2['path']} (Class: {ep2.get('className')}, Method: {ep2.get('methodName')})"
+            f"Service A: {service_a}\nEndpoint 1: {ep1['httpMethod']} {endpoint_path(ep1)} (Class: {ep1.get('className')}, Method: {ep1.get('methodName')})\n"
+            f"Service B: {service_b}\nEndpoint 2: {ep2['httpMethod']} {endpoint_path(ep2)} (Class: {ep2.get('className')}, Method: {ep2.get('methodName')})"
         ))
     ]
-    response = llm.invoke(messages)
-    return response.content
+    payload = {
+        'endpoint_a': dict(endpoint_payload(ep1), service=service_a),
+        'endpoint_b': dict(endpoint_payload(ep2), service=service_b),
+    }
+    return messages, ORCHESTRATOR_API_SYSTEM_PROMPT, payload
 
 
 def load_all_dependencies():
@@ -124,80 +354,110 @@ def llm_dependency_conflict(dep_name, versions_services, llm):
     return response.content
 
 
-def orchestrate_analysis():
-    build_java_jar()
+API_RESULTS_JSON = "api_conflict_results.json"
+API_RESULTS_CSV = "api_conflict_results.csv"
+API_RESULTS_CSV_FIELDS = [
+    'service_a', 'endpoint_a_class', 'endpoint_a_method', 'endpoint_a_http', 'endpoint_a_path',
+    'service_b', 'endpoint_b_class', 'endpoint_b_method', 'endpoint_b_http', 'endpoint_b_path',
+    'llm_reasoning'
+]
+
+
+def api_result_csv_row(r):
+    return {
+        'service_a': r['service_a'],
+        'endpoint_a_class': r['endpoint_a'].get('className'),
+        'endpoint_a_method': r['endpoint_a'].get('methodName'),
+        'endpoint_a_http': r['endpoint_a'].get('httpMethod'),
+        'endpoint_a_path': r['endpoint_a'].get('path'),
+        'service_b': r['service_b'],
+        'endpoint_b_class': r['endpoint_b'].get('className'),
+        'endpoint_b_method': r['endpoint_b'].get('methodName'),
+        'endpoint_b_http': r['endpoint_b'].get('httpMethod'),
+        'endpoint_b_path': r['endpoint_b'].get('path'),
+        'llm_reasoning': r['llm_reasoning']
+    }
+
+
+def api_result_key(service_a, ep1, service_b, ep2):
+    return json.dumps([service_a, endpoint_payload(ep1), service_b, endpoint_payload(ep2)], sort_keys=True)
+
+
+@traced("orchestrate_analysis")
+def orchestrate_analysis(cache=None, dispatcher=None, resume=False, use_daemon=True, force_rebuild=False, jobs=1):
+    build_java_jar(force_rebuild=force_rebuild)
     repos = discover_repos()
-    for repo in repos:
-        if not check_analysis_file(repo):
-            print(f"No analysis file found for {repo}. Running static analysis...")
-            run_java_analysis(repo)
-        else:
-            print(f"Analysis file already exists for {repo}.")
+    manifest = RepoManifest.for_repos_dir(REPOS_DIR)
+    fresh_results = refresh_repos(repos, manifest, analyze=True, use_daemon=use_daemon, jobs=jobs)
     print("All repos analyzed. Ready for LLM reasoning.")
 
     # --- LLM Reasoning Pipeline ---
-    endpoints_by_service = load_all_endpoints()
+    endpoints_by_service = load_all_endpoints(preloaded=fresh_results)
     print(f"Loaded endpoints for services: {list(endpoints_by_service.keys())}")
     pairs = get_all_cross_service_pairs(endpoints_by_service)
-    print(f"Total cross-service endpoint pairs: {len(pairs)}")
-
-    llm = ChatOpenAI(model="gpt-4o")
-    results = []
-    for idx, (service_a, ep1, service_b, ep2) in enumerate(pairs):
-        print(f"\n[{idx+1}/{len(pairs)}] Analyzing: {service_a} {ep1['httpMethod']} {ep1['path']} <-> {service_b} {ep2['httpMethod']} {ep2['path']}")
-        reasoning = llm_api_conflict(ep1, ep2, service_a, service_b, llm)
-        print(f"LLM Reasoning: {reasoning}")
-        results.append({
-            'service_a': service_a,
-            'endpoint_a': ep1,
-            'service_b': service_b,
-            'endpoint_b': ep2,
-            'llm_reasoning': reasoning
-        })
 
-    # Output to JSON
-    with open("api_conflict_results.json", "w") as f:
-        json.dump(results, f, indent=2)
-    print("\nResults written to api_conflict_results.json")
+    # Verdicts are appended to a JSONL file (and CSV) as they complete; resume skips finished pairs
+    writer = StreamingResultWriter(
+        jsonl_path_for(API_RESULTS_JSON),
+        key=lambda r: api_result_key(r['service_a'], r['endpoint_a'], r['service_b'], r['endpoint_b']),
+        resume=resume, csv_path=API_RESULTS_CSV, csv_fieldnames=API_RESULTS_CSV_FIELDS, csv_row=api_result_csv_row
+    )
+    if writer.completed:
+        print(f"Resuming: {len(writer.completed)} pairs already in {writer.jsonl_path}")
+    pairs = (pair for pair in pairs if not writer.is_done(api_result_key(*pair)))
 
-    # Output to CSV
-    with open("api_conflict_results.csv", "w", newline='') as csvfile:
-        fieldnames = [
-            'service_a', 'endpoint_a_class', 'endpoint_a_method', 'endpoint_a_http', 'endpoint_a_path',
-            'service_b', 'endpoint_b_class', 'endpoint_b_method', 'endpoint_b_http', 'endpoint_b_path',
-            'llm_reasoning'
-        ]
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-        writer.writeheader()
-        for r in results:
-            writer.writerow({
-                'service_a': r['service_a'],
-                'endpoint_a_class': r['endpoint_a'].get('className'),
-                'endpoint_a_method': r['endpoint_a'].get('methodName'),
-                'endpoint_a_http': r['endpoint_a'].get('httpMethod'),
-                'endpoint_a_path': r['endpoint_a'].get('path'),
-                'service_b': r['service_b'],
-                'endpoint_b_class': r['endpoint_b'].get('className'),
-                'endpoint_b_method': r['endpoint_b'].get('methodName'),
-                'endpoint_b_http': r['endpoint_b'].get('httpMethod'),
-                'endpoint_b_path': r['endpoint_b'].get('path'),
-                'llm_reasoning': r['llm_reasoning']
+    dispatcher = dispatcher or LLMDispatcher.from_env()
+    stats = PrefilterStats()
+
+    def decide(pair):
+        decision = prefilter_pair(pair[1], pair[3])
+        stats.record(decision)
+        return (format_local_reasoning(*decision), 'prefilter') if decision is not None else None
+
+    verdicts = iter_windowed(
+        pairs, decide,
+        lambda pair: build_api_conflict_request(pair[1], pair[3], pair[0], pair[2]),
+        lambda: ChatOpenAI(model="gpt-4o"), dispatcher, cache
+    )
+    try:
+        for idx, ((service_a, ep1, service_b, ep2), reasoning, decided_by) in enumerate(verdicts):
+            if decided_by == DECIDED_BY_LLM:
+                print(f"\n[{idx+1}] Analyzing: {service_a} {ep1['httpMethod']} {endpoint_path(ep1)} <-> {service_b} {ep2['httpMethod']} {endpoint_path(ep2)}")
+                print(f"LLM Reasoning: {reasoning}")
+            writer.write({
+                'service_a': service_a,
+                'endpoint_a': ep1,
+                'service_b': service_b,
+                'endpoint_b': ep2,
+                'llm_reasoning': reasoning,
+                'decided_by': decided_by
             })
-    print("Results written to api_conflict_results.csv")
+    finally:
+        writer.close()
+    stats.pruned = count_cross_service_pairs(len(eps) for eps in endpoints_by_service.values()) - stats.total - writer.skipped
+    print(f"\nTotal candidate cross-service endpoint pairs: {stats.total}")
+    print(stats.report())
+    print(dispatcher.report())
+    if cache is not None:
+        print(cache.report())
+
+    # Derive the JSON array from the JSONL; the CSV was fanned out as verdicts arrived
+    jsonl_to_json(writer.jsonl_path, API_RESULTS_JSON)
+    print(f"\nResults streamed to {writer.jsonl_path} ({writer.written} new, {writer.skipped} resumed)")
+    print(f"Results written to {API_RESULTS_JSON}")
+    print(f"Results written to {API_RESULTS_CSV}")
 
 
-def orchestrate_dependency_conflict():
-    # Build the Java analysis JAR and run analysis for all repos first
-    build_java_jar()
+@traced("orchestrate_dependency_conflict")
+def orchestrate_dependency_conflict(cache=None, use_daemon=True, force_rebuild=False, jobs=1):
+    # Build the Java analysis JAR (skipped when its inputs are unchanged), then refresh only
+    # the analyses and dependency extractions whose repo hashes changed, jobs repos at a time
+    build_java_jar(force_rebuild=force_rebuild)
     repos = discover_repos()
-    for repo in repos:
-        # Convert absolute repo path to relative path from PROJECT_ROOT and ensure leading './'
-        rel_repo_path = os.path.relpath(repo, PROJECT_ROOT)
-        if not rel_repo_path.startswith("./"):
-            rel_repo_path = f"./{rel_repo_path}"
-        run_java_analysis(rel_repo_path)
-    # Use the modular function to get results
-    results = find_dependency_conflicts_semantic(REPOS_DIR)
+    manifest = RepoManifest.for_repos_dir(REPOS_DIR)
+    refresh_repos(repos, manifest, analyze=True, extract=True, use_daemon=use_daemon, jobs=jobs)
+    # Use the modular function to get results; verdicts for unchanged dependencies come from the LLM cache
+    results = find_dependency_conflicts_semantic(REPOS_DIR, cache=cache)
     # Output to JSON
     with open("dependency_conflict_results.json", "w") as f:
         json.dump(results, f, indent=2)
@@ -218,4 +478,9 @@ def orchestrate_dependency_conflict():
 
 
 if __name__ == "__main__":
-    orchestrate_analysis() 
\ No newline at end of file
+    import sys
+    trace_path, show_progress = trace_args(sys.argv[1:])
+    if trace_path or show_progress:
+        configure_tracing(trace_path, show_progress)
+    orchestrate_analysis(cache=open_cache(), resume="--resume" in sys.argv[1:],
+                         force_rebuild="--force-rebuild" in sys.argv[1:], jobs=parse_jobs(sys.argv[1:])) 
\ No newline at end of file
@@ -4,20 +4,27 @@ import logging
 import re
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
+from llm_dispatch import LLMDispatcher, estimate_tokens
+from build_file_chunker import chunk_build_file, dedupe_dependencies
+from build_file_parser import parse_build_file, BuildFileParseError
+from maven_model import MavenResolver
+from repo_index import KIND_BUILD, get_index, read_text
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
 logger = logging.getLogger(__name__)
 
+EXTRACTION_MODE_NATIVE = "native"
+EXTRACTION_MODE_LLM = "llm"
+
 def find_build_files(repo_dir):
     gradle_files = []
     maven_files = []
-    for root, dirs, files in os.walk(repo_dir):
-        for file in files:
-            if file == "build.gradle":
-                gradle_files.append(os.path.join(root, file))
-            elif file == "pom.xml":
-                maven_files.append(os.path.join(root, file))
+    for build_file in get_index(repo_dir).files(kind=KIND_BUILD, under=repo_dir):
+        if build_file.name in ("build.gradle", "build.gradle.kts"):
+            gradle_files.append(build_file.path)
+        elif build_file.name == "pom.xml":
+            maven_files.append(build_file.path)
     return gradle_files, maven_files
 
 def extract_json_from_llm_response(response_content):
@@ -29,22 +36,25 @@ def extract_json_from_llm_response(response_content):
     cleaned = '\n'.join(cleaned_lines).strip()
     return cleaned
 
-def extract_dependencies_with_llm(file_path, file_type, llm, debug_first_maven=False):
-    with open(file_path, "r") as f:
-        content = f.read()
-    prompt = (
-        f"You are an expert Java build tool analyst. Given the following {file_type} file, extract all dependencies (including those defined via variables, plugins, or parent POMs) and output them as a JSON array of objects with 'name' (group:artifact) and 'version'. If a version is inherited or managed, resolve it if possible. Only output the JSON array, no explanation.\n\n"
+def build_extraction_prompt(content, file_type, part=None):
+    subject = f"{file_type} file" if part is None else f"excerpt ({part[0]} of {part[1]}) of a {file_type} file"
+    return (
+        f"You are an expert Java build tool analyst. Given the following {subject}, extract all dependencies (including those defined via variables, plugins, or parent POMs) and output them as a JSON array of objects with 'name' (group:artifact) and 'version'. If a version is inherited or managed, resolve it if possible. Only output the JSON array, no explanation.\n\n"
         f"{content}"
     )
+
+def log_extraction_prompt(file_path, prompt, debug_first_maven=False):
     if debug_first_maven:
         logger.info(f"[DEBUG] Outgoing prompt for {file_path} (full):\n{prompt}")
     else:
         logger.info(f"Sending prompt to LLM for {file_path} (first 500 chars):\n{prompt[:500]}{'...' if len(prompt) > 500 else ''}")
-    response = llm.invoke(prompt)
+
+def parse_llm_dependencies(response, file_path, file_type, debug_first_maven=False):
     if debug_first_maven:
         logger.info(f"[DEBUG] Full LLM response for {file_path}:\n{getattr(response, 'content', str(response))}")
     else:
         logger.info(f"Raw LLM response for {file_path} (first 500 chars):\n{getattr(response, 'content', str(response))[:500]}{'...' if len(getattr(response, 'content', str(response))) > 500 else ''}")
+    cleaned = None
     try:
         cleaned = extract_json_from_llm_response(response.content)
         if debug_first_maven:
@@ -60,27 +70,124 @@ def extract_dependencies_with_llm(file_path, file_type, llm, debug_first_maven=F
             logger.error(f"[DEBUG] Cleaned response before parsing error for {file_path}:\n{cleaned}")
         return []
 
-def main(repo_dir):
+def build_chunked_prompts(file_path, file_type, budget=None):
+    """Extraction prompts for the dependency regions of a build file, each under the token budget."""
+    chunks = chunk_build_file(read_text(file_path), file_type, budget)
+    if len(chunks) == 1:
+        return [build_extraction_prompt(chunks[0], file_type)]
+    return [build_extraction_prompt(chunk, file_type, (i + 1, len(chunks))) for i, chunk in enumerate(chunks)]
+
+def extract_dependencies_with_llm(file_path, file_type, llm, debug_first_maven=False):
+    deps = []
+    for prompt in build_chunked_prompts(file_path, file_type):
+        log_extraction_prompt(file_path, prompt, debug_first_maven)
+        deps.extend(parse_llm_dependencies(llm.invoke(prompt), file_path, file_type, debug_first_maven))
+    return dedupe_dependencies(deps)
+
+def extract_dependencies_native(jobs, maven_resolver=None):
+    """
+    Parse build files locally. Returns (dependencies, unparsed jobs) where unparsed jobs are
+    the (path, file_type, debug) entries the parser could not handle. With a MavenResolver,
+    pom.xml versions are resolved through parents, dependencyManagement and BOM imports.
+    """
+    deps, unparsed = [], []
+    for file_path, file_type, debug in jobs:
+        try:
+            if file_type == "pom.xml" and maven_resolver is not None:
+                file_deps = maven_resolver.dependencies(file_path)
+            else:
+                file_deps = parse_build_file(file_path, file_type)
+        except (BuildFileParseError, OSError) as e:
+            logger.warning(f"Native parser could not handle {file_path}: {e}")
+            unparsed.append((file_path, file_type, debug))
+            continue
+        logger.info(f"Parsed {len(file_deps)} dependencies from {file_path}")
+        deps.extend(file_deps)
+    return deps, unparsed
+
+def extract_dependencies_llm(jobs, dispatcher):
+    """Send every (path, file_type, debug) build file to the LLM concurrently and parse the answers."""
+    return [dep for deps in extract_dependencies_llm_per_file(jobs, dispatcher) for dep in deps]
+
+def extract_dependencies_llm_per_file(jobs, dispatcher):
+    """Like extract_dependencies_llm, but returns one dependency list per job, in job order."""
+    if not jobs:
+        return []
+    llm = ChatOpenAI(model="gpt-4o")
+    # Every chunk of every file is dispatched in one concurrent batch; owners[i] is the job of prompts[i]
+    prompts, owners = [], []
+    for job_index, (file_path, file_type, debug) in enumerate(jobs):
+        logger.info(f"Extracting dependencies from {file_path}")
+        file_prompts = build_chunked_prompts(file_path, file_type)
+        logger.info(f"{file_path}: {len(file_prompts)} prompt(s), "
+                    f"{sum(estimate_tokens(p) for p in file_prompts)} prompt tokens "
+                    f"(per chunk: {', '.join(str(estimate_tokens(p)) for p in file_prompts)})")
+        for prompt in file_prompts:
+            log_extraction_prompt(file_path, prompt, debug)
+        prompts.extend(file_prompts)
+        owners.extend([job_index] * len(file_prompts))
+    responses = dispatcher.map(llm, prompts, return_exceptions=True)
+    per_file = [[] for _ in jobs]
+    for job_index, response in zip(owners, responses):
+        file_path, file_type, debug = jobs[job_index]
+        if isinstance(response, Exception):
+            logger.error(f"LLM call failed for {file_path}: {response}")
+            continue
+        per_file[job_index].extend(parse_llm_dependencies(response, file_path, file_type, debug))
+    logger.info(dispatcher.report())
+    return [dedupe_dependencies(deps) for deps in per_file]
+
+def build_file_jobs(repo_dir):
     gradle_files, maven_files = find_build_files(repo_dir)
     logger.info(f"Found {len(gradle_files)} build.gradle files and {len(maven_files)} pom.xml files in {repo_dir}")
-    llm = ChatOpenAI(model="gpt-4o")
-    all_deps = []
-    for gradle_file in gradle_files:
-        logger.info(f"Extracting dependencies from {gradle_file}")
-        all_deps.extend(extract_dependencies_with_llm(gradle_file, "build.gradle", llm))
-    logger.info(f"[DEBUG] Number of Maven files found: {len(maven_files)}")
-    for idx, maven_file in enumerate(maven_files):
-        logger.info(f"Extracting dependencies from {maven_file}")
-        debug_first = (idx == 0)
-        all_deps.extend(extract_dependencies_with_llm(maven_file, "pom.xml", llm, debug_first_maven=debug_first))
+    # (path, file_type, debug) for every build file
+    jobs = [(gradle_file, "build.gradle", False) for gradle_file in gradle_files]
+    jobs += [(maven_file, "pom.xml", idx == 0) for idx, maven_file in enumerate(maven_files)]
+    return jobs
+
+def collect_dependencies(repo_dir, mode=EXTRACTION_MODE_NATIVE):
+    """
+    The local part of extraction: returns (dependencies, llm_jobs) where llm_jobs are the
+    (path, file_type, debug) build files still to be sent to the LLM - every file with
+    mode="llm", the ones the native parser could not handle otherwise.
+    """
+    jobs = build_file_jobs(repo_dir)
+    if mode == EXTRACTION_MODE_LLM:
+        return [], jobs
+    maven_resolver = MavenResolver(repo_dir, pom_paths=[path for path, file_type, _ in jobs if file_type == "pom.xml"])
+    deps, unparsed = extract_dependencies_native(jobs, maven_resolver)
+    logger.info(maven_resolver.report())
+    if unparsed:
+        logger.info(f"The native parser could not handle {len(unparsed)} of {len(jobs)} build files")
+    return deps, unparsed
+
+def main(repo_dir, dispatcher=None, mode=EXTRACTION_MODE_NATIVE, llm_fallback=True):
+    """
+    Extract dependencies of every build file in repo_dir into extracted_dependencies.json.
+    mode="native" parses pom.xml/build.gradle locally and, with llm_fallback, sends only the
+    files the parser cannot handle to the LLM; mode="llm" sends every file to the LLM.
+    """
+    all_deps, llm_jobs = collect_dependencies(repo_dir, mode)
+    if llm_jobs and (mode == EXTRACTION_MODE_LLM or llm_fallback):
+        all_deps.extend(extract_dependencies_llm(llm_jobs, dispatcher or LLMDispatcher.from_env()))
+    elif llm_jobs:
+        logger.warning(f"Skipped {len(llm_jobs)} build files the native parser could not handle")
+    write_extracted_dependencies(repo_dir, all_deps)
+
+def write_extracted_dependencies(repo_dir, all_deps):
     output_path = os.path.join(repo_dir, "extracted_dependencies.json")
     with open(output_path, "w") as f:
         json.dump(all_deps, f, indent=2)
+    index = get_index(repo_dir)
+    index.add(output_path)
+    index.save()
     logger.info(f"Extracted dependencies written to {output_path}")
 
 if __name__ == "__main__":
     import sys
-    if len(sys.argv) != 2:
-        logger.error("Usage: python agentic_dependency_extractor.py <repo_dir>")
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if len(args) != 1:
+        logger.error("Usage: python agentic_dependency_extractor.py <repo_dir> [--llm] [--no-llm-fallback]")
         sys.exit(1)
-    main(sys.argv[1]) 
\ No newline at end of file
+    main(args[0], mode=EXTRACTION_MODE_LLM if "--llm" in sys.argv else EXTRACTION_MODE_NATIVE,
+         llm_fallback="--no-llm-fallback" not in sys.argv)
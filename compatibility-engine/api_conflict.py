@@ -1,9 +1,34 @@
 import os
 import json
-from typing import List, Dict, Optional
+from collections import Counter
+from typing import Iterable, List, Dict, Optional
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 from langchain_core.messages import SystemMessage, HumanMessage
+from endpoint_matcher import prefilter_pair, format_local_reasoning, endpoint_path, PrefilterStats
+from endpoint_index import iter_candidate_pairs, count_cross_service_pairs
+from endpoint_similarity import DEFAULT_THRESHOLD, EndpointSimilarity, format_screen_reasoning, numpy_available
+from llm_cache import LLMCache, model_name_of
+from llm_dispatch import LLMDispatcher, iter_windowed, estimate_tokens, COMPLETION_TOKEN_ESTIMATE, DECIDED_BY_LLM
+from pipeline_trace import traced
+from result_writer import StreamingResultWriter, jsonl_path_for, jsonl_to_json, iter_jsonl
+from repo_index import KIND_OUTPUT, indexed_files
+
+API_CONFLICT_SYSTEM_PROMPT = "You are an expert API reviewer. Your job is to determine if two REST API endpoints are functionally equivalent or conflicting, even if their path parameters differ. Consider HTTP method, path, and context. Respond with 'Conflict', 'Equivalent', or 'No Conflict', and explain your reasoning."
+
+# Endpoint fields that influence a verdict; used to build the normalized cache payload
+ENDPOINT_KEY_FIELDS = ('service', 'httpMethod', 'path', 'className', 'methodName')
+
+def endpoint_payload(ep):
+    payload = {k: ep.get(k) for k in ENDPOINT_KEY_FIELDS}
+    if ep.get('classPath'):
+        # Only when set, so cached verdicts for endpoints without a class prefix stay valid
+        payload['classPath'] = ep['classPath']
+    return payload
+
+def pair_key(ep1, ep2):
+    """Stable identity of an endpoint pair, used to skip finished pairs on --resume."""
+    return json.dumps([endpoint_payload(ep1), endpoint_payload(ep2)], sort_keys=True)
 
 # Helper to load endpoints from analysis_result.json
 
@@ -16,64 +41,225 @@ def load_endpoints_from_analysis(analysis_path: str):
         ep['service'] = service_name
     return endpoints
 
-# Generate all cross-service endpoint pairs (Cartesian product, all methods)
+# Lazily generate cross-service endpoint pairs whose method and route may overlap.
+# Each unordered pair is yielded once; see endpoint_index for the bucketing.
 def get_all_cross_service_pairs_all_methods(endpoints):
-    pairs = []
-    n = len(endpoints)
-    for i in range(n):
-        for j in range(n):
-            if i == j:
-                continue
-            ep1, ep2 = endpoints[i], endpoints[j]
-            if ep1['service'] == ep2['service']:
-                continue
-            # Only pair endpoints with the same HTTP method
-            if ep1.get('httpMethod') != ep2.get('httpMethod'):
-                continue
-            pairs.append((ep1, ep2))
-    return pairs
+    for (_, ep1), (_, ep2) in iter_candidate_pairs((ep['service'], ep) for ep in endpoints):
+        yield ep1, ep2
 
 # Use LangChain + GPT-4o to reason about endpoint pairs
 
-def llm_reason_conflict(ep1, ep2, llm):
+def build_conflict_request(ep1, ep2):
+    """Return (messages, system_prompt, cache payload) for one endpoint pair."""
     messages = [
-        SystemMessage(content="You are an expert API reviewer. Your job is to determine if two REST API endpoints are functionally equivalent or conflicting, even if their path parameters differ. Consider HTTP method, path, and context. Respond with 'Conflict', 'Equivalent', or 'No Conflict', and explain your reasoning."),
+        SystemMessage(content=API_CONFLICT_SYSTEM_PROMPT),
         HumanMessage(content=(
-            f"Endpoint 1: {ep1['httpMethod']} {ep1['path']} (Service: {ep1['service']}, Class: {ep1.get('className')}, Method: {ep1.get('methodName')})\n"
-            f"Endpoint 2: {ep2['httpMethod']} {ep2['path']} (Service: {ep2['service']}, Class: {ep2.get('className')}, Method: {ep2.get('methodName')})"
+            f"Endpoint 1: {ep1['httpMethod']} {endpoint_path(ep1)} (Service: {ep1['service']}, Class: {ep1.get('className')}, Method: {ep1.get('methodName')})\n"
+            f"Endpoint 2: {ep2['httpMethod']} {endpoint_path(ep2)} (Service: {ep2['service']}, Class: {ep2.get('className')}, Method: {ep2.get('methodName')})"
         ))
     ]
-    response = llm.invoke(messages)
-    return response.content
+    payload = {'ep1': endpoint_payload(ep1), 'ep2': endpoint_payload(ep2)}
+    return messages, API_CONFLICT_SYSTEM_PROMPT, payload
+
+# --- Batched classification: N pairs per request, JSON-array answer ---
+
+BATCH_SYSTEM_PROMPT = (
+    "You are an expert API reviewer. You will receive a numbered list of REST API endpoint pairs. "
+    "For each pair, determine if the two endpoints are functionally equivalent or conflicting, even if their path parameters differ. "
+    "Consider HTTP method, path, and context. Reply with only a JSON array containing exactly one object per pair, "
+    'of the form {"id": <pair number>, "verdict": "Conflict" | "Equivalent" | "No Conflict", "reasoning": "<short explanation>"}.'
+)
+VALID_VERDICTS = ('Conflict', 'Equivalent', 'No Conflict')
+BATCH_PARSE_RETRIES = 2
+
+def describe_endpoint(ep):
+    return f"{ep['httpMethod']} {endpoint_path(ep)} (Service: {ep['service']}, Class: {ep.get('className')}, Method: {ep.get('methodName')})"
+
+def build_batch_messages(pairs):
+    lines = [f"[{i}] Endpoint 1: {describe_endpoint(ep1)} | Endpoint 2: {describe_endpoint(ep2)}" for i, (ep1, ep2) in enumerate(pairs, start=1)]
+    return [SystemMessage(content=BATCH_SYSTEM_PROMPT), HumanMessage(content="\n".join(lines))]
+
+def parse_batch_response(content, count):
+    """Map pair number (1-based) -> reasoning string for every well-formed entry in a batch answer."""
+    start, end = content.find('['), content.rfind(']')
+    if start < 0 or end <= start:
+        return {}
+    try:
+        entries = json.loads(content[start:end + 1])
+    except ValueError:
+        return {}
+    parsed = {}
+    for entry in entries if isinstance(entries, list) else []:
+        if not isinstance(entry, dict):
+            continue
+        pair_id, verdict = entry.get('id'), entry.get('verdict')
+        if isinstance(pair_id, int) and 1 <= pair_id <= count and verdict in VALID_VERDICTS:
+            parsed[pair_id] = f"{verdict}\n\n{entry.get('reasoning', '')}".rstrip()
+    return parsed
+
+class BatchStats:
+    """Token accounting for batched classification vs. the equivalent per-pair requests."""
 
-def find_api_conflicts_semantic(repos_dir: str, output_path: Optional[str] = None) -> List[Dict]:
+    def __init__(self):
+        self.batches = 0
+        self.pairs = 0
+        self.retried_pairs = 0
+        self.fallback_pairs = 0
+        self.batch_tokens = 0
+        self.per_pair_tokens_estimate = 0
+
+    def report(self) -> str:
+        saved = self.per_pair_tokens_estimate - self.batch_tokens
+        return (
+            f"Batched classification: {self.pairs} pairs in {self.batches} batches, "
+            f"{self.retried_pairs} re-batched after parse failures, {self.fallback_pairs} sent per-pair; "
+            f"~{self.batch_tokens} tokens batched vs ~{self.per_pair_tokens_estimate} tokens per-pair (~{saved} saved)"
+        )
+
+def classify_pairs_batched(llm, pairs, dispatcher: LLMDispatcher, cache: Optional[LLMCache] = None,
+                           batch_size: int = 20, stats: Optional[BatchStats] = None) -> List[str]:
+    """
+    Classify endpoint pairs with batch_size pairs per LLM request. Pairs whose entry is
+    missing or malformed are re-batched; after BATCH_PARSE_RETRIES they fall back to per-pair requests.
+    """
+    stats = stats or BatchStats()
+    model = model_name_of(llm)
+    payloads = [{'ep1': endpoint_payload(ep1), 'ep2': endpoint_payload(ep2)} for ep1, ep2 in pairs]
+    answers: List[Optional[str]] = [None] * len(pairs)
+    pending = []
+    for i, payload in enumerate(payloads):
+        if cache is not None:
+            answers[i] = cache.get(model, BATCH_SYSTEM_PROMPT, payload)
+        if answers[i] is None:
+            pending.append(i)
+    stats.pairs += len(pending)
+    for ep1, ep2 in (pairs[i] for i in pending):
+        stats.per_pair_tokens_estimate += estimate_tokens(build_conflict_request(ep1, ep2)[0]) + COMPLETION_TOKEN_ESTIMATE
+    for attempt in range(BATCH_PARSE_RETRIES + 1):
+        if not pending:
+            break
+        batches = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+        prompts = [build_batch_messages([pairs[i] for i in batch]) for batch in batches]
+        responses = dispatcher.map(llm, prompts, return_exceptions=True)
+        failed = []
+        for batch, prompt, response in zip(batches, prompts, responses):
+            stats.batches += 1
+            if isinstance(response, Exception):
+                print(f"[WARN] Batch of {len(batch)} pairs failed: {response}")
+                failed.extend(batch)
+                continue
+            usage = getattr(response, 'usage_metadata', None) or {}
+            stats.batch_tokens += usage.get('total_tokens') or (estimate_tokens(prompt) + estimate_tokens(response.content))
+            parsed = parse_batch_response(response.content, len(batch))
+            for pair_id, i in enumerate(batch, start=1):
+                if pair_id in parsed:
+                    answers[i] = parsed[pair_id]
+                    if cache is not None:
+                        cache.put(model, BATCH_SYSTEM_PROMPT, payloads[i], parsed[pair_id])
+                else:
+                    failed.append(i)
+        if failed and attempt < BATCH_PARSE_RETRIES:
+            stats.retried_pairs += len(failed)
+        pending = failed
+    if pending:
+        stats.fallback_pairs += len(pending)
+        fallback = dispatcher.map_cached(llm, [build_conflict_request(*pairs[i]) for i in pending], cache)
+        for i, answer in zip(pending, fallback):
+            answers[i] = answer
+    return answers
+
+@traced("api_conflict")
+def find_api_conflicts_semantic(repos_dir: str, output_path: Optional[str] = None, cache: Optional[LLMCache] = None,
+                                dispatcher: Optional[LLMDispatcher] = None, batch_size: int = 1,
+                                resume: bool = False, similarity_threshold: float = DEFAULT_THRESHOLD) -> Iterable[Dict]:
+    """
+    Classify cross-service endpoint pairs. With output_path, verdicts are streamed to
+    <output>.jsonl as they complete (resume=True skips pairs already there), the JSON array
+    is derived at the end and a lazy reader over the JSONL is returned; otherwise a list.
+    Pairs the route prefilter leaves open are only sent to the LLM when their endpoint
+    similarity reaches similarity_threshold (0 sends them all).
+    """
     endpoint_list = []
-    for root, dirs, files in os.walk(repos_dir):
-        for file in files:
-            if file == 'analysis_result.json':
-                analysis_path = os.path.join(root, file)
-                endpoint_list.extend(load_endpoints_from_analysis(analysis_path))
+    for analysis in indexed_files(repos_dir, kind=KIND_OUTPUT, names=['analysis_result.json']):
+        endpoint_list.extend(load_endpoints_from_analysis(analysis.path))
     pairs = get_all_cross_service_pairs_all_methods(endpoint_list)
-    if not pairs:
+    writer = None
+    if output_path:
+        writer = StreamingResultWriter(jsonl_path_for(output_path), key=lambda r: pair_key(r['ep1'], r['ep2']), resume=resume)
+        if writer.completed:
+            print(f"Resuming: {len(writer.completed)} pairs already in {writer.jsonl_path}")
+        pairs = (pair for pair in pairs if not writer.is_done(pair_key(*pair)))
+    dispatcher = dispatcher or LLMDispatcher.from_env()
+    stats = PrefilterStats()
+    similarity = None
+    if similarity_threshold > 0:
+        if numpy_available():
+            similarity = EndpointSimilarity(endpoint_list, threshold=similarity_threshold)
+        else:
+            print("[WARN] NumPy is not installed: skipping the endpoint similarity screen")
+
+    def decide(pair):
+        decision = prefilter_pair(*pair)
+        stats.record(decision)
+        return (format_local_reasoning(*decision), 'prefilter') if decision is not None else None
+
+    def screen(window):
+        # The ambiguous pairs of a dispatch window are scored in one batch
+        decisions = [(format_screen_reasoning(*d), 'similarity') if d is not None else None
+                     for d in similarity.screen(window)]
+        stats.screened += sum(d is not None for d in decisions)
+        return decisions
+
+    # batch_size > 1 packs several ambiguous pairs into one request instead of one request per pair
+    batch_stats = BatchStats() if batch_size > 1 else None
+    resolve = None
+    if batch_stats is not None:
+        resolve = lambda llm, window: classify_pairs_batched(llm, window, dispatcher, cache, batch_size, batch_stats)
+
+    # Setup LangChain LLM (GPT-4o) lazily; pairs settled by the route pre-filter never need it.
+    # Ambiguous pairs are sent concurrently in windows and come back in pair order.
+    verdicts = iter_windowed(pairs, decide, lambda pair: build_conflict_request(*pair),
+                             lambda: ChatOpenAI(model="gpt-4o"), dispatcher, cache, resolve=resolve,
+                             screen=screen if similarity is not None else None)
+    results = []
+    try:
+        for (ep1, ep2), reasoning, decided_by in verdicts:
+            if decided_by == DECIDED_BY_LLM:
+                print(f"\nAnalyzing: {ep1['httpMethod']} {endpoint_path(ep1)} (Service: {ep1['service']}) <-> {ep2['httpMethod']} {endpoint_path(ep2)} (Service: {ep2['service']})")
+                print(f"LLM Reasoning: {reasoning}")
+            record = {
+                'ep1': ep1,
+                'ep2': ep2,
+                'llm_reasoning': reasoning,
+                'decided_by': decided_by
+            }
+            if writer is not None:
+                writer.write(record)
+            else:
+                results.append(record)
+    finally:
+        if writer is not None:
+            writer.close()
+    resumed = writer.skipped if writer is not None else 0
+    stats.pruned = count_cross_service_pairs(Counter(ep['service'] for ep in endpoint_list).values()) - stats.total - resumed
+    print(f"\n{stats.report()}")
+    if similarity is not None:
+        print(similarity.stats.report())
+    print(dispatcher.report())
+    if batch_stats is not None:
+        print(batch_stats.report())
+    if cache is not None:
+        print(cache.report())
+    if writer is None:
+        if not results:
+            print("No cross-service endpoint pairs found for semantic analysis.")
+        return results
+    if not writer.written and not writer.completed:
         print("No cross-service endpoint pairs found for semantic analysis.")
         return []
-    # Setup LangChain LLM (GPT-4o)
-    llm = ChatOpenAI(model="gpt-4o")
-    results = []
-    for ep1, ep2 in pairs:
-        print(f"\nAnalyzing: {ep1['httpMethod']} {ep1['path']} (Service: {ep1['service']}) <-> {ep2['httpMethod']} {ep2['path']} (Service: {ep2['service']})")
-        reasoning = llm_reason_conflict(ep1, ep2, llm)
-        print(f"LLM Reasoning: {reasoning}")
-        results.append({
-            'ep1': ep1,
-            'ep2': ep2,
-            'llm_reasoning': reasoning
-        })
-    if output_path:
-        with open(output_path, 'w') as f:
-            json.dump(results, f, indent=2)
-        print(f"\nResults written to {output_path}")
-    return results
+    jsonl_to_json(writer.jsonl_path, output_path)
+    print(f"\nResults streamed to {writer.jsonl_path} ({writer.written} new, {resumed} resumed) and written to {output_path}")
+    return iter_jsonl(writer.jsonl_path)
 
 if __name__ == "__main__":
     import sys
@@ -0,0 +1,96 @@
+import os
+import sys
+import time
+import argparse
+from typing import Dict, List, Set, Tuple
+
+from agentic_dependency_extractor import build_file_jobs, extract_dependencies_native, extract_dependencies_llm
+from build_file_parser import PLACEHOLDER_RE
+from llm_dispatch import LLMDispatcher
+from maven_model import MavenResolver
+
+# Compares native build-file parsing with LLM extraction over every repo in a directory:
+# wall time, records, unresolved ${...} versions, LLM calls/tokens and agreement between
+# the two result sets. Nothing is written to the repos.
+#
+#   python bench_dependency_extraction.py ../repos            # native + real LLM (gpt-4o)
+#   python bench_dependency_extraction.py ../repos --native-only
+
+
+def record_keys(deps: List[Dict]) -> Set[Tuple[str, str]]:
+    return {(d.get("name"), d.get("version")) for d in deps if d.get("name")}
+
+
+def unresolved(deps: List[Dict]) -> int:
+    return sum(1 for d in deps if d.get("version") and PLACEHOLDER_RE.search(str(d["version"])))
+
+
+def discover(repos_dir: str) -> List[str]:
+    return [os.path.join(repos_dir, d) for d in sorted(os.listdir(repos_dir)) if os.path.isdir(os.path.join(repos_dir, d))]
+
+
+def run_native(repo, jobs):
+    start = time.perf_counter()
+    resolver = MavenResolver(repo, pom_paths=[path for path, file_type, _ in jobs if file_type == "pom.xml"])
+    deps, unparsed = extract_dependencies_native(jobs, resolver)
+    return deps, unparsed, time.perf_counter() - start
+
+
+def run_llm(jobs, dispatcher):
+    start = time.perf_counter()
+    deps = extract_dependencies_llm(jobs, dispatcher)
+    return deps, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark native vs LLM dependency extraction")
+    parser.add_argument("repos_dir")
+    parser.add_argument("--native-only", action="store_true", help="Skip the LLM path (no API calls)")
+    args = parser.parse_args()
+
+    dispatcher = LLMDispatcher.from_env()
+    rows = []
+    for repo in discover(args.repos_dir):
+        jobs = build_file_jobs(repo)
+        if not jobs:
+            continue
+        native_deps, unparsed, native_seconds = run_native(repo, jobs)
+        row = {
+            "repo": os.path.basename(repo), "files": len(jobs), "unparsed": len(unparsed),
+            "native_s": native_seconds, "native_deps": len(native_deps), "native_unresolved": unresolved(native_deps),
+        }
+        if not args.native_only:
+            calls_before = dispatcher.calls
+            llm_deps, llm_seconds = run_llm(jobs, dispatcher)
+            native_keys, llm_keys = record_keys(native_deps), record_keys(llm_deps)
+            union = native_keys | llm_keys
+            row.update({
+                "llm_s": llm_seconds, "llm_deps": len(llm_deps), "llm_unresolved": unresolved(llm_deps),
+                "llm_calls": dispatcher.calls - calls_before,
+                "agreement": len(native_keys & llm_keys) / len(union) if union else 1.0,
+            })
+        rows.append(row)
+
+    print()
+    header = f"{'repo':30} {'files':>5} {'unparsed':>8} {'native s':>9} {'deps':>6} {'${}':>5}"
+    if not args.native_only:
+        header += f" {'llm s':>9} {'deps':>6} {'${}':>5} {'calls':>5} {'agree':>6}"
+    print(header)
+    for row in rows:
+        line = (f"{row['repo'][:30]:30} {row['files']:>5} {row['unparsed']:>8} {row['native_s']:>9.3f} "
+                f"{row['native_deps']:>6} {row['native_unresolved']:>5}")
+        if not args.native_only:
+            line += (f" {row['llm_s']:>9.2f} {row['llm_deps']:>6} {row['llm_unresolved']:>5} "
+                     f"{row['llm_calls']:>5} {row['agreement']:>6.0%}")
+        print(line)
+    native_total = sum(r["native_s"] for r in rows)
+    print(f"\nNative: {sum(r['files'] for r in rows)} files in {native_total:.3f}s, "
+          f"{sum(r['unparsed'] for r in rows)} would fall back to the LLM")
+    if not args.native_only and rows:
+        llm_total = sum(r["llm_s"] for r in rows)
+        print(f"LLM:    {llm_total:.2f}s ({llm_total / native_total if native_total else 0:.0f}x native), {dispatcher.report()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+import sys
+import json
+import time
+import argparse
+from typing import Dict, List, Tuple
+
+from endpoint_matcher import prefilter_pair
+from endpoint_similarity import DEFAULT_THRESHOLD, EndpointSimilarity, numpy_available, recall_at
+
+# Recall of the endpoint similarity screen: how many related endpoint pairs (ones the LLM would
+# call a conflict or an equivalent) it still forwards at each threshold, and how many unrelated
+# ambiguous pairs it keeps from the LLM. Runs offline on a labeled fixture, or on the verdicts
+# of an earlier api_conflict run, treating every pair the LLM did not call "No Conflict" as related.
+#
+#   python bench_endpoint_similarity.py
+#   python bench_endpoint_similarity.py --results compatibility_results/api_conflicts.json
+
+THRESHOLDS = [0.05, 0.1, 0.15, 0.2, 0.25, 0.3, 0.4, 0.5]
+
+
+def _ep(service, class_name, method_name, http_method, path):
+    return {"service": service, "className": class_name, "methodName": method_name,
+            "httpMethod": http_method, "path": path}
+
+
+# Four services that grew apart. The route prefilter settles literal routes that cannot meet,
+# so what reaches the LLM are overlapping templates and paths held in constants ("(Routes.X)").
+FIXTURE_ENDPOINTS = [
+    _ep("ms-users", "UserController", "getUserById", "GET", "/users/{id}"),
+    _ep("ms-users", "UserController", "searchUsers", "GET", "/users/search"),
+    _ep("ms-users", "UserController", "createUser", "POST", "(UserRoutes.BASE)"),
+    _ep("ms-users", "AddressController", "listAddresses", "GET", "/users/{id}/addresses"),
+    _ep("ms-users", "ProfileController", "handleProfile", "REQUEST", "/profile/{section}"),
+    _ep("ms-users", "HealthController", "health", "GET", "(UserRoutes.HEALTH)"),
+    _ep("ms-accounts", "AccountUserController", "fetchUser", "GET", "(AccountRoutes.USER_BY_ID)"),
+    _ep("ms-accounts", "AccountUserController", "registerUser", "POST", "(AccountRoutes.REGISTER_USER)"),
+    _ep("ms-accounts", "AccountController", "closeAccount", "DELETE", "(AccountRoutes.ACCOUNT)"),
+    _ep("ms-accounts", "StatementController", "monthlyStatement", "GET", "(AccountRoutes.STATEMENTS)"),
+    _ep("ms-accounts", "AccountController", "updateAccount", "PUT", "/accounts/{accountId}"),
+    _ep("ms-accounts", "UserProfileController", "profile", "GET", "/profile/{userId}"),
+    _ep("ms-orders", "OrderController", "getOrder", "GET", "/orders/{orderId}"),
+    _ep("ms-orders", "OrderController", "placeOrder", "POST", "/orders"),
+    _ep("ms-orders", "CustomerAddressController", "customerAddresses", "GET", "(OrderRoutes.CUSTOMER_ADDRESSES)"),
+    _ep("ms-orders", "InvoiceController", "downloadInvoice", "GET", "/invoices/{invoiceId}/pdf"),
+    _ep("ms-orders", "OrderController", "cancelOrder", "DELETE", "/orders/{orderId}"),
+    _ep("ms-orders", "ShipmentController", "trackShipment", "GET", "(OrderRoutes.TRACKING)"),
+    _ep("ms-billing", "BillingOrderController", "orderDetails", "GET", "(BillingRoutes.ORDER)"),
+    _ep("ms-billing", "InvoiceController", "invoicePdf", "GET", "(BillingRoutes.INVOICE_PDF)"),
+    _ep("ms-billing", "StatementController", "statementForMonth", "GET", "/statements/{month}"),
+    _ep("ms-billing", "PaymentController", "refundPayment", "POST", "(BillingRoutes.REFUND)"),
+    _ep("ms-billing", "HealthController", "healthCheck", "GET", "(BillingRoutes.HEALTH)"),
+    _ep("ms-billing", "PaymentController", "listPayments", "GET", "(BillingRoutes.PAYMENTS)"),
+]
+
+# Row pairs a reviewer labeled as the same operation or a clash
+FIXTURE_POSITIVES = [
+    (0, 6),    # user by id
+    (2, 7),    # create / register user
+    (3, 14),   # addresses of a user / customer
+    (4, 11),   # profile of a user
+    (5, 22),   # health check
+    (9, 20),   # monthly statement
+    (12, 18),  # order by id
+    (15, 19),  # invoice pdf
+]
+
+
+def load_results(path: str) -> Tuple[List[Dict], List[Tuple[int, int]], int]:
+    """Endpoints, related row pairs and LLM-decided pair count from an api_conflict results file."""
+    with open(path) as f:
+        records = json.load(f)
+    endpoints, rows, positives, decided = [], {}, [], 0
+    for record in records:
+        if record.get("decided_by") != "llm":
+            continue
+        decided += 1
+        pair = []
+        for ep in (record["ep1"], record["ep2"]):
+            key = json.dumps(ep, sort_keys=True)
+            if key not in rows:
+                rows[key] = len(endpoints)
+                endpoints.append(ep)
+            pair.append(rows[key])
+        if not record.get("llm_reasoning", "").strip().startswith("No Conflict"):
+            positives.append(tuple(pair))
+    return endpoints, positives, decided
+
+
+def ambiguous_pairs(endpoints: List[Dict]) -> List[Tuple[int, int]]:
+    """Cross-service row pairs the route prefilter leaves for the LLM."""
+    return [(i, j) for i in range(len(endpoints)) for j in range(i + 1, len(endpoints))
+            if endpoints[i]["service"] != endpoints[j]["service"] and prefilter_pair(endpoints[i], endpoints[j]) is None]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recall of the endpoint similarity screen per threshold")
+    parser.add_argument("--results", help="api_conflict results JSON to evaluate instead of the built-in fixture")
+    args = parser.parse_args()
+    if not numpy_available():
+        sys.exit("NumPy is required for the endpoint similarity screen")
+
+    if args.results:
+        endpoints, related, decided = load_results(args.results)
+        print(f"{args.results}: {decided} pairs decided by the LLM")
+    else:
+        endpoints, related = FIXTURE_ENDPOINTS, FIXTURE_POSITIVES
+    ambiguous = ambiguous_pairs(endpoints)
+    related_set = {(min(i, j), max(i, j)) for i, j in related}
+    print(f"{len(endpoints)} endpoints, {len(ambiguous)} ambiguous cross-service pairs, {len(related)} labeled related")
+
+    print(f"\n{'threshold':>9} {'recall':>7} {'forwarded':>9} {'screened':>8} {'precision':>9} {'seconds':>8}")
+    for threshold in sorted(set(THRESHOLDS + [DEFAULT_THRESHOLD])):
+        start = time.perf_counter()
+        similarity = EndpointSimilarity(endpoints, threshold=threshold)
+        kept = similarity.pair_similarities(ambiguous) >= threshold
+        seconds = time.perf_counter() - start
+        forwarded = int(kept.sum())
+        hits = sum(1 for pair, keep in zip(ambiguous, kept) if keep and pair in related_set)
+        precision = hits / forwarded if forwarded else 1.0
+        marker = "  <- default" if threshold == DEFAULT_THRESHOLD else ""
+        print(f"{threshold:>9.2f} {recall_at(similarity, related):>7.2f} {forwarded:>9} "
+              f"{len(ambiguous) - forwarded:>8} {precision:>9.2f} {seconds:>8.3f}{marker}")
+
+    similarity = EndpointSimilarity(endpoints, threshold=DEFAULT_THRESHOLD)
+    for i, j in related:
+        score = similarity.similarity(endpoints[i], endpoints[j])
+        if score < DEFAULT_THRESHOLD:
+            print(f"[WARN] Missed at the default threshold ({score:.2f}): "
+                  f"{endpoints[i]['className']}.{endpoints[i]['methodName']} / {endpoints[j]['className']}.{endpoints[j]['methodName']}")
+
+if __name__ == "__main__":
+    main()
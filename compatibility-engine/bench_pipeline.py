@@ -0,0 +1,314 @@
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import argparse
+import platform
+import resource
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import api_conflict
+import dependency_conflict
+import agentic_dependency_extractor
+from agent_orchestrator import JAR_PATH
+from fake_llm import FakeChatModel
+from java_analysis_client import JavaAnalysisClient
+from llm_dispatch import LLMDispatcher
+from pipeline_trace import configure_tracing
+from repo_index import refresh_index
+from synthetic_repos import MANIFEST_FILENAME, generate_repos
+
+# The merge stage lives in iMCE
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "iMCE"))
+from consolidation_orchestrator import execute_merge_plan, find_microservice_repos, purge_and_scaffold
+
+# End-to-end benchmark on generated repositories: discovery -> analysis -> api_conflict ->
+# dependency_conflict -> execute_merge_plan (into an empty output, then again over the previous
+# output, which skips the unchanged files), with every LLM call answered by FakeChatModel
+# (deterministic verdicts, injected latency). Per stage it records wall time, peak RSS, LLM
+# calls and tokens, and writes them with the run parameters to a JSON baseline. --compare
+# checks a run against an earlier baseline and exits 1 when a stage got worse.
+#
+# Analysis uses the Java analysis server when java and the shadow JAR are available
+# (--analysis auto); --analysis manifest writes analysis_result.json from the generator's
+# record instead, so the Python stages can be measured without a JDK.
+#
+#   python bench_pipeline.py --repos 20 --controllers 5 --endpoints 8 --output bench_baseline.json
+#   python bench_pipeline.py --repos 20 --controllers 5 --endpoints 8 --compare bench_baseline.json
+
+BASELINE_VERSION = 1
+STAGES = ["generate", "discovery", "analysis", "api_conflict", "dependency_conflict", "execute_merge_plan",
+          "rerun_merge_plan"]
+ANALYSIS_MODES = ("auto", "java", "manifest")
+# Wall-time differences below this are noise whatever the tolerance
+MIN_SECONDS_DELTA = 0.25
+MIN_RSS_DELTA_MB = 16.0
+
+
+def _reset_peak_rss() -> bool:
+    """Reset the kernel's RSS high-water mark (Linux), so each stage reports its own peak."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is the peak of the whole run: kilobytes on Linux, bytes on macOS
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+def _children_peak_rss_mb() -> float:
+    maxrss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
+
+
+class StageRecorder:
+    """Per-stage wall time, peak RSS and the fake LLM's call and token counters."""
+
+    def __init__(self, llm: FakeChatModel):
+        self.llm = llm
+        self.stages: Dict[str, Dict] = {}
+        self.per_stage_rss = _reset_peak_rss()
+
+    @contextmanager
+    def stage(self, name: str):
+        print(f"\n[LOG] === {name} ===")
+        self.per_stage_rss = _reset_peak_rss() and self.per_stage_rss
+        calls, prompt_tokens, completion_tokens = self.llm.calls, self.llm.prompt_tokens, self.llm.completion_tokens
+        details: Dict = {}
+        start = time.perf_counter()
+        yield details
+        metrics = {
+            "wall_seconds": round(time.perf_counter() - start, 4),
+            "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "children_peak_rss_mb": round(_children_peak_rss_mb(), 1),
+            "llm_calls": self.llm.calls - calls,
+            "prompt_tokens": self.llm.prompt_tokens - prompt_tokens,
+            "completion_tokens": self.llm.completion_tokens - completion_tokens,
+        }
+        metrics["llm_tokens"] = metrics["prompt_tokens"] + metrics["completion_tokens"]
+        metrics.update(details)
+        self.stages[name] = metrics
+        print(f"[LOG] {name}: {metrics['wall_seconds']:.2f}s, peak RSS {metrics['peak_rss_mb']:.0f} MB, "
+              f"{metrics['llm_calls']} LLM calls, {metrics['llm_tokens']} tokens")
+
+
+def install_fake_llm(llm: FakeChatModel):
+    """Route the stages' ChatOpenAI construction to one shared fake model."""
+    for module in (api_conflict, dependency_conflict, agentic_dependency_extractor):
+        module.ChatOpenAI = lambda *args, **kwargs: llm
+
+
+def java_available() -> bool:
+    return shutil.which("java") is not None and os.path.exists(JAR_PATH)
+
+
+def analyze_with_java(workdir: str, repos: List[str]) -> int:
+    """Analyze every repo through one warm analysis server; returns how many produced a result."""
+    analyzed = 0
+    with JavaAnalysisClient(JAR_PATH, workdir) as client:
+        for repo in repos:
+            # The server only accepts ./repos/<name> paths relative to its working directory
+            if client.analyze(f"./{os.path.relpath(repo, workdir)}") is not None:
+                analyzed += 1
+    return analyzed
+
+
+def analyze_from_manifest(repos_dir: str, repos: List[str]) -> int:
+    with open(os.path.join(repos_dir, MANIFEST_FILENAME)) as f:
+        manifest = json.load(f)
+    for repo in repos:
+        with open(os.path.join(repo, "analysis_result.json"), "w") as f:
+            json.dump({"endpoints": manifest[os.path.basename(repo)]["endpoints"]}, f, indent=2)
+    return len(repos)
+
+
+def _count_files(root: str, suffix: str) -> int:
+    return sum(1 for _, _, files in os.walk(root) for name in files if name.endswith(suffix))
+
+
+def run_pipeline(args) -> Dict:
+    workdir = os.path.abspath(args.workdir)
+    repos_dir = os.path.join(workdir, "repos")
+    results_dir = os.path.join(workdir, "results")
+    llm = FakeChatModel(latency=args.latency, seed=args.seed)
+    install_fake_llm(llm)
+    dispatcher = LLMDispatcher.from_env()
+    recorder = StageRecorder(llm)
+    analysis_mode = args.analysis
+    if analysis_mode == "auto":
+        analysis_mode = "java" if java_available() else "manifest"
+    if analysis_mode == "java" and not java_available():
+        sys.exit(f"--analysis java needs java on PATH and {JAR_PATH} (build it with ./gradlew shadowJar)")
+
+    os.makedirs(workdir, exist_ok=True)
+    # Stages that write next to the working directory (config merge report) stay inside workdir
+    os.chdir(workdir)
+    with recorder.stage("generate") as details:
+        manifest = generate_repos(repos_dir, args.repos, args.controllers, args.endpoints, args.dependencies,
+                                  args.config_keys, args.seed)
+        details["endpoints"] = sum(len(m["endpoints"]) for m in manifest.values())
+        details["java_files"] = _count_files(repos_dir, ".java")
+
+    with recorder.stage("discovery"):
+        repos = find_microservice_repos(repos_dir)
+        for repo in repos:
+            refresh_index(repo)
+
+    with recorder.stage("analysis") as details:
+        details["mode"] = analysis_mode
+        if analysis_mode == "java":
+            details["analyzed"] = analyze_with_java(workdir, repos)
+        else:
+            details["analyzed"] = analyze_from_manifest(repos_dir, repos)
+        for repo in repos:
+            refresh_index(repo)
+
+    os.makedirs(results_dir, exist_ok=True)
+    with recorder.stage("api_conflict") as details:
+        results = api_conflict.find_api_conflicts_semantic(
+            repos_dir, os.path.join(results_dir, "api_conflict_results.json"), dispatcher=dispatcher,
+            batch_size=args.batch_size)
+        decided_by = {}
+        for record in results:
+            decided_by[record["decided_by"]] = decided_by.get(record["decided_by"], 0) + 1
+        details["pairs"] = sum(decided_by.values())
+        details["decided_by"] = decided_by
+
+    with recorder.stage("dependency_conflict") as details:
+        for repo in repos:
+            agentic_dependency_extractor.main(repo, dispatcher=dispatcher)
+        results = dependency_conflict.find_dependency_conflicts_semantic(
+            repos_dir, os.path.join(results_dir, "dependency_conflict_results.json"), dispatcher=dispatcher)
+        details["dependencies"] = len(results)
+        details["sent_to_llm"] = sum(1 for r in results if r["decided_by"] == "llm")
+
+    consolidated_dir = os.path.join(workdir, "consolidated-service")
+    shutil.rmtree(consolidated_dir, ignore_errors=True)
+    for stage in ("execute_merge_plan", "rerun_merge_plan"):
+        with recorder.stage(stage) as details:
+            target_dir, previous_files = purge_and_scaffold(offline=True, consolidated_dir=consolidated_dir)
+            stats = execute_merge_plan({}, repos, consolidated_dir=target_dir, jobs=args.jobs,
+                                       previous_files=previous_files)
+            details["java_files"] = _count_files(target_dir, ".java")
+            details["written"] = stats.written
+            details["unchanged"] = stats.unchanged
+
+    return {
+        "version": BASELINE_VERSION,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "host": {"hostname": socket.gethostname(), "platform": platform.platform(),
+                 "python": platform.python_version(), "cpus": os.cpu_count()},
+        "params": {"repos": args.repos, "controllers": args.controllers, "endpoints": args.endpoints,
+                   "dependencies": args.dependencies, "config_keys": args.config_keys, "seed": args.seed,
+                   "latency": args.latency, "batch_size": args.batch_size, "jobs": args.jobs,
+                   "analysis": analysis_mode},
+        "per_stage_rss": recorder.per_stage_rss,
+        "stages": recorder.stages,
+        "total_seconds": round(sum(s["wall_seconds"] for s in recorder.stages.values()), 4),
+    }
+
+
+def compare_runs(baseline: Dict, current: Dict, tolerance: float) -> List[str]:
+    """Regressions of current against baseline, one line per stage and metric."""
+    regressions = []
+    if baseline.get("params") != current.get("params"):
+        print("[WARN] The baseline was recorded with different parameters: "
+              f"{baseline.get('params')} vs {current.get('params')}")
+    for name in STAGES:
+        old, new = baseline.get("stages", {}).get(name), current["stages"].get(name)
+        if old is None or new is None:
+            continue
+        checks = [
+            ("wall_seconds", tolerance, MIN_SECONDS_DELTA),
+            ("peak_rss_mb", tolerance, MIN_RSS_DELTA_MB),
+            # The fake LLM is deterministic, so call and token counts only move when the code does
+            ("llm_calls", 0, 0),
+            ("llm_tokens", 0, 0),
+        ]
+        for metric, allowed, min_delta in checks:
+            before, after = old.get(metric, 0), new.get(metric, 0)
+            if after - before > max(before * allowed, min_delta):
+                regressions.append(f"{name}.{metric}: {before} -> {after} (+{(after - before) / before:.0%})"
+                                   if before else f"{name}.{metric}: {before} -> {after}")
+    return regressions
+
+
+def print_summary(run: Dict, baseline: Optional[Dict] = None):
+    print(f"\n{'stage':<20} {'seconds':>9} {'peak MB':>8} {'calls':>7} {'tokens':>9}"
+          + (f" {'base s':>9}" if baseline else ""))
+    for name in STAGES:
+        stage = run["stages"].get(name)
+        if stage is None:
+            continue
+        line = (f"{name:<20} {stage['wall_seconds']:>9.2f} {stage['peak_rss_mb']:>8.0f} "
+                f"{stage['llm_calls']:>7} {stage['llm_tokens']:>9}")
+        if baseline:
+            old = baseline.get("stages", {}).get(name, {})
+            line += f" {old.get('wall_seconds', float('nan')):>9.2f}"
+        print(line)
+    print(f"{'total':<20} {run['total_seconds']:>9.2f}")
+    if not run["per_stage_rss"]:
+        print("[WARN] Peak RSS could not be reset between stages; each value is the peak so far")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end pipeline benchmark on synthetic repositories")
+    parser.add_argument("--workdir", default="bench_workdir", help="Where repos/, results/ and the merge output go")
+    parser.add_argument("--repos", type=int, default=6)
+    parser.add_argument("--controllers", type=int, default=3, help="Controllers per repository")
+    parser.add_argument("--endpoints", type=int, default=5, help="Endpoints per controller")
+    parser.add_argument("--dependencies", type=int, default=8, help="Dependencies per repository")
+    parser.add_argument("--config-keys", type=int, default=8, help="Configuration keys per repository")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds the fake LLM takes per call")
+    parser.add_argument("--batch-size", type=int, default=1, help="Endpoint pairs per API conflict request")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Worker processes for the merge stage")
+    parser.add_argument("--analysis", choices=ANALYSIS_MODES, default="auto",
+                        help="java: Java analysis server; manifest: generator's endpoints; auto: java when available")
+    parser.add_argument("--output", help="Write the run as a baseline JSON file")
+    parser.add_argument("--compare", help="Baseline JSON to compare the run with; exits 1 on a regression")
+    parser.add_argument("--trace", help="Also write a span trace (JSON Lines) of the run")
+    parser.add_argument("--progress", action="store_true", help="Show a live progress bar for LLM calls")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="Allowed relative growth of wall time and peak RSS (LLM calls and tokens must not grow)")
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output) if args.output else None
+    if args.trace or args.progress:
+        configure_tracing(args.trace, args.progress)
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    run = run_pipeline(args)
+    print_summary(run, baseline)
+    if output:
+        with open(output, "w") as f:
+            json.dump(run, f, indent=2)
+        print(f"\nBaseline written to {output}")
+    if baseline is not None:
+        regressions = compare_runs(baseline, run, args.tolerance)
+        for regression in regressions:
+            print(f"[WARN] Regression: {regression}")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions against {args.compare} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
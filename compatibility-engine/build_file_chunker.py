@@ -0,0 +1,137 @@
+import os
+import re
+from typing import List, Tuple
+
+from llm_dispatch import estimate_tokens
+
+# Token-budgeted excerpts of build files for LLM dependency extraction. Only the regions
+# that carry dependency information are kept (<parent>, <properties>, <dependencyManagement>,
+# <dependencies> for Maven; version variables and dependencies { } blocks for Gradle) and
+# they are split at dependency boundaries so every prompt stays under the budget. Works on
+# raw text, so it also handles files the native parser rejected.
+
+DEFAULT_CHUNK_TOKENS = 6000
+# Context (parent + properties) is repeated in every chunk only while it stays this small
+CONTEXT_SHARE = 3
+
+POM_PARENT_RE = re.compile(r"<parent>.*?</parent>", re.DOTALL)
+POM_PROPERTIES_RE = re.compile(r"<properties>(.*?)</properties>", re.DOTALL)
+POM_PROPERTY_RE = re.compile(r"<([\w.-]+)>[^<]*</\1>")
+POM_DEPENDENCY_SECTION_RE = re.compile(r"<dependencyManagement>.*?</dependencyManagement>|<dependencies>.*?</dependencies>", re.DOTALL)
+POM_DEPENDENCY_RE = re.compile(r"<dependency>.*?</dependency>", re.DOTALL)
+POM_PLUGINS_RE = re.compile(r"<plugins>.*?</plugins>|<pluginManagement>.*?</pluginManagement>", re.DOTALL)
+XML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+GRADLE_DEPENDENCIES_RE = re.compile(r"\bdependencies\s*\{")
+GRADLE_EXT_RE = re.compile(r"\bext\s*\{")
+GRADLE_VARIABLE_RE = re.compile(r"^\s*(?:ext\.|def\s+|val\s+|var\s+|set\().*$", re.MULTILINE)
+
+
+def chunk_token_budget() -> int:
+    return int(os.environ.get("LLM_EXTRACTION_CHUNK_TOKENS", DEFAULT_CHUNK_TOKENS))
+
+
+def _balanced_block(text: str, open_index: int) -> str:
+    """Text from open_index up to the matching '}' (or the end of the file if it never closes)."""
+    depth = 0
+    for i in range(open_index, len(text)):
+        if text[i] == "{":
+            depth += 1
+        elif text[i] == "}":
+            depth -= 1
+            if depth == 0:
+                return text[open_index:i + 1]
+    return text[open_index:]
+
+
+def pom_regions(content: str) -> Tuple[List[str], List[str], List[str]]:
+    """(parent, properties, dependency entries) of a pom.xml; plugin sections are dropped."""
+    content = POM_PLUGINS_RE.sub("", XML_COMMENT_RE.sub("", content))
+    parent = [m.group(0) for m in POM_PARENT_RE.finditer(content)][:1]
+    properties = [p.group(0) for m in POM_PROPERTIES_RE.finditer(content) for p in POM_PROPERTY_RE.finditer(m.group(1))]
+    entries = []
+    for section in POM_DEPENDENCY_SECTION_RE.finditer(content):
+        managed = section.group(0).startswith("<dependencyManagement>")
+        for dependency in POM_DEPENDENCY_RE.finditer(section.group(0)):
+            entry = dependency.group(0)
+            # Keep the managed/direct distinction visible in the excerpt
+            entries.append(f"<dependencyManagement>{entry}</dependencyManagement>" if managed else entry)
+    return parent, properties, entries
+
+
+def gradle_regions(content: str) -> Tuple[List[str], List[str], List[str]]:
+    """([], version variable lines, dependency declaration lines) of a build.gradle(.kts)."""
+    variables = []
+    for match in GRADLE_EXT_RE.finditer(content):
+        block = _balanced_block(content, match.end() - 1)
+        variables.extend(line.strip() for line in block[1:-1].splitlines() if "=" in line)
+    variables += [m.group(0).strip() for m in GRADLE_VARIABLE_RE.finditer(content)]
+    entries = []
+    for match in GRADLE_DEPENDENCIES_RE.finditer(content):
+        block = _balanced_block(content, match.end() - 1)
+        entries.extend(line.rstrip() for line in block[1:-1].splitlines() if line.strip())
+    return [], variables, entries
+
+
+def _render(file_type: str, parent: List[str], properties: List[str], entries: List[str]) -> str:
+    parts = list(parent)
+    if file_type == "pom.xml":
+        if properties:
+            parts += ["<properties>", *properties, "</properties>"]
+        if entries:
+            parts += ["<dependencies>", *entries, "</dependencies>"]
+    else:
+        parts += properties
+        if entries:
+            parts += ["dependencies {", *entries, "}"]
+    return "\n".join(parts)
+
+
+def _pack(units: List[str], budget: int, base_tokens: int = 0) -> List[List[str]]:
+    """Greedily group units so each group (plus base_tokens) stays within budget."""
+    # Sizes are summed as joined text, so per-unit rounding does not add up over many small units
+    groups, current, text = [], [], ""
+    for unit in units:
+        candidate = f"{text}\n{unit}" if current else unit
+        if current and base_tokens + estimate_tokens(candidate) > budget:
+            groups.append(current)
+            current, candidate = [], unit
+        current.append(unit)
+        text = candidate
+    if current:
+        groups.append(current)
+    return groups
+
+
+def chunk_build_file(content: str, file_type: str, budget: int = None) -> List[str]:
+    """
+    Split a build file into excerpts of at most ~budget tokens each. A file whose
+    dependency regions already fit in one budget yields a single excerpt.
+    """
+    budget = budget or chunk_token_budget()
+    parent, properties, entries = pom_regions(content) if file_type == "pom.xml" else gradle_regions(content)
+    if not (parent or properties or entries):
+        # Nothing recognisable: send the raw file, split by line if it is over budget
+        return ["\n".join(group) for group in _pack(content.splitlines(), budget)]
+    context = _render(file_type, parent, properties, [])
+    if estimate_tokens(context) <= budget // CONTEXT_SHARE:
+        # Small enough to repeat in every chunk so versions can be resolved in place
+        return [_render(file_type, parent, properties, group)
+                for group in _pack(entries, budget, estimate_tokens(context))] or [context]
+    # Large property sections travel in chunks of their own
+    base = estimate_tokens(_render(file_type, parent, ["<properties>"], ["<dependencies>"]))
+    chunks = [_render(file_type, parent, group, []) for group in _pack(properties, budget, base)]
+    chunks += [_render(file_type, parent, [], group) for group in _pack(entries, budget, base)]
+    return chunks
+
+
+def dedupe_dependencies(deps: List[dict]) -> List[dict]:
+    """Merge chunk results: one record per (name, version); a versionless record is dropped when a versioned one exists."""
+    versioned = {d.get("name") for d in deps if d.get("version")}
+    seen, merged = set(), []
+    for dep in deps:
+        key = (dep.get("name"), dep.get("version"))
+        if key in seen or (not dep.get("version") and dep.get("name") in versioned):
+            continue
+        seen.add(key)
+        merged.append(dep)
+    return merged
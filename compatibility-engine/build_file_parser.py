@@ -0,0 +1,310 @@
+import os
+import re
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Tuple
+
+# Local dependency extraction for pom.xml and build.gradle(.kts). Emits the same
+# {name, version, source, path} records as the LLM extractor, deterministically and
+# without network calls. Files the parser cannot interpret raise BuildFileParseError
+# so the caller can fall back to the LLM for just those files.
+
+PLACEHOLDER_RE = re.compile(r"\$\{([^}]+)\}")
+MAX_PLACEHOLDER_DEPTH = 10
+
+
+class BuildFileParseError(Exception):
+    pass
+
+
+def dependency_record(group: str, artifact: str, version: Optional[str], source: str, path: str) -> Dict:
+    return {"name": f"{group}:{artifact}", "version": version or None, "source": source, "path": path}
+
+
+def resolve_placeholders(value: Optional[str], properties: Dict[str, str]) -> Optional[str]:
+    """Substitute ${name} from properties (recursively); unknown placeholders are left as-is."""
+    if not value or "${" not in value:
+        return value
+    for _ in range(MAX_PLACEHOLDER_DEPTH):
+        resolved = PLACEHOLDER_RE.sub(lambda m: properties.get(m.group(1), m.group(0)), value)
+        if resolved == value:
+            break
+        value = resolved
+    return value
+
+
+# --- Maven -----------------------------------------------------------------
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+class RawPom:
+    """Unresolved contents of one pom.xml, as written in the file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.project: Dict[str, str] = {}
+        self.parent: Dict[str, str] = {}
+        self.properties: Dict[str, str] = {}
+        # (groupId, artifactId, version, scope, type)
+        self.dependencies: List[Tuple[str, str, Optional[str], Optional[str], Optional[str]]] = []
+        self.managed: List[Tuple[str, str, Optional[str], Optional[str], Optional[str]]] = []
+        self.modules: List[str] = []
+
+    def implicit_properties(self) -> Dict[str, str]:
+        """Maven's built-in project.* / parent.* properties, with coordinates inherited from the parent."""
+        properties = {}
+        for key in ("groupId", "artifactId", "version"):
+            if key in self.parent:
+                properties[f"project.parent.{key}"] = self.parent[key]
+                properties[f"parent.{key}"] = self.parent[key]
+            value = self.project.get(key, self.parent.get(key) if key != "artifactId" else None)
+            if value:
+                properties[f"project.{key}"] = value
+                properties[f"pom.{key}"] = value
+        return properties
+
+
+def read_pom(path: str) -> RawPom:
+    """
+    Stream a pom.xml with iterparse into a RawPom: coordinates, parent, <properties>,
+    <dependencies> (including profiles, excluding plugin dependencies), <dependencyManagement>
+    and <modules>. Nothing is resolved here.
+    """
+    pom = RawPom(path)
+    stack: List[str] = []
+    try:
+        for event, elem in ET.iterparse(path, events=("start", "end")):
+            name = _local_name(elem.tag) if isinstance(elem.tag, str) else ""
+            if event == "start":
+                stack.append(name)
+                continue
+            stack.pop()
+            depth = len(stack)
+            if name == "dependency" and "plugin" not in stack:
+                fields = {_local_name(child.tag): (child.text or "").strip()
+                          for child in elem if isinstance(child.tag, str)}
+                if fields.get("groupId") and fields.get("artifactId"):
+                    entry = (fields["groupId"], fields["artifactId"], fields.get("version") or None,
+                             fields.get("scope") or None, fields.get("type") or None)
+                    (pom.managed if "dependencyManagement" in stack else pom.dependencies).append(entry)
+                elem.clear()
+            elif depth == 2 and stack[1] == "properties":
+                pom.properties[name] = (elem.text or "").strip()
+            elif depth == 2 and stack[1] == "parent" and name in ("groupId", "artifactId", "version", "relativePath"):
+                pom.parent[name] = (elem.text or "").strip()
+            elif depth == 2 and stack[1] == "modules" and name == "module":
+                pom.modules.append((elem.text or "").strip())
+            elif depth == 1 and name in ("groupId", "artifactId", "version"):
+                pom.project[name] = (elem.text or "").strip()
+            elif depth == 1:
+                # Top-level sections are fully processed once closed; drop them to keep memory flat
+                elem.clear()
+    except ET.ParseError as e:
+        raise BuildFileParseError(f"{path}: {e}")
+    if stack or not (pom.dependencies or pom.managed or pom.project or pom.parent):
+        raise BuildFileParseError(f"{path}: not a Maven project file")
+    return pom
+
+
+def parse_pom(path: str) -> List[Dict]:
+    """
+    Dependency records of a single pom.xml, with versions resolved against the file's own
+    <properties> and project coordinates only (see maven_model for parent/BOM resolution).
+    """
+    pom = read_pom(path)
+    properties = dict(pom.implicit_properties(), **pom.properties)
+    return [
+        dependency_record(resolve_placeholders(g, properties), resolve_placeholders(a, properties),
+                          resolve_placeholders(v, properties), "pom.xml", path)
+        for g, a, v, _, _ in pom.managed + pom.dependencies
+    ]
+
+
+# --- Gradle ----------------------------------------------------------------
+
+STRING_ASSIGNMENT_RE = re.compile(r"""(?:\bext\.|\bdef\s+|\bval\s+|\bvar\s+)?\b([A-Za-z_][\w.]*)\s*=\s*(['"])([^'"\n]*)\2""")
+EXTRA_SET_RE = re.compile(r"""\bset\(\s*(['"])([\w.-]+)\1\s*,\s*(['"])([^'"\n]*)\3\s*\)""")
+GROOVY_VAR_RE = re.compile(r"\$\{?([A-Za-z_][\w.]*)\}?")
+STRING_RE = re.compile(r"""(['"])((?:\\.|(?!\1).)*)\1""")
+MAP_ENTRY_RE = re.compile(r"""\b(group|name|version)\s*[:=]\s*(?:(['"])([^'"]*)\2|([A-Za-z_][\w.]*))""")
+CONFIGURATION_RE = re.compile(r"^\s*([A-Za-z_]\w*)\b")
+# Declarations that are not external module dependencies
+NON_MODULE_RE = re.compile(r"\b(project|files|fileTree|gradleApi|localGroovy|gradleTestKit)\s*\(")
+
+
+def strip_comments(text: str) -> str:
+    """Remove // and /* */ comments, leaving string literals untouched."""
+    out = []
+    i, n = 0, len(text)
+    quote = None
+    while i < n:
+        c = text[i]
+        if quote:
+            out.append(c)
+            if c == "\\" and i + 1 < n:
+                out.append(text[i + 1])
+                i += 2
+                continue
+            if c == quote:
+                quote = None
+        elif c in "'\"":
+            quote = c
+            out.append(c)
+        elif text.startswith("//", i):
+            while i < n and text[i] != "\n":
+                i += 1
+            continue
+        elif text.startswith("/*", i):
+            end = text.find("*/", i + 2)
+            i = n if end < 0 else end + 2
+            out.append(" ")
+            continue
+        else:
+            out.append(c)
+        i += 1
+    return "".join(out)
+
+
+def find_dependency_blocks(text: str) -> List[str]:
+    """Bodies of dependencies { ... } blocks, excluding buildscript { } classpath blocks."""
+    blocks = []
+    stack = []   # (block name, body start)
+    quote = None
+    i, n = 0, len(text)
+    while i < n:
+        c = text[i]
+        if quote:
+            if c == "\\":
+                i += 2
+                continue
+            if c == quote:
+                quote = None
+        elif c in "'\"":
+            quote = c
+        elif c == "{":
+            match = re.search(r"([A-Za-z_]\w*)\s*(?:\([^()]*\))?\s*$", text[max(0, i - 200):i])
+            stack.append((match.group(1) if match else "", i + 1))
+        elif c == "}":
+            if not stack:
+                raise BuildFileParseError("unbalanced braces")
+            name, start = stack.pop()
+            if name == "dependencies" and all(outer != "buildscript" for outer, _ in stack):
+                blocks.append(text[start:i])
+        i += 1
+    if stack or quote:
+        raise BuildFileParseError("unbalanced braces or unterminated string")
+    return blocks
+
+
+def split_statements(block: str) -> List[str]:
+    """Split a dependencies block into top-level statements; nested closures are dropped."""
+    statements, current = [], []
+    depth_paren = depth_brace = 0
+    quote = None
+    for c in block:
+        if quote:
+            if depth_brace == 0:
+                current.append(c)
+            if c == quote:
+                quote = None
+            continue
+        if c in "'\"":
+            quote = c
+        elif c == "(":
+            depth_paren += 1
+        elif c == ")":
+            depth_paren -= 1
+        elif c == "{":
+            depth_brace += 1
+            continue
+        elif c == "}":
+            depth_brace -= 1
+            continue
+        if depth_brace:
+            continue
+        if c == "\n" and "".join(current).rstrip().endswith(","):
+            # Groovy map notation continued on the next line
+            current.append(" ")
+        elif c in "\n;" and depth_paren == 0:
+            statements.append("".join(current).strip())
+            current = []
+        else:
+            current.append(c)
+    statements.append("".join(current).strip())
+    return [s for s in statements if s]
+
+
+def gradle_properties(path: str, text: str) -> Dict[str, str]:
+    """String variables visible to the build file: gradle.properties next to it, ext/def/val assignments."""
+    props = {}
+    props_file = os.path.join(os.path.dirname(path), "gradle.properties")
+    if os.path.exists(props_file):
+        with open(props_file, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith(("#", "!")) and "=" in line:
+                    key, value = line.split("=", 1)
+                    props[key.strip()] = value.strip()
+    for match in STRING_ASSIGNMENT_RE.finditer(text):
+        props[match.group(1)] = match.group(3)
+        # ext.springVersion / project.ext.springVersion are referenced without the prefix
+        props[match.group(1).rsplit(".", 1)[-1]] = match.group(3)
+    for match in EXTRA_SET_RE.finditer(text):
+        props[match.group(2)] = match.group(4)
+    return props
+
+
+def _interpolate(value: str, props: Dict[str, str]) -> str:
+    def lookup(m):
+        key = m.group(1)
+        for candidate in (key, key.rsplit(".", 1)[-1]):
+            if candidate in props:
+                return props[candidate]
+        return m.group(0)
+    return GROOVY_VAR_RE.sub(lookup, value)
+
+
+def parse_gradle_statement(statement: str, props: Dict[str, str]) -> Optional[Tuple[str, str, Optional[str]]]:
+    """(group, artifact, version) for one dependency declaration, None if it is not a module dependency."""
+    if not CONFIGURATION_RE.match(statement) or NON_MODULE_RE.search(statement):
+        return None
+    # Map notation; unquoted values are variable references
+    entries = {key: value if quote else f"${{{variable}}}" for key, quote, value, variable in MAP_ENTRY_RE.findall(statement)}
+    if "group" in entries and "name" in entries:
+        return (_interpolate(entries["group"], props), _interpolate(entries["name"], props),
+                _interpolate(entries["version"], props) if "version" in entries else None)
+    strings = [m.group(2) for m in STRING_RE.finditer(statement)]
+    for value in strings:
+        coordinates = _interpolate(value, props).split("@", 1)[0].split(":")
+        if len(coordinates) >= 2 and coordinates[0] and coordinates[1]:
+            return coordinates[0], coordinates[1], coordinates[2] if len(coordinates) > 2 and coordinates[2] else None
+    if strings or ("(" not in statement and len(statement.split()) == 1):
+        # A bare word (e.g. a nested block name) or strings that are not coordinates
+        return None
+    # Version catalog aliases (libs.foo), variables holding coordinates, etc.
+    raise BuildFileParseError(f"unsupported dependency notation: {statement[:120]}")
+
+
+def parse_gradle(path: str) -> List[Dict]:
+    """Return dependency records from the dependencies { } blocks of a build.gradle(.kts)."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        text = strip_comments(f.read())
+    props = gradle_properties(path, text)
+    deps = []
+    try:
+        for block in find_dependency_blocks(text):
+            for statement in split_statements(block):
+                parsed = parse_gradle_statement(statement, props)
+                if parsed is not None:
+                    group, artifact, version = parsed
+                    deps.append(dependency_record(group, artifact, version, "build.gradle", path))
+    except BuildFileParseError as e:
+        raise BuildFileParseError(f"{path}: {e}")
+    return deps
+
+
+def parse_build_file(path: str, file_type: str) -> List[Dict]:
+    if file_type == "pom.xml":
+        return parse_pom(path)
+    return parse_gradle(path)
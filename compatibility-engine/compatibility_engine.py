@@ -2,15 +2,30 @@ import typer
 from typing import Optional
 from api_conflict import find_api_conflicts_semantic
 from agent_orchestrator import orchestrate_dependency_conflict
+from llm_cache import open_cache
+from endpoint_similarity import DEFAULT_THRESHOLD
+from pipeline_trace import configure_tracing
 
 app = typer.Typer(help="Microservices Compatibility Analysis Engine")
 
-def run_api_conflict(repos_dir: str, output: Optional[str] = None):
-    find_api_conflicts_semantic(repos_dir, output)
+@app.callback()
+def main(
+    trace: Optional[str] = typer.Option(None, "--trace", help="Write spans and LLM call metrics to this JSON Lines file"),
+    progress: bool = typer.Option(False, "--progress", help="Show a live progress bar with an ETA for LLM calls")
+):
+    if trace or progress:
+        configure_tracing(trace, progress)
+
+def run_api_conflict(repos_dir: str, output: Optional[str] = None, no_cache: bool = False, cache_dir: Optional[str] = None,
+                     batch_size: int = 1, resume: bool = False, similarity_threshold: float = DEFAULT_THRESHOLD):
+    find_api_conflicts_semantic(repos_dir, output, cache=open_cache(cache_dir, enabled=not no_cache), batch_size=batch_size,
+                                resume=resume, similarity_threshold=similarity_threshold)
 
-def run_dependency_conflict(repos_dir: str):
+def run_dependency_conflict(repos_dir: str, no_cache: bool = False, cache_dir: Optional[str] = None, no_daemon: bool = False,
+                            force_rebuild: bool = False, jobs: int = 1):
     # Ignore repos_dir for now, use orchestrator's default
-    orchestrate_dependency_conflict()
+    orchestrate_dependency_conflict(cache=open_cache(cache_dir, enabled=not no_cache), use_daemon=not no_daemon,
+                                    force_rebuild=force_rebuild, jobs=jobs)
 
 def run_springboot_version(repos_dir: str):
     typer.echo(f"[springboot-version] Checking Spring Boot version compatibility in {repos_dir} (placeholder)")
@@ -24,13 +39,26 @@ def run_report(repos_dir: str, output: str = "report.json"):
 @app.command()
 def api_conflict(
     repos_dir: str = typer.Argument(..., help="Directory containing analyzed microservice repos"),
-    output: Optional[str] = typer.Option(None, help="Output file for the API conflict results (JSON)")
+    output: Optional[str] = typer.Option(None, help="Output file for the API conflict results (JSON)"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Ignore the persistent LLM verdict cache"),
+    cache_dir: Optional[str] = typer.Option(None, "--cache-dir", help="Directory for the LLM verdict cache"),
+    batch_size: int = typer.Option(1, "--batch-size", help="Endpoint pairs per LLM request (1 = one request per pair)"),
+    resume: bool = typer.Option(False, "--resume", help="Skip pairs already present in the partial <output>.jsonl"),
+    similarity_threshold: float = typer.Option(DEFAULT_THRESHOLD, "--similarity-threshold",
+                                               help="Minimum endpoint similarity for an ambiguous pair to reach the LLM (0 = send all)")
 ):
-    run_api_conflict(repos_dir, output)
+    run_api_conflict(repos_dir, output, no_cache, cache_dir, batch_size, resume, similarity_threshold)
 
 @app.command()
-def dependency_conflict(repos_dir: str = typer.Argument(..., help="Directory containing analyzed microservice repos")):
-    run_dependency_conflict(repos_dir)
+def dependency_conflict(
+    repos_dir: str = typer.Argument(..., help="Directory containing analyzed microservice repos"),
+    no_cache: bool = typer.Option(False, "--no-cache", help="Ignore the persistent LLM verdict cache"),
+    cache_dir: Optional[str] = typer.Option(None, "--cache-dir", help="Directory for the LLM verdict cache"),
+    no_daemon: bool = typer.Option(False, "--no-daemon", help="Start one JVM per repository instead of a warm analysis server"),
+    force_rebuild: bool = typer.Option(False, "--force-rebuild", help="Rebuild the analysis JAR even if its inputs are unchanged"),
+    jobs: int = typer.Option(1, "--jobs", "-j", help="Repositories to analyze and extract in parallel (worker processes)")
+):
+    run_dependency_conflict(repos_dir, no_cache, cache_dir, no_daemon, force_rebuild, jobs)
 
 @app.command()
 def springboot_version(repos_dir: str = typer.Argument(..., help="Directory containing analyzed microservice repos")):
@@ -4,49 +4,74 @@ import csv
 from typing import List, Dict, Optional
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
+from llm_cache import LLMCache
+from llm_dispatch import LLMDispatcher
+from build_file_parser import PLACEHOLDER_RE
+from repo_index import KIND_OUTPUT, indexed_files
+from pipeline_trace import traced
+from maven_version import latest_version as recommended_version, sort_versions
+from version_classifier import classify_dependency, format_classifier_reasoning, VersionClassifierStats
+
+DEPENDENCY_CONFLICT_SYSTEM_PROMPT = "You are an expert Java dependency manager. Given the following dependency and its versions across multiple microservices, determine if there is a conflict, what the risks are, and recommend a resolution. If there are multiple versions, recommend updating all services to the latest version unless there is a strong reason not to. If all services use the same version, confirm there is no conflict and explain why."
 
 def load_dependencies_from_extracted(repo_dir: str):
     deps = []
-    for root, dirs, files in os.walk(repo_dir):
-        if 'extracted_dependencies.json' in files:
-            path = os.path.join(root, 'extracted_dependencies.json')
-            with open(path, 'r') as f:
-                try:
-                    data = json.load(f)
-                    service_name = os.path.basename(root)
-                    for dep in data:
-                        dep['service'] = service_name
-                        deps.append(dep)
-                except Exception as e:
-                    print(f"Failed to load {path}: {e}")
+    for extracted in indexed_files(repo_dir, kind=KIND_OUTPUT, names=['extracted_dependencies.json']):
+        path = extracted.path
+        with open(path, 'r') as f:
+            try:
+                data = json.load(f)
+                service_name = os.path.basename(os.path.dirname(path))
+                for dep in data:
+                    dep['service'] = service_name
+                    deps.append(dep)
+            except Exception as e:
+                print(f"Failed to load {path}: {e}")
     return deps
 
+def is_unresolved_version(version):
+    return isinstance(version, str) and PLACEHOLDER_RE.search(version) is not None
+
 def aggregate_dependency_versions(dependency_list):
     dep_map = {}
+    unresolved = 0
     for dep in dependency_list:
         name = dep.get('name')
         version = dep.get('version')
         service = dep.get('service')
         if not name or version is None or service is None:
             continue
+        # An unresolved ${...} is not a version; counting it would report a false conflict
+        if is_unresolved_version(version):
+            unresolved += 1
+            continue
         if name not in dep_map:
             dep_map[name] = {}
         if version not in dep_map[name]:
             dep_map[name][version] = []
-        dep_map[name][version].append(service)
+        if service not in dep_map[name][version]:
+            dep_map[name][version].append(service)
+    if unresolved:
+        print(f"Ignored {unresolved} dependency entries with unresolved ${{...}} versions")
     return dep_map
 
 def escape_curly_braces(s):
     return s.replace('{', '{{').replace('}', '}}')
 
-def llm_reason_dependency_conflict(dep_name, versions_services, llm):
+def dependency_payload(dep_name, versions_services):
+    return {'dependency': dep_name, 'versions': {v: sorted(s) for v, s in versions_services.items()}}
+
+def build_dependency_request(dep_name, versions_services):
+    """Return (prompt, system_prompt, cache payload) for one dependency."""
     # Escape curly braces in all relevant strings
     dep_name_esc = escape_curly_braces(dep_name)
     versions = [escape_curly_braces(v) for v in versions_services.keys()]
     services = {escape_curly_braces(v): versions_services[v] for v in versions_services}
-    latest_version = sorted(versions, reverse=True)[0] if versions else None
+    # Maven ordering: 10.x sorts above 4.0.6.RELEASE, and releases are preferred over snapshots
+    latest_version = recommended_version(versions_services.keys())
+    latest_version = escape_curly_braces(latest_version) if latest_version else None
     prompt_template = ChatPromptTemplate.from_messages([
-        ("system", "You are an expert Java dependency manager. Given the following dependency and its versions across multiple microservices, determine if there is a conflict, what the risks are, and recommend a resolution. If there are multiple versions, recommend updating all services to the latest version unless there is a strong reason not to. If all services use the same version, confirm there is no conflict and explain why."),
+        ("system", DEPENDENCY_CONFLICT_SYSTEM_PROMPT),
         ("human", f"Dependency: {dep_name_esc}\nVersions found: {', '.join(versions)}\nService usage: " + ", ".join([f'{v}: {', '.join(services[v])}' for v in versions]) + (f"\nLatest version: {latest_version}" if latest_version else "") + "\nPlease provide a clear recommendation.")
     ])
     variables = {
@@ -56,10 +81,11 @@ def llm_reason_dependency_conflict(dep_name, versions_services, llm):
         "latest_version": latest_version
     }
     prompt = prompt_template.format(**variables)
-    response = llm.invoke(prompt)
-    return response.content
+    return prompt, DEPENDENCY_CONFLICT_SYSTEM_PROMPT, dependency_payload(dep_name, versions_services)
 
-def find_dependency_conflicts_semantic(repos_dir: str, output_path: Optional[str] = None) -> List[Dict]:
+@traced("dependency_conflict")
+def find_dependency_conflicts_semantic(repos_dir: str, output_path: Optional[str] = None, cache: Optional[LLMCache] = None,
+                                       dispatcher: Optional[LLMDispatcher] = None) -> List[Dict]:
     dependency_list = load_dependencies_from_extracted(repos_dir)
     dep_map = aggregate_dependency_versions(dependency_list)
     # Build a map of dep_name -> set of services
@@ -71,17 +97,34 @@ def find_dependency_conflicts_semantic(repos_dir: str, output_path: Optional[str
             dep_services.setdefault(name, set()).add(service)
     # Only analyze dependencies present in more than one service
     filtered_dep_map = {dep_name: versions_services for dep_name, versions_services in dep_map.items() if len(dep_services.get(dep_name, set())) > 1}
-    llm = ChatOpenAI(model="gpt-4o")
+    # Clear cases are settled by the version classifier; only ambiguous dependencies reach the LLM
+    stats = VersionClassifierStats()
+    decisions = {}
+    for dep_name, versions_services in filtered_dep_map.items():
+        decisions[dep_name] = classify_dependency(dep_name, versions_services)
+        stats.record(decisions[dep_name])
+    dispatcher = dispatcher or LLMDispatcher.from_env()
+    requests = []
+    for dep_name, versions_services in filtered_dep_map.items():
+        if decisions[dep_name] is None:
+            print(f"Analyzing {dep_name}: {list(versions_services.keys())}")
+            requests.append(build_dependency_request(dep_name, versions_services))
+    answers = iter(dispatcher.map_cached(ChatOpenAI(model="gpt-4o"), requests, cache) if requests else [])
     results = []
     for dep_name, versions_services in filtered_dep_map.items():
-        print(f"Analyzing {dep_name}: {list(versions_services.keys())}")
-        reasoning = llm_reason_dependency_conflict(dep_name, versions_services, llm)
+        decision = decisions[dep_name]
         results.append({
             'dependency': dep_name,
-            'versions': list(versions_services.keys()),
+            'versions': sort_versions(versions_services.keys()),
             'services': versions_services,
-            'llm_reasoning': reasoning
+            'latest_version': recommended_version(versions_services.keys()),
+            'llm_reasoning': format_classifier_reasoning(*decision) if decision is not None else next(answers),
+            'decided_by': 'classifier' if decision is not None else 'llm'
         })
+    print(stats.report())
+    print(dispatcher.report())
+    if cache is not None:
+        print(cache.report())
     if output_path:
         with open(output_path, 'w') as f:
             json.dump(results, f, indent=2)
@@ -0,0 +1,147 @@
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+from endpoint_matcher import (
+    ANY_METHOD,
+    DEEP_WILDCARD,
+    endpoint_methods,
+    endpoint_route,
+    is_variable_segment,
+)
+
+# Endpoint index over analysis_result.json endpoints: one path-segment trie per HTTP
+# method. Looking up an endpoint only walks the branches its route could match, so
+# candidate pairs grow with the number of real overlaps instead of n^2. A handler that
+# answers several methods sits in each of their buckets; one that may answer any method
+# (no httpMethods list, httpMethod REQUEST) sits in the REQUEST bucket.
+
+# An indexed item is a (service, endpoint) tuple.
+Item = Tuple[str, Dict]
+
+
+class _TrieNode:
+    __slots__ = ("literals", "variable", "terminal", "deep")
+
+    def __init__(self):
+        self.literals = {}     # literal segment -> child node
+        self.variable = None   # child for '{}', '*' and partially templated segments
+        self.terminal = []     # items whose route ends at this node
+        self.deep = []         # items whose route continues with '**' at this node
+
+    def walk(self) -> Iterator[Item]:
+        yield from self.terminal
+        yield from self.deep
+        for child in self.literals.values():
+            yield from child.walk()
+        if self.variable is not None:
+            yield from self.variable.walk()
+
+
+class _MethodBucket:
+    __slots__ = ("root", "opaque")
+
+    def __init__(self):
+        self.root = _TrieNode()
+        self.opaque = []  # items whose path could not be normalized; they overlap everything
+
+    def all_items(self) -> Iterator[Item]:
+        yield from self.opaque
+        yield from self.root.walk()
+
+
+class EndpointIndex:
+    """Buckets endpoints by HTTP method and route trie and answers 'what could collide with this?'."""
+
+    def __init__(self):
+        self._buckets: Dict[str, _MethodBucket] = {}
+        self.size = 0
+
+    def add(self, item: Item):
+        methods = endpoint_methods(item[1]) or [ANY_METHOD]
+        self.size += 1
+        for method in methods:
+            self._add(self._buckets.setdefault(method, _MethodBucket()), item)
+
+    def _add(self, bucket: _MethodBucket, item: Item):
+        route = endpoint_route(item[1])
+        if route is None:
+            bucket.opaque.append(item)
+            return
+        node = bucket.root
+        for seg in route.split("/"):
+            if not seg:
+                continue
+            if seg == DEEP_WILDCARD:
+                node.deep.append(item)
+                return
+            if is_variable_segment(seg):
+                if node.variable is None:
+                    node.variable = _TrieNode()
+                node = node.variable
+            else:
+                node = node.literals.setdefault(seg, _TrieNode())
+        node.terminal.append(item)
+
+    def candidates(self, ep: Dict) -> Iterator[Item]:
+        """Yield every indexed item whose method and route may overlap with ep, once each."""
+        methods = endpoint_methods(ep)
+        if methods is None:
+            buckets = list(self._buckets.values())
+        else:
+            buckets = [self._buckets[m] for m in sorted(methods | {ANY_METHOD}) if m in self._buckets]
+        route = endpoint_route(ep)
+        # Multi-method items are in several buckets
+        seen = set()
+        for bucket in buckets:
+            if route is None:
+                found = bucket.all_items()
+            else:
+                found = chain(bucket.opaque, self._match(bucket.root, [s for s in route.split("/") if s], 0))
+            for item in found:
+                if id(item) not in seen:
+                    seen.add(id(item))
+                    yield item
+
+    def _match(self, node: _TrieNode, segs: List[str], i: int) -> Iterator[Item]:
+        yield from node.deep
+        if i == len(segs):
+            yield from node.terminal
+            return
+        seg = segs[i]
+        if seg == DEEP_WILDCARD:
+            yield from node.terminal
+            for child in node.literals.values():
+                yield from child.walk()
+            if node.variable is not None:
+                yield from node.variable.walk()
+            return
+        if is_variable_segment(seg):
+            for child in node.literals.values():
+                yield from self._match(child, segs, i + 1)
+        elif seg in node.literals:
+            yield from self._match(node.literals[seg], segs, i + 1)
+        if node.variable is not None:
+            yield from self._match(node.variable, segs, i + 1)
+
+
+def iter_candidate_pairs(items: Iterable[Item]) -> Iterator[Tuple[Item, Item]]:
+    """
+    Lazily yield each unordered cross-service pair whose routes may overlap, exactly once,
+    as (earlier_item, later_item) in input order.
+    """
+    index = EndpointIndex()
+    for item in items:
+        for other in index.candidates(item[1]):
+            if other[0] != item[0]:
+                yield other, item
+        index.add(item)
+
+
+def count_cross_service_pairs(service_sizes: Iterable[int]) -> int:
+    """Number of unordered cross-service pairs a full Cartesian enumeration would produce."""
+    total = 0
+    seen = 0
+    for size in service_sizes:
+        total += seen * size
+        seen += size
+    return total
@@ -0,0 +1,191 @@
+import re
+from typing import Dict, FrozenSet, Optional, Tuple
+
+# Deterministic route matcher used to settle obvious endpoint pairs before any LLM call.
+# Paths are reduced to a canonical template ("/users/{}/orders") and compared
+# segment by segment; only pairs that genuinely overlap are left for the LLM.
+
+VARIABLE = "{}"
+WILDCARD = "*"
+DEEP_WILDCARD = "**"
+ANY_METHOD = "REQUEST"
+
+IDENTICAL = "identical"
+DISJOINT = "disjoint"
+OVERLAP = "overlap"
+
+_UNPARSEABLE_PATH = re.compile(r'["\s+,()]')
+
+
+def _collapse_variables(segment: str) -> str:
+    """Replace every {name} / {name:regex} occurrence in a segment with '{}'."""
+    out = []
+    depth = 0
+    for ch in segment:
+        if ch == "{":
+            if depth == 0:
+                out.append(VARIABLE)
+            depth += 1
+        elif ch == "}" and depth > 0:
+            depth -= 1
+        elif depth == 0:
+            out.append(ch)
+    return "".join(out)
+
+
+def normalize_path(path: Optional[str], prefix: Optional[str] = None) -> Optional[str]:
+    """
+    Return the canonical template for a (prefix + path) route, or None if the path
+    is not a plain literal (constants, concatenations, multi-value arrays).
+    """
+    parts = []
+    for raw in (prefix, path):
+        if raw is None:
+            continue
+        raw = raw.strip().strip('"')
+        if _UNPARSEABLE_PATH.search(raw):
+            return None
+        parts.append(raw)
+    segments = []
+    for part in parts:
+        for seg in part.split("/"):
+            if seg:
+                segments.append(_collapse_variables(seg))
+    return "/" + "/".join(segments)
+
+
+def endpoint_route(ep: Dict) -> Optional[str]:
+    """Canonical route template for an analysis_result.json endpoint."""
+    if "route" in ep:
+        # Resolved by the analyzer (class prefix included); None means the path is not a literal
+        return ep["route"]
+    return normalize_path(ep.get("path"), ep.get("classPath"))
+
+
+def endpoint_path(ep: Dict) -> str:
+    """Path to show for an endpoint: the full path with its class prefix when the analyzer resolved it."""
+    return ep.get("fullPath") or ep.get("path")
+
+
+def endpoint_method(ep: Dict) -> str:
+    return (ep.get("httpMethod") or ANY_METHOD).upper()
+
+
+def endpoint_methods(ep: Dict) -> Optional[FrozenSet[str]]:
+    """
+    HTTP methods an endpoint answers, or None when any method may match. The analyzer's
+    httpMethods list wins; httpMethod "REQUEST" only means "any" for results without one.
+    """
+    methods = ep.get("httpMethods")
+    if methods:
+        return frozenset(m.upper() for m in methods)
+    method = endpoint_method(ep)
+    return None if method == ANY_METHOD else frozenset([method])
+
+
+def format_methods(methods: Optional[FrozenSet[str]]) -> str:
+    return ANY_METHOD if methods is None else ", ".join(sorted(methods))
+
+
+def is_variable_segment(segment: str) -> bool:
+    """True for segments that can match more than one literal value ('{}', '*', 'file.{}')."""
+    return segment != DEEP_WILDCARD and (VARIABLE in segment or WILDCARD in segment)
+
+
+def compare_routes(route_a: str, route_b: str) -> str:
+    """Compare two canonical templates: IDENTICAL, DISJOINT or OVERLAP (ambiguous)."""
+    segs_a = [s for s in route_a.split("/") if s]
+    segs_b = [s for s in route_b.split("/") if s]
+    overlap = False
+    for seg_a, seg_b in zip(segs_a, segs_b):
+        if DEEP_WILDCARD in (seg_a, seg_b):
+            return OVERLAP
+        if seg_a == seg_b:
+            continue
+        if is_variable_segment(seg_a) or is_variable_segment(seg_b):
+            overlap = True
+            continue
+        return DISJOINT
+    if len(segs_a) != len(segs_b):
+        longer = segs_a if len(segs_a) > len(segs_b) else segs_b
+        if longer[min(len(segs_a), len(segs_b))] == DEEP_WILDCARD:
+            return OVERLAP
+        return DISJOINT
+    return OVERLAP if overlap else IDENTICAL
+
+
+def prefilter_pair(ep1: Dict, ep2: Dict) -> Optional[Tuple[str, str]]:
+    """
+    Decide an endpoint pair locally. Returns (verdict, explanation) for clear cases
+    and None when the pair is ambiguous and must go to the LLM.
+    """
+    methods_a, methods_b = endpoint_methods(ep1), endpoint_methods(ep2)
+    if methods_a is not None and methods_b is not None and not methods_a & methods_b:
+        return "No Conflict", f"HTTP methods differ ({format_methods(methods_a)} vs {format_methods(methods_b)})."
+    route_a, route_b = endpoint_route(ep1), endpoint_route(ep2)
+    if route_a is None or route_b is None:
+        return None
+    relation = compare_routes(route_a, route_b)
+    if relation == DISJOINT:
+        return "No Conflict", f"Routes {route_a} and {route_b} cannot match the same request."
+    if relation == IDENTICAL and methods_a == methods_b:
+        methods = format_methods(methods_a)
+        if ep1.get("methodName") and ep1.get("methodName") == ep2.get("methodName"):
+            return "Equivalent", f"Both endpoints expose {methods} {route_a} with the same handler name '{ep1['methodName']}'."
+        return "Conflict", f"Both endpoints expose {methods} {route_a}; the routes would collide in a consolidated service."
+    return None
+
+
+def format_local_reasoning(verdict: str, explanation: str) -> str:
+    """Render a local verdict in the same shape as an LLM answer."""
+    return f"{verdict}\n\n{explanation} (Decided by the deterministic route pre-filter; no LLM call was made.)"
+
+
+class PrefilterStats:
+    """Counters for how many endpoint pairs were settled without the LLM."""
+
+    def __init__(self):
+        self.total = 0
+        self.no_conflict = 0
+        self.identical = 0
+        self.ambiguous = 0
+        self.screened = 0  # ambiguous pairs the similarity screen settled without the LLM
+        self.pruned = 0  # pairs never generated because the endpoint index ruled them out
+
+    def record(self, decision: Optional[Tuple[str, str]]):
+        self.total += 1
+        if decision is None:
+            self.ambiguous += 1
+        elif decision[0] == "No Conflict":
+            self.no_conflict += 1
+        else:
+            self.identical += 1
+
+    @property
+    def sent_to_llm(self) -> int:
+        return self.ambiguous - self.screened
+
+    @property
+    def llm_calls_avoided(self) -> int:
+        return self.pruned + self.no_conflict + self.identical + self.screened
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "pruned_by_index": self.pruned,
+            "total_pairs": self.total,
+            "no_conflict": self.no_conflict,
+            "identical_route": self.identical,
+            "screened_by_similarity": self.screened,
+            "sent_to_llm": self.sent_to_llm,
+            "llm_calls_avoided": self.llm_calls_avoided,
+        }
+
+    def report(self) -> str:
+        considered = self.pruned + self.total
+        pct = (100.0 * self.llm_calls_avoided / considered) if considered else 0.0
+        return (
+            f"Route pre-filter: {self.pruned} pairs pruned by index, {self.total} candidate pairs, {self.no_conflict} no-conflict, "
+            f"{self.identical} identical-route, {self.screened} screened by similarity, {self.sent_to_llm} sent to LLM "
+            f"({self.llm_calls_avoided} LLM calls avoided, {pct:.1f}%)"
+        )
+
@@ -0,0 +1,162 @@
+import re
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # the similarity screen is skipped and every ambiguous pair goes to the LLM
+    np = None
+
+from endpoint_matcher import endpoint_path
+
+# Offline similarity screen for endpoint pairs the route prefilter could not settle. Every
+# endpoint becomes a TF-IDF vector over the words of its path, class and method names
+# (UserController.getUserByUserName -> user, controller, get, user, by, user, name) plus the
+# character trigrams of those words, so "usr" and "user" still meet. Features are hashed into
+# a fixed number of columns, so the matrix is dense but bounded: endpoints x SIMILARITY_DIM.
+#
+# Rows are L2-normalized, so cosine similarity is a dot product. Only the pairs the prefilter
+# leaves ambiguous are scored, one batch per dispatch window; pairs at or above the threshold
+# are forwarded to the LLM and the rest are recorded as "No Conflict" locally.
+# bench_endpoint_similarity.py reports recall on a labeled fixture set for tuning the cut-off.
+
+SIMILARITY_DIM = 4096
+DEFAULT_THRESHOLD = 0.2
+BLOCK_PAIRS = 1024
+NGRAM = 3
+# Character n-grams count for less than whole words
+NGRAM_WEIGHT = 0.5
+
+WORD_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+STOP_WORDS = {"by", "and", "or", "of", "the", "to", "for", "in", "with", "all", "api", "v"}
+
+
+def numpy_available() -> bool:
+    return np is not None
+
+
+def _stem(word: str) -> str:
+    """Crude plural folding, so /users and UserController share a word."""
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def endpoint_words(ep: Dict) -> List[str]:
+    """Lower-case words of an endpoint's path (path variable names included), class name and method name."""
+    text = " ".join(str(part) for part in (endpoint_path(ep) or "", ep.get("className") or "", ep.get("methodName") or ""))
+    return [_stem(word.lower()) for word in WORD_RE.findall(text) if word.lower() not in STOP_WORDS]
+
+
+def endpoint_features(ep: Dict) -> Dict[str, float]:
+    """Term counts of words and their character n-grams (n-grams weighted down)."""
+    features: Dict[str, float] = {}
+    for word in endpoint_words(ep):
+        features["w:" + word] = features.get("w:" + word, 0.0) + 1.0
+        padded = f"#{word}#"
+        for i in range(len(padded) - NGRAM + 1):
+            gram = "c:" + padded[i:i + NGRAM]
+            features[gram] = features.get(gram, 0.0) + NGRAM_WEIGHT
+    return features
+
+
+def _column(feature: str, dim: int) -> int:
+    # crc32 rather than hash(): the same feature must land in the same column in every process
+    return zlib.crc32(feature.encode("utf-8")) % dim
+
+
+class SimilarityStats:
+    def __init__(self, threshold: float):
+        self.threshold = threshold
+        self.endpoints = 0
+        self.screened = 0
+        self.forwarded = 0
+        self.vectorize_seconds = 0.0
+        self.score_seconds = 0.0
+
+    def report(self) -> str:
+        return (f"Similarity screen (threshold {self.threshold:.2f}): {self.endpoints} endpoints vectorized in "
+                f"{self.vectorize_seconds:.2f}s; {self.forwarded} ambiguous pairs forwarded to the LLM, "
+                f"{self.screened} screened out ({self.score_seconds:.2f}s scoring)")
+
+
+class EndpointSimilarity:
+    """TF-IDF vectors of a fixed endpoint list; pairs are scored on demand against a threshold."""
+
+    def __init__(self, endpoints: Sequence[Dict], threshold: float = DEFAULT_THRESHOLD, dim: int = SIMILARITY_DIM):
+        if np is None:
+            raise RuntimeError("The endpoint similarity screen needs NumPy")
+        self.endpoints = list(endpoints)
+        self.threshold = threshold
+        self.dim = dim
+        self.stats = SimilarityStats(threshold)
+        self._rows = {id(ep): i for i, ep in enumerate(self.endpoints)}
+        start = time.perf_counter()
+        self.matrix = self._vectorize()
+        self.stats.vectorize_seconds = time.perf_counter() - start
+        self.stats.endpoints = len(self.endpoints)
+
+    def _vectorize(self):
+        matrix = np.zeros((len(self.endpoints), self.dim), dtype=np.float32)
+        for row, ep in enumerate(self.endpoints):
+            for feature, count in endpoint_features(ep).items():
+                matrix[row, _column(feature, self.dim)] += count
+        # Sublinear tf, smoothed idf, unit rows
+        present = matrix > 0
+        np.log1p(matrix, out=matrix, where=present)
+        df = present.sum(axis=0)
+        idf = np.log((1 + len(self.endpoints)) / (1 + df)).astype(np.float32) + 1
+        matrix *= idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+    def pair_similarities(self, pairs: Sequence[Tuple[int, int]]):
+        """Cosine similarity of each (i, j) row pair, as a float array in pair order."""
+        start = time.perf_counter()
+        scores = np.empty(len(pairs), dtype=np.float32)
+        for lo in range(0, len(pairs), BLOCK_PAIRS):
+            # Row-wise dot products of one block of pairs: memory stays at BLOCK_PAIRS x dim
+            index = np.asarray(pairs[lo:lo + BLOCK_PAIRS], dtype=np.intp).reshape(-1, 2)
+            scores[lo:lo + len(index)] = np.einsum("ij,ij->i", self.matrix[index[:, 0]], self.matrix[index[:, 1]])
+        self.stats.score_seconds += time.perf_counter() - start
+        return scores
+
+    def similarity(self, ep1: Dict, ep2: Dict) -> float:
+        return float(self.pair_similarities([(self._rows[id(ep1)], self._rows[id(ep2)])])[0])
+
+    def is_similar(self, ep1: Dict, ep2: Dict) -> bool:
+        if id(ep1) not in self._rows or id(ep2) not in self._rows:
+            return True  # not vectorized: let the LLM decide
+        return self.similarity(ep1, ep2) >= self.threshold
+
+    def screen(self, pairs: Sequence[Tuple[Dict, Dict]]) -> List[Optional[Tuple[str, str]]]:
+        """
+        (verdict, explanation) for each pair too dissimilar to need the LLM, else None. The pairs
+        are scored in one pair_similarities call; pairs with an endpoint not vectorized are forwarded.
+        """
+        known = [i for i, (ep1, ep2) in enumerate(pairs) if id(ep1) in self._rows and id(ep2) in self._rows]
+        scores = self.pair_similarities([(self._rows[id(pairs[i][0])], self._rows[id(pairs[i][1])]) for i in known])
+        decisions: List[Optional[Tuple[str, str]]] = [None] * len(pairs)
+        for i, score in zip(known, scores):
+            if score < self.threshold:
+                decisions[i] = ("No Conflict", f"Endpoint similarity {score:.2f} is below {self.threshold:.2f}; the endpoints "
+                                               f"share too little of their paths, class and method names to be related.")
+        screened = sum(decision is not None for decision in decisions)
+        self.stats.screened += screened
+        self.stats.forwarded += len(pairs) - screened
+        return decisions
+
+
+def format_screen_reasoning(verdict: str, explanation: str) -> str:
+    """Render a screened pair in the same shape as an LLM answer."""
+    return f"{verdict}\n\n{explanation} (Decided by the endpoint similarity screen; no LLM call was made.)"
+
+
+def recall_at(similarity: EndpointSimilarity, positives: Iterable[Tuple[int, int]]) -> float:
+    """Share of labeled related pairs (row indices) the screen forwards."""
+    positives = list(positives)
+    if not positives:
+        return 1.0
+    return float((similarity.pair_similarities(positives) >= similarity.threshold).mean())
@@ -0,0 +1,79 @@
+import time
+import random
+import asyncio
+import hashlib
+import threading
+from typing import Callable, Optional
+
+# Local stand-in for ChatOpenAI with deterministic answers, injected latency and injected
+# 429s, so the dispatcher and pipelines can be exercised without network access.
+
+
+class FakeRateLimitError(Exception):
+    status_code = 429
+
+
+class FakeMessage:
+    def __init__(self, content: str, prompt_tokens: int, completion_tokens: int):
+        self.content = content
+        self.usage_metadata = {
+            "input_tokens": prompt_tokens,
+            "output_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+
+def _prompt_text(prompt) -> str:
+    if isinstance(prompt, (list, tuple)):
+        return "\n".join(str(getattr(m, "content", m)) for m in prompt)
+    return str(prompt)
+
+
+def default_responder(text: str) -> str:
+    """Stable pseudo-verdict derived from the prompt hash."""
+    verdicts = ("No Conflict", "Conflict", "Equivalent")
+    pick = int(hashlib.sha256(text.encode("utf-8")).hexdigest(), 16) % len(verdicts)
+    return f"{verdicts[pick]}\n\nFake verdict for a prompt of {len(text)} characters."
+
+
+class FakeChatModel:
+    """
+    Minimal chat model with invoke/ainvoke. `latency` seconds are added to every call and
+    `rate_limit_rate` of calls (seeded) raise FakeRateLimitError before answering.
+    """
+
+    def __init__(self, model_name: str = "fake-chat", latency: float = 0.0, rate_limit_rate: float = 0.0,
+                 seed: int = 0, responder: Optional[Callable[[str], str]] = None):
+        self.model_name = model_name
+        self.latency = latency
+        self.rate_limit_rate = rate_limit_rate
+        self.responder = responder or default_responder
+        self.calls = 0
+        self.rate_limited = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _respond(self, prompt) -> FakeMessage:
+        text = _prompt_text(prompt)
+        with self._lock:
+            self.calls += 1
+            if self._random.random() < self.rate_limit_rate:
+                self.rate_limited += 1
+                raise FakeRateLimitError("Rate limit exceeded (injected)")
+            content = self.responder(text)
+            prompt_tokens, completion_tokens = max(1, len(text) // 4), max(1, len(content) // 4)
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+        return FakeMessage(content, prompt_tokens, completion_tokens)
+
+    def invoke(self, prompt) -> FakeMessage:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._respond(prompt)
+
+    async def ainvoke(self, prompt) -> FakeMessage:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(prompt)
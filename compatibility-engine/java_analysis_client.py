@@ -0,0 +1,81 @@
+import json
+import subprocess
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+# Client for RepoAnalysisModule's --server mode: one warm JVM answers line-delimited
+# JSON-RPC requests, so JavaParser is loaded once instead of once per repository.
+
+MAIN_CLASS = "com.example.springboot_backend.RepoAnalysisModule"
+
+
+class JavaAnalysisError(Exception):
+    pass
+
+
+class JavaAnalysisClient:
+    def __init__(self, jar_path: str, cwd: str):
+        self.jar_path = jar_path
+        self.cwd = cwd
+        self._next_id = 0
+        # stderr is inherited so the server's log output stays visible
+        self._proc = subprocess.Popen(
+            ["java", "-cp", jar_path, MAIN_CLASS, "--server"],
+            cwd=cwd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, bufsize=1,
+        )
+
+    @property
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+
+    def call(self, method: str, params: Optional[Dict] = None):
+        if not self.alive:
+            raise JavaAnalysisError(f"Analysis server exited with code {self._proc.returncode}")
+        self._next_id += 1
+        request = {"jsonrpc": "2.0", "id": self._next_id, "method": method}
+        if params is not None:
+            request["params"] = params
+        try:
+            self._proc.stdin.write(json.dumps(request) + "\n")
+            self._proc.stdin.flush()
+            line = self._proc.stdout.readline()
+        except (BrokenPipeError, OSError) as e:
+            raise JavaAnalysisError(f"Analysis server connection lost: {e}")
+        if not line:
+            raise JavaAnalysisError("Analysis server closed its output stream")
+        try:
+            response = json.loads(line)
+        except ValueError:
+            raise JavaAnalysisError(f"Unexpected output from analysis server: {line[:200]!r}")
+        if response.get("error"):
+            raise JavaAnalysisError(response["error"].get("message", "unknown error"))
+        return response.get("result")
+
+    def ping(self) -> bool:
+        return bool((self.call("ping") or {}).get("pong"))
+
+    def analyze(self, repo_rel_path: str, persist: bool = True) -> Dict:
+        """Return the AnalysisResult payload (config, endpoints, migrationResult) for a ./repos path."""
+        return self.call("analyze", {"repo": repo_rel_path, "persist": persist})
+
+    def iter_analyze(self, repo_rel_paths: Iterable[str], persist: bool = True) -> Iterator[Tuple[str, Dict]]:
+        """Stream repositories through the warm JVM, yielding (path, result) as each completes."""
+        for repo_rel_path in repo_rel_paths:
+            yield repo_rel_path, self.analyze(repo_rel_path, persist)
+
+    def close(self):
+        if self.alive:
+            try:
+                self.call("shutdown")
+            except JavaAnalysisError:
+                pass
+            try:
+                self._proc.stdin.close()
+                self._proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self._proc.kill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,99 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Optional
+
+# Persistent, content-addressed cache for LLM verdicts.
+# Entries are keyed by sha256(model, system prompt, normalized payload) so a re-run only
+# pays for questions it has not asked before.
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".llm_cache")
+CACHE_FILENAME = "llm_verdicts.sqlite3"
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_ENTRIES = 200_000
+
+
+def cache_key(model: str, system_prompt: str, payload: Any) -> str:
+    normalized = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    digest = hashlib.sha256()
+    for part in (model or "", system_prompt or "", normalized):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def model_name_of(llm) -> str:
+    return getattr(llm, "model_name", None) or getattr(llm, "model", None) or type(llm).__name__
+
+
+class LLMCache:
+    """SQLite-backed verdict cache with TTL expiry and least-recently-used size eviction."""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        os.makedirs(cache_dir, exist_ok=True)
+        self.path = os.path.join(cache_dir, CACHE_FILENAME)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            "key TEXT PRIMARY KEY, model TEXT, response TEXT, created REAL, accessed REAL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS verdicts_accessed ON verdicts(accessed)")
+        self._conn.execute("DELETE FROM verdicts WHERE created < ?", (time.time() - self.ttl_seconds,))
+        self._count = self._conn.execute("SELECT COUNT(*) FROM verdicts").fetchone()[0]
+
+    def get(self, model: str, system_prompt: str, payload: Any) -> Optional[str]:
+        key = cache_key(model, system_prompt, payload)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT response, created FROM verdicts WHERE key = ?", (key,)).fetchone()
+            if row is None or row[1] < now - self.ttl_seconds:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE verdicts SET accessed = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+
+    def put(self, model: str, system_prompt: str, payload: Any, response: str):
+        key = cache_key(model, system_prompt, payload)
+        now = time.time()
+        with self._lock:
+            existed = self._conn.execute("SELECT 1 FROM verdicts WHERE key = ?", (key,)).fetchone() is not None
+            self._conn.execute(
+                "INSERT OR REPLACE INTO verdicts (key, model, response, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, model, response, now, now),
+            )
+            if not existed:
+                self._count += 1
+            if self._count > self.max_entries:
+                excess = self._count - self.max_entries
+                self._conn.execute(
+                    "DELETE FROM verdicts WHERE key IN (SELECT key FROM verdicts ORDER BY accessed ASC LIMIT ?)",
+                    (excess,),
+                )
+                self._count -= excess
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def report(self) -> str:
+        lookups = self.hits + self.misses
+        rate = (100.0 * self.hits / lookups) if lookups else 0.0
+        return f"LLM cache ({self.path}): {self.hits} hits, {self.misses} misses ({rate:.1f}% hit rate)"
+
+
+def open_cache(cache_dir: Optional[str] = None, enabled: bool = True) -> Optional[LLMCache]:
+    """Open the verdict cache, or return None when caching is disabled (--no-cache)."""
+    if not enabled:
+        return None
+    return LLMCache(cache_dir or DEFAULT_CACHE_DIR)
@@ -0,0 +1,236 @@
+import os
+import time
+import random
+import asyncio
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from llm_cache import LLMCache, model_name_of
+from pipeline_trace import get_tracer
+
+# Concurrent LLM dispatch. Requests run on an asyncio loop with bounded concurrency,
+# token-bucket limits for requests/min and tokens/min, and exponential backoff on 429s.
+# Results always come back in submission order.
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_REQUESTS_PER_MINUTE = 500
+DEFAULT_TOKENS_PER_MINUTE = 150_000
+DEFAULT_MAX_RETRIES = 6
+DEFAULT_WINDOW = 256
+COMPLETION_TOKEN_ESTIMATE = 400
+# decided_by of answers that came from the LLM (see iter_windowed)
+DECIDED_BY_LLM = "llm"
+
+# (prompt, system_prompt, payload) - prompt is what llm.invoke receives,
+# system_prompt/payload form the cache key.
+LLMRequest = Tuple[Any, str, Any]
+
+
+def estimate_tokens(prompt) -> int:
+    """Rough prompt size (~4 characters per token) for rate limiting."""
+    if isinstance(prompt, str):
+        chars = len(prompt)
+    elif isinstance(prompt, (list, tuple)):
+        chars = sum(len(str(getattr(m, "content", m))) for m in prompt)
+    else:
+        chars = len(str(prompt))
+    return max(1, chars // 4)
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    if getattr(exc, "status_code", None) == 429 or getattr(exc, "http_status", None) == 429:
+        return True
+    return type(exc).__name__ in ("RateLimitError", "TooManyRequests")
+
+
+class TokenBucket:
+    """Async token bucket refilled continuously at capacity-per-minute."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+        self._lock = None
+        self._loop = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        amount = min(amount, self.capacity)
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Buckets outlive a single asyncio.run(); locks must belong to the current loop
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def debit(self, amount: float):
+        """Charge tokens after the fact (e.g. actual usage exceeded the estimate)."""
+        self._refill()
+        self.tokens -= amount
+
+
+class LLMDispatcher:
+    """Runs many LLM prompts concurrently under rate limits and returns answers in order."""
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 requests_per_minute: int = DEFAULT_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: int = DEFAULT_TOKENS_PER_MINUTE,
+                 max_retries: int = DEFAULT_MAX_RETRIES,
+                 base_backoff: float = 1.0, max_backoff: float = 60.0):
+        self.max_concurrency = max_concurrency
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.calls = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self._progress = None
+
+    @classmethod
+    def from_env(cls) -> "LLMDispatcher":
+        return cls(
+            max_concurrency=int(os.environ.get("LLM_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY)),
+            requests_per_minute=int(os.environ.get("LLM_REQUESTS_PER_MINUTE", DEFAULT_REQUESTS_PER_MINUTE)),
+            tokens_per_minute=int(os.environ.get("LLM_TOKENS_PER_MINUTE", DEFAULT_TOKENS_PER_MINUTE)),
+        )
+
+    async def _invoke(self, llm, prompt):
+        if hasattr(llm, "ainvoke"):
+            return await llm.ainvoke(prompt)
+        return await asyncio.to_thread(llm.invoke, prompt)
+
+    @property
+    def progress(self):
+        # One bar per dispatcher; each window of a windowed run adds its calls to it
+        if self._progress is None:
+            self._progress = get_tracer().progress("LLM calls", self.max_concurrency)
+        return self._progress
+
+    async def _call(self, llm, prompt, semaphore):
+        estimate = estimate_tokens(prompt) + COMPLETION_TOKEN_ESTIMATE
+        tracer = get_tracer()
+        attempt = 0
+        while True:
+            await self.request_bucket.acquire(1)
+            await self.token_bucket.acquire(estimate)
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    self.calls += 1
+                    response = await self._invoke(llm, prompt)
+                except Exception as e:
+                    if not is_rate_limit_error(e) or attempt >= self.max_retries:
+                        tracer.record_llm(model_name_of(llm), time.perf_counter() - start, retries=attempt,
+                                          error=f"{type(e).__name__}: {e}")
+                        self.progress.advance()
+                        raise
+                    self.rate_limited += 1
+                    self.retries += 1
+                    delay = min(self.max_backoff, self.base_backoff * (2 ** attempt))
+                    attempt += 1
+                    await asyncio.sleep(delay * (1 + random.random() * 0.25))
+                    continue
+            usage = getattr(response, "usage_metadata", None) or {}
+            tracer.record_llm(model_name_of(llm), time.perf_counter() - start, usage.get("input_tokens", 0),
+                              usage.get("output_tokens", 0), retries=attempt)
+            self.progress.advance()
+            if usage.get("total_tokens", 0) > estimate:
+                self.token_bucket.debit(usage["total_tokens"] - estimate)
+            return response
+
+    async def amap(self, llm, prompts: Sequence, return_exceptions: bool = False) -> List[Any]:
+        """Invoke llm on every prompt concurrently; responses are returned in prompt order."""
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        self.progress.add(len(prompts))
+        tasks = [self._call(llm, p, semaphore) for p in prompts]
+        return await asyncio.gather(*tasks, return_exceptions=return_exceptions)
+
+    def map(self, llm, prompts: Sequence, return_exceptions: bool = False) -> List[Any]:
+        """Blocking wrapper around amap for the synchronous pipeline entry points."""
+        if not prompts:
+            return []
+        return asyncio.run(self.amap(llm, list(prompts), return_exceptions=return_exceptions))
+
+    def map_cached(self, llm, requests: Sequence[LLMRequest], cache: Optional[LLMCache] = None) -> List[str]:
+        """Like map, but answers found in the verdict cache are not re-sent; returns response contents."""
+        model = model_name_of(llm)
+        answers: List[Optional[str]] = [None] * len(requests)
+        misses = []
+        for i, (prompt, system_prompt, payload) in enumerate(requests):
+            if cache is not None:
+                answers[i] = cache.get(model, system_prompt, payload)
+            if answers[i] is None:
+                misses.append(i)
+        responses = self.map(llm, [requests[i][0] for i in misses])
+        for i, response in zip(misses, responses):
+            answers[i] = response.content
+            if cache is not None:
+                _, system_prompt, payload = requests[i]
+                cache.put(model, system_prompt, payload, response.content)
+        return answers
+
+    def report(self) -> str:
+        return f"LLM dispatcher: {self.calls} calls, {self.rate_limited} rate-limited, {self.retries} retries"
+
+
+def iter_windowed(items: Iterable, decide: Callable[[Any], Optional[Tuple[str, str]]],
+                  build_request: Callable[[Any], LLMRequest], llm_factory: Callable[[], Any],
+                  dispatcher: LLMDispatcher, cache: Optional[LLMCache] = None,
+                  window: int = DEFAULT_WINDOW,
+                  resolve: Optional[Callable[[Any, List], List[str]]] = None,
+                  screen: Optional[Callable[[List], List[Optional[Tuple[str, str]]]]] = None
+                  ) -> Iterator[Tuple[Any, str, str]]:
+    """
+    Yield (item, answer, decided_by) in input order. decide(item) settles an item locally as
+    (answer, decided_by) or returns None; the rest are collected in windows of up to `window`
+    items. screen(items), when given, gets each window in one call and may settle items the
+    same way; what is left is sent to the LLM concurrently (decided_by DECIDED_BY_LLM).
+    A custom resolve(llm, items) -> answers can replace the default one-request-per-item dispatch.
+    """
+    llm = None
+    buffered = []   # [item, (answer, decided_by) or None]
+    pending = 0
+    iterator = iter(items)
+    exhausted = False
+    while not exhausted:
+        for item in iterator:
+            decision = decide(item)
+            buffered.append([item, decision])
+            if decision is None:
+                pending += 1
+                if pending >= window:
+                    break
+        else:
+            exhausted = True
+        undecided = [entry for entry in buffered if entry[1] is None]
+        if undecided and screen is not None:
+            for entry, decision in zip(undecided, screen([item for item, _ in undecided])):
+                entry[1] = decision
+            undecided = [entry for entry in undecided if entry[1] is None]
+        if undecided:
+            if llm is None:
+                llm = llm_factory()
+            if resolve is not None:
+                answers = resolve(llm, [item for item, _ in undecided])
+            else:
+                answers = dispatcher.map_cached(llm, [build_request(item) for item, _ in undecided], cache)
+            for entry, answer in zip(undecided, answers):
+                entry[1] = (answer, DECIDED_BY_LLM)
+        for item, (answer, decided_by) in buffered:
+            yield item, answer, decided_by
+        buffered = []
+        pending = 0
@@ -0,0 +1,160 @@
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from build_file_parser import (
+    RawPom, BuildFileParseError, read_pom, resolve_placeholders, dependency_record, PLACEHOLDER_RE
+)
+from repo_index import get_index
+
+# Effective-model resolution for the Maven projects of one repository. Each pom.xml is read
+# once and its effective model (inherited properties + dependencyManagement, with BOM imports
+# merged) is memoized, so a multi-module repo resolves in one pass over its parent graph.
+# Parents and BOMs are looked up by relativePath, then by coordinates among the repo's own
+# POMs, then in the local Maven repository (~/.m2/repository); nothing is downloaded.
+
+
+def default_local_repository() -> str:
+    return os.environ.get("MAVEN_REPO_LOCAL") or os.path.join(os.path.expanduser("~"), ".m2", "repository")
+
+
+class EffectiveModel:
+    def __init__(self, pom: RawPom, properties: Dict[str, str], managed: Dict[Tuple[str, str], str]):
+        self.pom = pom
+        self.properties = properties
+        # (groupId, artifactId) -> resolved managed version
+        self.managed = managed
+
+    def resolve(self, value: Optional[str]) -> Optional[str]:
+        return resolve_placeholders(value, self.properties)
+
+
+class MavenResolver:
+    def __init__(self, repo_dir: str, pom_paths: Optional[Iterable[str]] = None, local_repository: Optional[str] = None):
+        self.repo_dir = repo_dir
+        self.local_repository = local_repository if local_repository is not None else default_local_repository()
+        self._pom_paths = [os.path.abspath(p) for p in pom_paths] if pom_paths is not None else None
+        self._raw: Dict[str, Optional[RawPom]] = {}
+        self._effective: Dict[str, EffectiveModel] = {}
+        self._in_progress = set()
+        self._by_coordinates: Optional[Dict[Tuple[str, str], List[str]]] = None
+        self.parsed = 0
+        self.memo_hits = 0
+        self.unresolved_parents = set()
+
+    def raw(self, path: str) -> Optional[RawPom]:
+        path = os.path.abspath(path)
+        if path not in self._raw:
+            try:
+                self._raw[path] = read_pom(path)
+                self.parsed += 1
+            except (BuildFileParseError, OSError):
+                self._raw[path] = None
+        return self._raw[path]
+
+    def _index(self) -> Dict[Tuple[str, str], List[str]]:
+        """(groupId, artifactId) -> pom paths within the repo, built once."""
+        if self._by_coordinates is None:
+            paths = self._pom_paths
+            if paths is None:
+                paths = get_index(self.repo_dir).paths(names=["pom.xml"], under=self.repo_dir)
+            self._by_coordinates = {}
+            for path in paths:
+                pom = self.raw(path)
+                if pom is None:
+                    continue
+                group = pom.project.get("groupId") or pom.parent.get("groupId")
+                artifact = pom.project.get("artifactId")
+                if group and artifact:
+                    self._by_coordinates.setdefault((group, artifact), []).append(path)
+        return self._by_coordinates
+
+    def find_pom(self, group: str, artifact: str, version: Optional[str],
+                 near: Optional[str] = None, relative_path: Optional[str] = None) -> Optional[str]:
+        """Locate the pom.xml of group:artifact:version, or None if it is not available offline."""
+        if near is not None and relative_path != "":
+            candidate = os.path.join(os.path.dirname(near), relative_path or os.path.join("..", "pom.xml"))
+            if os.path.isdir(candidate):
+                candidate = os.path.join(candidate, "pom.xml")
+            candidate = os.path.abspath(candidate)
+            pom = self.raw(candidate) if os.path.isfile(candidate) else None
+            if pom is not None and pom.project.get("artifactId") == artifact:
+                return candidate
+        paths = self._index().get((group, artifact), [])
+        for path in paths:
+            pom = self.raw(path)
+            if version is None or (pom.project.get("version") or pom.parent.get("version")) == version:
+                return path
+        if paths:
+            return paths[0]
+        if version and self.local_repository:
+            candidate = os.path.join(self.local_repository, *group.split("."), artifact, version, f"{artifact}-{version}.pom")
+            if os.path.isfile(candidate):
+                return candidate
+        return None
+
+    def effective(self, path: str) -> Optional[EffectiveModel]:
+        """Memoized effective model of a pom.xml; None if the file cannot be parsed."""
+        path = os.path.abspath(path)
+        if path in self._effective:
+            self.memo_hits += 1
+            return self._effective[path]
+        pom = self.raw(path)
+        if pom is None:
+            return None
+        if path in self._in_progress:
+            # Parent/BOM cycle: resolve this POM on its own
+            return EffectiveModel(pom, dict(pom.implicit_properties(), **pom.properties), {})
+        self._in_progress.add(path)
+        try:
+            properties: Dict[str, str] = {}
+            managed: Dict[Tuple[str, str], str] = {}
+            if pom.parent.get("groupId") and pom.parent.get("artifactId"):
+                parent_path = self.find_pom(pom.parent["groupId"], pom.parent["artifactId"], pom.parent.get("version"),
+                                            near=path, relative_path=pom.parent.get("relativePath"))
+                parent_model = self.effective(parent_path) if parent_path else None
+                if parent_model is not None:
+                    properties.update(parent_model.properties)
+                    managed.update(parent_model.managed)
+                else:
+                    self.unresolved_parents.add(f"{pom.parent['groupId']}:{pom.parent['artifactId']}:{pom.parent.get('version')}")
+            properties.update(pom.implicit_properties())
+            properties.update(pom.properties)
+            model = EffectiveModel(pom, properties, managed)
+
+            # Own dependencyManagement overrides the parent's; imported BOMs only fill gaps, first import wins
+            imports = []
+            for group, artifact, version, scope, dep_type in pom.managed:
+                group, artifact, version = model.resolve(group), model.resolve(artifact), model.resolve(version)
+                if scope == "import" and dep_type == "pom":
+                    imports.append((group, artifact, version))
+                elif version:
+                    managed[(group, artifact)] = version
+            for group, artifact, version in imports:
+                bom_path = self.find_pom(group, artifact, version)
+                bom_model = self.effective(bom_path) if bom_path else None
+                if bom_model is not None:
+                    for key, value in bom_model.managed.items():
+                        managed.setdefault(key, value)
+        finally:
+            self._in_progress.discard(path)
+        self._effective[path] = model
+        return model
+
+    def dependencies(self, path: str, source: str = "pom.xml") -> List[Dict]:
+        """Dependency records of a pom.xml with versions resolved through its effective model."""
+        model = self.effective(path)
+        if model is None:
+            raise BuildFileParseError(f"{path}: could not be parsed")
+        records = []
+        for group, artifact, version, _, _ in model.pom.managed + model.pom.dependencies:
+            group, artifact, version = model.resolve(group), model.resolve(artifact), model.resolve(version)
+            if not version or PLACEHOLDER_RE.search(version):
+                version = model.managed.get((group, artifact), version)
+            records.append(dependency_record(group, artifact, version, source, path))
+        return records
+
+    def report(self) -> str:
+        text = f"Maven resolver: {self.parsed} POMs parsed, {len(self._effective)} effective models, {self.memo_hits} memo hits"
+        if self.unresolved_parents:
+            text += f", {len(self.unresolved_parents)} parents not available offline"
+        return text
@@ -0,0 +1,206 @@
+import re
+from functools import total_ordering
+from typing import Iterable, List, Optional
+
+# Maven version ordering (org.apache.maven.artifact.versioning.ComparableVersion semantics):
+# numeric parts compare numerically, qualifiers order alpha < beta < milestone < rc < snapshot
+# < release < sp, and unknown qualifiers sort after those, alphabetically. So
+# 4.0.6.RELEASE < 5.3.39 < 6.2.0-RC1 < 6.2.0 == 6.2 == 6.2.0.RELEASE < 10.0.
+
+QUALIFIERS = ["alpha", "beta", "milestone", "rc", "snapshot", "", "sp"]
+QUALIFIER_ALIASES = {"ga": "", "final": "", "release": "", "cr": "rc"}
+RELEASE_INDEX = str(QUALIFIERS.index(""))
+PRERELEASE_QUALIFIERS = {"alpha", "beta", "milestone", "rc", "snapshot"}
+# Plain versions only: no ranges, dynamic versions (1.+, latest.release) or placeholders
+PLAIN_VERSION_RE = re.compile(r"^\d+(?:[.-]?[A-Za-z0-9]+)*$")
+
+
+def _comparable_qualifier(value: str) -> str:
+    if value in QUALIFIERS:
+        return str(QUALIFIERS.index(value))
+    return f"{len(QUALIFIERS)}-{value}"
+
+
+class _Item:
+    INT, STRING, LIST = 0, 1, 2
+
+    def __init__(self, kind: int, value):
+        self.kind = kind
+        self.value = value
+
+    def is_null(self) -> bool:
+        if self.kind == _Item.INT:
+            return self.value == 0
+        if self.kind == _Item.STRING:
+            return _comparable_qualifier(self.value) == RELEASE_INDEX
+        return not self.value
+
+    def compare(self, other: Optional["_Item"]) -> int:
+        if self.kind == _Item.INT:
+            if other is None:
+                return 0 if self.value == 0 else 1
+            if other.kind == _Item.INT:
+                return (self.value > other.value) - (self.value < other.value)
+            return 1
+        if self.kind == _Item.STRING:
+            mine = _comparable_qualifier(self.value)
+            if other is None:
+                return (mine > RELEASE_INDEX) - (mine < RELEASE_INDEX)
+            if other.kind == _Item.STRING:
+                theirs = _comparable_qualifier(other.value)
+                return (mine > theirs) - (mine < theirs)
+            return -1
+        if other is None:
+            return self.value[0].compare(None) if self.value else 0
+        if other.kind == _Item.INT:
+            return -1
+        if other.kind == _Item.STRING:
+            return 1
+        for i in range(max(len(self.value), len(other.value))):
+            left = self.value[i] if i < len(self.value) else None
+            right = other.value[i] if i < len(other.value) else None
+            result = left.compare(right) if left is not None else -right.compare(None)
+            if result:
+                return result
+        return 0
+
+
+def _string_item(value: str, followed_by_digit: bool) -> _Item:
+    if followed_by_digit and len(value) == 1:
+        value = {"a": "alpha", "b": "beta", "m": "milestone"}.get(value, value)
+    return _Item(_Item.STRING, QUALIFIER_ALIASES.get(value, value))
+
+
+def _normalize(items: List[_Item]):
+    for i in range(len(items) - 1, -1, -1):
+        if items[i].is_null():
+            del items[i]
+        elif items[i].kind != _Item.LIST:
+            break
+
+
+def _parse(version: str) -> _Item:
+    version = version.lower()
+    root = _Item(_Item.LIST, [])
+    current = root
+    stack = [root]
+    is_digit = False
+    start = 0
+
+    def token_item(end: int, digit: bool) -> _Item:
+        token = version[start:end]
+        if digit:
+            return _Item(_Item.INT, int(token))
+        return _string_item(token, False)
+
+    for i, c in enumerate(version):
+        if c == ".":
+            current.value.append(_Item(_Item.INT, 0) if i == start else token_item(i, is_digit))
+            start = i + 1
+        elif c == "-":
+            current.value.append(_Item(_Item.INT, 0) if i == start else token_item(i, is_digit))
+            start = i + 1
+            current.value.append(_Item(_Item.LIST, []))
+            current = current.value[-1]
+            stack.append(current)
+        elif c.isdigit():
+            if not is_digit and i > start:
+                # "rc1", "m2": the qualifier is followed by a number
+                current.value.append(_string_item(version[start:i], True))
+                start = i
+                current.value.append(_Item(_Item.LIST, []))
+                current = current.value[-1]
+                stack.append(current)
+            is_digit = True
+        else:
+            if is_digit and i > start:
+                current.value.append(token_item(i, True))
+                start = i
+                current.value.append(_Item(_Item.LIST, []))
+                current = current.value[-1]
+                stack.append(current)
+            is_digit = False
+    if len(version) > start:
+        if not is_digit and current.value:
+            # 1.0.0.X1 < 1.0.0-X2: a trailing .X qualifier is treated as -X
+            current.value.append(_Item(_Item.LIST, []))
+            current = current.value[-1]
+            stack.append(current)
+        current.value.append(token_item(len(version), is_digit))
+    while stack:
+        _normalize(stack.pop().value)
+    return root
+
+
+@total_ordering
+class ComparableVersion:
+    def __init__(self, version: str):
+        self.version = version
+        self._items = _parse(version)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ComparableVersion) and self._items.compare(other._items) == 0
+
+    def __lt__(self, other: "ComparableVersion") -> bool:
+        return self._items.compare(other._items) < 0
+
+    def __hash__(self):
+        return hash(self.canonical())
+
+    def canonical(self) -> str:
+        def render(item: _Item) -> str:
+            if item.kind == _Item.LIST:
+                return "(" + ",".join(render(i) for i in item.value) + ")"
+            return str(item.value)
+        return render(self._items)
+
+    def __repr__(self):
+        return f"ComparableVersion({self.version!r})"
+
+
+def is_plain_version(version) -> bool:
+    return isinstance(version, str) and PLAIN_VERSION_RE.match(version) is not None
+
+
+def numeric_parts(version: str) -> List[int]:
+    """Leading numeric components: '6.2.8' -> [6, 2, 8], '4.0.6.RELEASE' -> [4, 0, 6]."""
+    parts = []
+    for token in re.split(r"[.-]", version):
+        if not token.isdigit():
+            break
+        parts.append(int(token))
+    return parts
+
+
+def major_version(version: str) -> Optional[int]:
+    parts = numeric_parts(version)
+    return parts[0] if parts else None
+
+
+def major_minor(version: str) -> Optional[str]:
+    parts = numeric_parts(version)
+    return f"{parts[0]}.{parts[1] if len(parts) > 1 else 0}" if parts else None
+
+
+def is_prerelease(version: str) -> bool:
+    tokens = re.findall(r"[a-z]+", version.lower())
+    if any(token in PRERELEASE_QUALIFIERS for token in tokens):
+        return True
+    # M1 / RC2 / a1 style qualifiers followed by a number
+    return re.search(r"(?:^|[.-])(?:m|rc|cr|a|b)\d", version.lower()) is not None
+
+
+def sort_versions(versions: Iterable[str]) -> List[str]:
+    """Ascending Maven order; non-plain versions (ranges, placeholders) are placed first, as given."""
+    versions = list(versions)
+    plain = sorted((v for v in versions if is_plain_version(v)), key=ComparableVersion)
+    return [v for v in versions if not is_plain_version(v)] + plain
+
+
+def latest_version(versions: Iterable[str]) -> Optional[str]:
+    """Highest plain version, preferring releases over snapshots and milestones."""
+    plain = [v for v in versions if is_plain_version(v)]
+    if not plain:
+        return None
+    releases = [v for v in plain if not is_prerelease(v)]
+    return max(releases or plain, key=ComparableVersion)
@@ -0,0 +1,333 @@
+import os
+import sys
+import json
+import time
+import atexit
+import argparse
+import itertools
+import threading
+from contextlib import contextmanager
+from functools import wraps
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Spans and LLM metrics for the pipeline. With a trace file (--trace or PIPELINE_TRACE), every
+# span (JAR build, Java analysis, index walks, merge steps) and every LLM call (model, latency,
+# prompt/completion tokens, retries, cost) is appended to it as one JSON line. Worker processes
+# inherit the path through the environment and append to the same file, so the summary table
+# printed at exit, or later with `python pipeline_trace.py trace.jsonl`, covers the whole run.
+# Without a trace file spans cost next to nothing.
+#
+# --progress (PIPELINE_PROGRESS=1) draws a live bar on stderr for LLM calls, with an ETA from
+# the observed per-call latency and the dispatcher's concurrency.
+
+TRACE_ENV = "PIPELINE_TRACE"
+PROGRESS_ENV = "PIPELINE_PROGRESS"
+LLM_SPAN = "llm.call"
+# USD per million prompt / completion tokens; the longest model name prefix that matches wins
+MODEL_PRICES = {
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+    "gpt-4-turbo": (10.00, 30.00),
+    "gpt-4": (30.00, 60.00),
+    "gpt-3.5-turbo": (0.50, 1.50),
+}
+# Weight of the newest call in the running per-call latency
+LATENCY_SMOOTHING = 0.2
+PROGRESS_REFRESH_SECONDS = 0.5
+PROGRESS_WIDTH = 30
+
+
+def model_cost(model: str, prompt_tokens: int, completion_tokens: int) -> Optional[float]:
+    """USD cost of one call, or None for a model without a known price."""
+    matches = [name for name in MODEL_PRICES if model.startswith(name)]
+    if not matches:
+        return None
+    prompt_price, completion_price = MODEL_PRICES[max(matches, key=len)]
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1_000_000
+
+
+def _format_seconds(seconds: float) -> str:
+    seconds = int(seconds)
+    if seconds >= 3600:
+        return f"{seconds // 3600}h{seconds % 3600 // 60:02d}m"
+    if seconds >= 60:
+        return f"{seconds // 60}m{seconds % 60:02d}s"
+    return f"{seconds}s"
+
+
+class Span:
+    __slots__ = ("id", "parent", "name", "attrs")
+
+    def __init__(self, span_id: Optional[str], parent: Optional[str], name: str, attrs: Dict):
+        self.id = span_id
+        self.parent = parent
+        self.name = name
+        self.attrs = attrs
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+class Progress:
+    """One-line progress bar on stderr; work can be added while it runs (windowed dispatch)."""
+
+    def __init__(self, tracer: "Tracer", label: str, concurrency: int = 1, enabled: bool = True):
+        self.tracer = tracer
+        self.label = label
+        self.concurrency = max(1, concurrency)
+        self.enabled = enabled
+        self.total = 0
+        self.done = 0
+        self.started = None
+        self._drawn = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, count: int):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.total += count
+            if self.started is None:
+                self.started = time.monotonic()
+        self._draw(force=True)
+
+    def advance(self, count: int = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self.done += count
+        self._draw(force=self.done >= self.total)
+
+    def eta(self) -> Optional[float]:
+        latency = self.tracer.llm_latency
+        remaining = self.total - self.done
+        if latency is None or remaining <= 0:
+            return None if remaining > 0 else 0.0
+        return remaining * latency / min(self.concurrency, remaining)
+
+    def _draw(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._drawn < PROGRESS_REFRESH_SECONDS:
+            return
+        self._drawn = now
+        total = max(self.total, 1)
+        filled = PROGRESS_WIDTH * self.done // total
+        eta = self.eta()
+        line = (f"\r{self.label} [{'#' * filled}{'.' * (PROGRESS_WIDTH - filled)}] {self.done}/{self.total} "
+                f"elapsed {_format_seconds(now - self.started)} ETA {_format_seconds(eta) if eta is not None else '--'}")
+        sys.stderr.write(line + ("\n" if self.done >= self.total else ""))
+        sys.stderr.flush()
+
+
+class Tracer:
+    def __init__(self, path: Optional[str] = None, progress: bool = False):
+        self.path = path
+        self.progress_enabled = progress
+        self.llm_latency: Optional[float] = None
+        self.root_pid = None
+        self._file = None
+        self._file_pid = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._ids = itertools.count(1)
+
+    @property
+    def enabled(self) -> bool:
+        return self.path is not None
+
+    def _write(self, record: Dict):
+        with self._lock:
+            if self._file is None or self._file_pid != os.getpid():
+                # Line-buffered append: lines from worker processes interleave but never tear
+                self._file = open(self.path, "a", buffering=1)
+                self._file_pid = os.getpid()
+            self._file.write(json.dumps(record, default=str) + "\n")
+
+    def _stack(self) -> List[Span]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    @contextmanager
+    def span(self, name: str, **attrs):
+        """Time the enclosed block; the span's attributes can be extended with span.set()."""
+        if not self.enabled:
+            yield Span(None, None, name, attrs)
+            return
+        stack = self._stack()
+        span = Span(f"{os.getpid()}-{next(self._ids)}", stack[-1].id if stack else None, name, attrs)
+        stack.append(span)
+        started_at = time.time()
+        start = time.perf_counter()
+        error = None
+        try:
+            yield span
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            stack.pop()
+            record = {"span": name, "id": span.id, "parent": span.parent, "pid": os.getpid(),
+                      "start": round(started_at, 3), "seconds": round(time.perf_counter() - start, 6)}
+            if error is not None:
+                record["error"] = error
+            record.update(span.attrs)
+            self._write(record)
+
+    def record_llm(self, model: str, seconds: float, prompt_tokens: int = 0, completion_tokens: int = 0,
+                   retries: int = 0, error: Optional[str] = None):
+        """One LLM call (the attempt that answered, or the one that finally failed)."""
+        if error is None:
+            with self._lock:
+                self.llm_latency = seconds if self.llm_latency is None else (
+                    LATENCY_SMOOTHING * seconds + (1 - LATENCY_SMOOTHING) * self.llm_latency)
+        if not self.enabled:
+            return
+        stack = self._stack()
+        record = {"span": LLM_SPAN, "parent": stack[-1].id if stack else None, "pid": os.getpid(),
+                  "start": round(time.time() - seconds, 3), "seconds": round(seconds, 6), "model": model,
+                  "prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens, "retries": retries}
+        cost = model_cost(model, prompt_tokens, completion_tokens)
+        if cost is not None:
+            record["cost_usd"] = round(cost, 6)
+        if error is not None:
+            record["error"] = error
+        self._write(record)
+
+    def progress(self, label: str, concurrency: int = 1) -> Progress:
+        return Progress(self, label, concurrency, enabled=self.progress_enabled)
+
+    def close(self):
+        if self._file is not None and self._file_pid == os.getpid():
+            self._file.close()
+            self._file = None
+        if self.enabled and self.root_pid == os.getpid() and os.path.exists(self.path):
+            print(f"\n{format_summary(summarize_trace(self.path))}")
+            print(f"Trace written to {self.path}")
+
+
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """The process's tracer; workers and subprocesses pick up the run's trace file from the environment."""
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer(os.environ.get(TRACE_ENV) or None, os.environ.get(PROGRESS_ENV) == "1")
+    return _tracer
+
+
+def configure_tracing(path: Optional[str] = None, progress: bool = False) -> Tracer:
+    """Start a traced run: truncate the trace file, export it to child processes, summarize at exit."""
+    global _tracer
+    if path:
+        path = os.path.abspath(path)
+        open(path, "w").close()
+        os.environ[TRACE_ENV] = path
+    if progress:
+        os.environ[PROGRESS_ENV] = "1"
+    _tracer = Tracer(path, progress)
+    _tracer.root_pid = os.getpid()
+    atexit.register(_tracer.close)
+    return _tracer
+
+
+def trace_args(argv: Sequence[str]) -> Tuple[Optional[str], bool]:
+    """Read '--trace PATH' / '--trace=PATH' and '--progress' from an argv list for the plain-script entry points."""
+    path = None
+    for i, arg in enumerate(argv):
+        if arg == "--trace" and i + 1 < len(argv):
+            path = argv[i + 1]
+        elif arg.startswith("--trace="):
+            path = arg.split("=", 1)[1]
+    return path, "--progress" in argv
+
+
+def traced(name: Optional[str] = None):
+    """Decorator: run the function inside a span (named after the function by default)."""
+    def decorate(func):
+        span_name = name or func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with get_tracer().span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def traced_invoke(llm, prompt, model: str):
+    """llm.invoke(prompt), recorded as an LLM call."""
+    tracer = get_tracer()
+    start = time.perf_counter()
+    try:
+        response = llm.invoke(prompt)
+    except Exception as e:
+        tracer.record_llm(model, time.perf_counter() - start, error=f"{type(e).__name__}: {e}")
+        raise
+    usage = getattr(response, "usage_metadata", None) or {}
+    tracer.record_llm(model, time.perf_counter() - start, usage.get("input_tokens", 0), usage.get("output_tokens", 0))
+    return response
+
+
+def _percentile(sorted_values: List[float], share: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * share))]
+
+
+def summarize_trace(path: str) -> List[Dict]:
+    """Per span name: count, errors, total/mean/p95/max seconds, tokens, retries and cost; slowest total first."""
+    groups: Dict[str, Dict] = {}
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # a worker killed mid-write
+            name = record.get("span")
+            if name is None:
+                continue
+            if name == LLM_SPAN:
+                name = f"{LLM_SPAN} {record.get('model', '?')}"
+            group = groups.setdefault(name, {"span": name, "count": 0, "errors": 0, "durations": [],
+                                             "prompt_tokens": 0, "completion_tokens": 0, "retries": 0,
+                                             "cost_usd": None})
+            group["count"] += 1
+            group["errors"] += "error" in record
+            group["durations"].append(record.get("seconds", 0.0))
+            group["prompt_tokens"] += record.get("prompt_tokens", 0)
+            group["completion_tokens"] += record.get("completion_tokens", 0)
+            group["retries"] += record.get("retries", 0)
+            if "cost_usd" in record:
+                group["cost_usd"] = (group["cost_usd"] or 0.0) + record["cost_usd"]
+    rows = []
+    for group in groups.values():
+        durations = sorted(group.pop("durations"))
+        group.update(total_seconds=sum(durations), mean_seconds=sum(durations) / len(durations),
+                     p95_seconds=_percentile(durations, 0.95), max_seconds=durations[-1])
+        rows.append(group)
+    rows.sort(key=lambda row: row["total_seconds"], reverse=True)
+    return rows
+
+
+def format_summary(rows: List[Dict]) -> str:
+    lines = [f"{'span':<32} {'count':>7} {'err':>4} {'total s':>9} {'mean s':>8} {'p95 s':>8} {'max s':>8} "
+             f"{'prompt tok':>11} {'compl tok':>10} {'retry':>6} {'cost $':>9}"]
+    for row in rows:
+        cost = f"{row['cost_usd']:.4f}" if row["cost_usd"] is not None else "-"
+        lines.append(f"{row['span'][:32]:<32} {row['count']:>7} {row['errors']:>4} {row['total_seconds']:>9.2f} "
+                     f"{row['mean_seconds']:>8.3f} {row['p95_seconds']:>8.3f} {row['max_seconds']:>8.3f} "
+                     f"{row['prompt_tokens']:>11} {row['completion_tokens']:>10} {row['retries']:>6} {cost:>9}")
+    total_cost = sum(row["cost_usd"] or 0.0 for row in rows)
+    if total_cost:
+        lines.append(f"LLM cost: ${total_cost:.4f}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize a pipeline trace file")
+    parser.add_argument("trace")
+    parser.add_argument("--json", action="store_true", help="Print the summary rows as JSON")
+    args = parser.parse_args()
+    rows = summarize_trace(args.trace)
+    print(json.dumps(rows, indent=2) if args.json else format_summary(rows))
@@ -2,6 +2,9 @@ import os
 import json
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
+from llm_dispatch import LLMDispatcher
+from repo_pool import run_per_repo, parse_jobs
+from repo_index import KIND_BUILD, KIND_JAVA, get_index, indexed_files
 
 # Optionally: from tavily import TavilyClient
 
@@ -19,17 +22,17 @@ def escape_curly_braces(s):
 
 def find_java_projects(base_dir):
     projects = []
-    for root, dirs, files in os.walk(base_dir):
-        if "build.gradle" in files or "pom.xml" in files:
-            projects.append(root)
+    for build_file in indexed_files(base_dir, kind=KIND_BUILD, names=["build.gradle", "pom.xml"]):
+        project = os.path.normpath(os.path.join(base_dir, os.path.relpath(os.path.dirname(build_file.path), os.path.abspath(base_dir))))
+        if project not in projects:
+            projects.append(project)
     return projects
 
-def extract_project_structure(project_dir):
+def extract_project_structure(project_dir, repos_dir=None):
     structure = []
-    for root, dirs, files in os.walk(project_dir):
-        for file in files:
-            if file.endswith(".java"):
-                structure.append(os.path.relpath(os.path.join(root, file), project_dir))
+    # A project may be a module inside a repository; repos_dir resolves it to the repository's index
+    for java_file in get_index(project_dir, repos_dir).files(kind=KIND_JAVA, under=project_dir):
+        structure.append(os.path.relpath(java_file.path, project_dir))
     return structure
 
 def extract_dependencies(project_dir):
@@ -43,44 +46,58 @@ def extract_dependencies(project_dir):
                 return []
     return []
 
-def main():
+def build_summary_prompt(project, repos_dir=None):
+    """Per-project unit of work for the worker pool: walk the project and build its summary prompt."""
+    print(f"\nAnalyzing project: {project}")
+    structure = extract_project_structure(project, repos_dir)
+    dependencies = extract_dependencies(project)
+    # Sample the first N files and dependencies
+    structure_sample = structure[:SAMPLE_SIZE]
+    dependencies_sample = dependencies[:SAMPLE_SIZE]
+    print(f"  Sampled {len(structure_sample)} files and {len(dependencies_sample)} dependencies.")
+    # Escape curly braces for safe formatting
+    structure_sample_esc = escape_curly_braces(structure_sample)
+    dependencies_sample_esc = escape_curly_braces(dependencies_sample)
+    prompt = (
+        "You are a senior Java architect. Here is a sample of the project structure and dependencies for a microservice. "
+        "Summarize the key characteristics, potential risks, and any notable patterns. "
+        "Suggest any improvements or refactoring opportunities.\n\n"
+        "Sampled Java files (relative paths):\n{structure}\n\n"
+        "Sampled dependencies (name, version, source):\n{dependencies}\n"
+    )
+    return prompt.format(
+        structure=json.dumps(structure_sample_esc, indent=2),
+        dependencies=json.dumps(dependencies_sample_esc, indent=2)
+    )
+
+def main(jobs=1):
     base_dir = "repos"  # Fixed path for your repo structure
-    projects = find_java_projects(base_dir)
+    projects = sorted(find_java_projects(base_dir))
     print(f"Discovered {len(projects)} Java projects:")
     for p in projects:
         print(f"  - {p}")
     print()
     llm = ChatOpenAI(model="gpt-4", temperature=0)
-    for project in projects:
-        print(f"\nAnalyzing project: {project}")
-        structure = extract_project_structure(project)
-        dependencies = extract_dependencies(project)
-        # Sample the first N files and dependencies
-        structure_sample = structure[:SAMPLE_SIZE]
-        dependencies_sample = dependencies[:SAMPLE_SIZE]
-        print(f"  Sampled {len(structure_sample)} files and {len(dependencies_sample)} dependencies.")
-        # Escape curly braces for safe formatting
-        structure_sample_esc = escape_curly_braces(structure_sample)
-        dependencies_sample_esc = escape_curly_braces(dependencies_sample)
-        prompt = (
-            "You are a senior Java architect. Here is a sample of the project structure and dependencies for a microservice. "
-            "Summarize the key characteristics, potential risks, and any notable patterns. "
-            "Suggest any improvements or refactoring opportunities.\n\n"
-            "Sampled Java files (relative paths):\n{structure}\n\n"
-            "Sampled dependencies (name, version, source):\n{dependencies}\n"
-        )
-        prompt_filled = prompt.format(
-            structure=json.dumps(structure_sample_esc, indent=2),
-            dependencies=json.dumps(dependencies_sample_esc, indent=2)
-        )
-        print("  Sending prompt to LLM...")
-        try:
-            summary = llm.invoke(prompt_filled)
-            print("\n--- LLM Summary ---")
-            print(summary)
-            print("-------------------\n")
-        except Exception as e:
-            print(f"  LLM analysis failed: {e}")
+    dispatcher = LLMDispatcher.from_env()
+    # Project scans run jobs at a time; the LLM calls share one dispatcher so rate limits stay global
+    outcomes = run_per_repo(build_summary_prompt, projects, jobs=jobs, label="scan", args=(base_dir,))
+    for outcome in outcomes:
+        if not outcome.ok:
+            print(f"  Skipping {outcome.repo}: {outcome.error}")
+    scanned = [outcome for outcome in outcomes if outcome.ok]
+    prompts = [outcome.result for outcome in scanned]
+    print(f"Sending {len(prompts)} prompts to LLM...")
+    summaries = dispatcher.map(llm, prompts, return_exceptions=True)
+    for outcome, summary in zip(scanned, summaries):
+        project = outcome.repo
+        if isinstance(summary, Exception):
+            print(f"  LLM analysis failed for {project}: {summary}")
+            continue
+        print(f"\n--- LLM Summary: {project} ---")
+        print(summary)
+        print("-------------------\n")
+    print(dispatcher.report())
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    import sys
+    main(jobs=parse_jobs(sys.argv[1:]))
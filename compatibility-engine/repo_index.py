@@ -0,0 +1,379 @@
+import os
+import json
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from pipeline_trace import get_tracer
+
+# Single-pass index of a repository tree, shared by every stage that used to walk it on its own
+# (build file discovery, Java/resource discovery, extracted_dependencies.json / analysis_result.json
+# lookup, manifest hashing). The tree is listed once with os.scandir and every interesting file
+# is recorded with its size, mtime and kind; contents are read lazily and kept in a bounded cache.
+#
+# The index is saved as <repo>/.repo_index.json, so other processes (pool workers, the iMCE
+# orchestrator, compatibility-engine subprocesses) reuse it. On load it is revalidated with a
+# stat per directory and file; only directories whose mtime changed are listed again.
+
+INDEX_FILENAME = ".repo_index.json"
+INDEX_VERSION = 1
+# Build output is not indexed, so no stage sees it (iMCE's merge used to copy it along)
+SKIP_DIRS = {"build", "target", "node_modules", "out", "bin"}
+BUILD_FILES = {"pom.xml", "build.gradle", "build.gradle.kts", "settings.gradle", "settings.gradle.kts"}
+RESOURCE_EXTENSIONS = (".properties", ".yml", ".yaml", ".xml", ".json", ".sql")
+# Files written into the repos by earlier pipeline stages
+OUTPUT_FILES = {"analysis_result.json", "extracted_dependencies.json"}
+CONTENT_CACHE_BYTES = 64 * 1024 * 1024
+
+KIND_JAVA = "java"
+KIND_BUILD = "build"
+KIND_OUTPUT = "output"
+KIND_RESOURCE = "resource"
+
+
+def file_kind(name: str) -> Optional[str]:
+    """Kind of a file by name, or None for files no stage looks at (they are not indexed)."""
+    if name.endswith(".java"):
+        return KIND_JAVA
+    if name in BUILD_FILES:
+        return KIND_BUILD
+    if name in OUTPUT_FILES:
+        return KIND_OUTPUT
+    if name.endswith(RESOURCE_EXTENSIONS) and name != INDEX_FILENAME:
+        return KIND_RESOURCE
+    return None
+
+
+def skip_dir(name: str, rel_parent: str = "") -> bool:
+    """Hidden and build-output directories; a package named build/out/bin under src/ is kept."""
+    if name.startswith("."):
+        return True
+    return name in SKIP_DIRS and "src" not in rel_parent.split(os.sep)
+
+
+class IndexedFile(NamedTuple):
+    path: str
+    rel: str
+    size: int
+    mtime_ns: int
+    kind: str
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.rel)
+
+
+class RepoIndex:
+    def __init__(self, root: str):
+        self.root = os.path.abspath(root)
+        self.path = os.path.join(self.root, INDEX_FILENAME)
+        # rel path -> IndexedFile; rel dir -> mtime_ns ("" is the root)
+        self._files: Dict[str, IndexedFile] = {}
+        self._dirs: Dict[str, int] = {}
+        self._content: "OrderedDict[str, str]" = OrderedDict()
+        self._content_bytes = 0
+        self.dirs_listed = 0
+        self.stats = 0
+        self.reads = 0
+        self.content_hits = 0
+        self.loaded = False
+        self.dirty = False
+
+    # Building
+
+    def _scan_dir(self, rel_dir: str):
+        """List one directory (recursing into subdirectories not yet indexed) and replace its entries."""
+        abs_dir = os.path.join(self.root, rel_dir) if rel_dir else self.root
+        known = rel_dir in self._dirs
+        try:
+            self._dirs[rel_dir] = os.stat(abs_dir).st_mtime_ns
+            with os.scandir(abs_dir) as it:
+                entries = list(it)
+        except OSError:
+            self._drop_dir(rel_dir)
+            return
+        self.dirs_listed += 1
+        self.dirty = True
+        if known:
+            for rel in [rel for rel in self._files if os.path.dirname(rel) == rel_dir]:
+                del self._files[rel]
+        subdirs = set()
+        for entry in entries:
+            rel = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+            if entry.is_dir(follow_symlinks=False):
+                if not skip_dir(entry.name, rel_dir):
+                    subdirs.add(rel)
+            elif entry.is_file(follow_symlinks=False):
+                kind = file_kind(entry.name)
+                if kind is not None:
+                    st = entry.stat(follow_symlinks=False)
+                    self.stats += 1
+                    self._files[rel] = IndexedFile(entry.path, rel, st.st_size, st.st_mtime_ns, kind)
+        if known:
+            for rel in [rel for rel in self._dirs if rel and os.path.dirname(rel) == rel_dir and rel not in subdirs]:
+                self._drop_dir(rel)
+        for rel in sorted(subdirs):
+            if rel not in self._dirs:
+                self._scan_dir(rel)
+
+    def _drop_dir(self, rel_dir: str):
+        prefix = rel_dir + os.sep if rel_dir else ""
+        for rel in [rel for rel in self._dirs if rel == rel_dir or rel.startswith(prefix)]:
+            del self._dirs[rel]
+        for rel in [rel for rel in self._files if rel.startswith(prefix)]:
+            del self._files[rel]
+        self.dirty = True
+
+    def scan(self):
+        """Index the whole tree from scratch."""
+        with get_tracer().span("repo_index.scan", root=self.root) as span:
+            self._files, self._dirs = {}, {}
+            self._scan_dir("")
+            span.set(files=len(self._files), dirs=len(self._dirs))
+
+    def refresh(self):
+        """Bring the index up to date: relist changed directories, re-stat files in unchanged ones."""
+        if not self._dirs:
+            self.scan()
+            return
+        with get_tracer().span("repo_index.refresh", root=self.root) as span:
+            relisted = self._revalidate()
+            span.set(files=len(self._files), relisted=len(relisted))
+
+    def _revalidate(self) -> set:
+        """Relist directories whose mtime changed and re-stat files elsewhere; returns the relisted ones."""
+        relisted = set()
+        for rel_dir, mtime_ns in sorted(self._dirs.items()):
+            if rel_dir not in self._dirs:
+                continue  # dropped with a removed parent
+            abs_dir = os.path.join(self.root, rel_dir) if rel_dir else self.root
+            try:
+                current = os.stat(abs_dir).st_mtime_ns
+            except OSError:
+                self._drop_dir(rel_dir)
+                continue
+            self.stats += 1
+            if current != mtime_ns:
+                self._scan_dir(rel_dir)
+                relisted.add(rel_dir)
+        for rel, entry in list(self._files.items()):
+            if os.path.dirname(rel) in relisted:
+                continue
+            try:
+                st = os.stat(entry.path, follow_symlinks=False)
+            except OSError:
+                del self._files[rel]
+                self.dirty = True
+                continue
+            self.stats += 1
+            if (st.st_size, st.st_mtime_ns) != (entry.size, entry.mtime_ns):
+                self._files[rel] = entry._replace(size=st.st_size, mtime_ns=st.st_mtime_ns)
+                self._forget(entry.path)
+                self.dirty = True
+        return relisted
+
+    def add(self, path: str):
+        """Record a file a stage has just written (or rewritten) inside the tree."""
+        path = os.path.abspath(path)
+        rel = os.path.relpath(path, self.root)
+        kind = file_kind(os.path.basename(path))
+        self._forget(path)
+        if kind is None or rel.startswith(os.pardir):
+            return
+        st = os.stat(path)
+        self._files[rel] = IndexedFile(path, rel, st.st_size, st.st_mtime_ns, kind)
+        # The directory changed too; keep its recorded mtime current so the next load does not relist it
+        rel_dir = os.path.dirname(rel)
+        if rel_dir in self._dirs:
+            self._dirs[rel_dir] = os.stat(os.path.dirname(path)).st_mtime_ns
+        self.dirty = True
+
+    # Persistence
+
+    def load(self) -> bool:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if data.get("version") != INDEX_VERSION:
+            return False
+        self._dirs = {rel: mtime_ns for rel, mtime_ns in data.get("dirs", {}).items()}
+        self._files = {
+            rel: IndexedFile(os.path.join(self.root, rel), rel, size, mtime_ns, kind)
+            for rel, (size, mtime_ns, kind) in data.get("files", {}).items()
+        }
+        self.loaded = True
+        return True
+
+    def save(self):
+        if not self.dirty:
+            return
+        data = {
+            "version": INDEX_VERSION,
+            "dirs": self._dirs,
+            "files": {rel: [f.size, f.mtime_ns, f.kind] for rel, f in self._files.items()},
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            # A read-only checkout still works, it just gets rescanned next time
+            print(f"[WARN] Could not save repo index {self.path}: {e}")
+
+    # Queries
+
+    def files(self, kind: Optional[str] = None, names: Optional[Iterable[str]] = None,
+              under: Optional[str] = None) -> List[IndexedFile]:
+        """Indexed files in path order, optionally filtered by kind, file name and subdirectory."""
+        names = set(names) if names is not None else None
+        prefix = None
+        if under is not None:
+            rel_under = os.path.relpath(os.path.abspath(under), self.root)
+            prefix = "" if rel_under == os.curdir else rel_under + os.sep
+        result = []
+        for rel in sorted(self._files):
+            entry = self._files[rel]
+            if kind is not None and entry.kind != kind:
+                continue
+            if names is not None and entry.name not in names:
+                continue
+            if prefix and not rel.startswith(prefix):
+                continue
+            result.append(entry)
+        return result
+
+    def paths(self, **query) -> List[str]:
+        return [entry.path for entry in self.files(**query)]
+
+    def read(self, path: str) -> str:
+        """Text of an indexed file (UTF-8), read on first use and cached up to CONTENT_CACHE_BYTES."""
+        path = os.path.abspath(path)
+        if path in self._content:
+            self.content_hits += 1
+            self._content.move_to_end(path)
+            return self._content[path]
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read()
+        self.reads += 1
+        self._content[path] = text
+        self._content_bytes += len(text)
+        while self._content_bytes > CONTENT_CACHE_BYTES and len(self._content) > 1:
+            _, evicted = self._content.popitem(last=False)
+            self._content_bytes -= len(evicted)
+        return text
+
+    def _forget(self, path: str):
+        text = self._content.pop(path, None)
+        if text is not None:
+            self._content_bytes -= len(text)
+
+    def report(self) -> str:
+        source = "reused saved index" if self.loaded else "fresh scan"
+        return (f"Repo index {self.root}: {len(self._files)} files in {len(self._dirs)} dirs ({source}; "
+                f"{self.dirs_listed} dirs listed, {self.stats} stats, {self.reads} reads, {self.content_hits} cache hits)")
+
+
+_indexes: Dict[str, RepoIndex] = {}
+_indexes_pid = None
+
+
+def repo_root(path: str, repos_dir: str) -> str:
+    """The repository directly under repos_dir that contains path."""
+    repos_dir = os.path.abspath(repos_dir)
+    rel = os.path.relpath(os.path.abspath(path), repos_dir)
+    first = rel.split(os.sep)[0]
+    if first in (os.curdir, os.pardir):
+        raise ValueError(f"{path} is not inside a repository under {repos_dir}")
+    return os.path.join(repos_dir, first)
+
+
+def _open_index(path: str) -> Optional[RepoIndex]:
+    """The index already open in this process whose tree contains path, if any."""
+    global _indexes, _indexes_pid
+    if _indexes_pid != os.getpid():
+        # A forked worker must not share (and later save) the parent's in-memory copies
+        _indexes, _indexes_pid = {}, os.getpid()
+    for root, index in _indexes.items():
+        if path == root or path.startswith(root + os.sep):
+            return index
+    return None
+
+
+def get_index(path: str, repos_dir: Optional[str] = None) -> RepoIndex:
+    """
+    The index of the repository containing path: one already open in this process, else the
+    repository's saved index (revalidated), else a fresh scan. With repos_dir, the repository
+    is the directory directly under it that contains path (a file or a subdirectory); without,
+    path must be the repository itself. Saved indexes are never looked up above the repository,
+    so a stray .repo_index.json in a parent directory is ignored. Indexes are saved as soon as
+    they are built so the next process starts from them.
+    """
+    path = os.path.abspath(path)
+    index = _open_index(path)
+    if index is not None:
+        return index
+    if repos_dir is not None:
+        root = repo_root(path, repos_dir)
+    elif os.path.isdir(path):
+        root = path
+    else:
+        raise ValueError(f"{path} is not in an open repo index; pass repos_dir to resolve it through its repository")
+    index = RepoIndex(root)
+    if index.load():
+        index.refresh()
+    else:
+        index.scan()
+    index.save()
+    _indexes[root] = index
+    return index
+
+
+def read_text(path: str) -> str:
+    """Text of a file, through the open index of its repository (and its content cache) when there is one."""
+    index = _open_index(os.path.abspath(path))
+    if index is not None:
+        return index.read(path)
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def refresh_index(path: str) -> RepoIndex:
+    """Revalidate the index covering path after a stage changed files it did not record."""
+    index = get_index(path)
+    index.refresh()
+    index.save()
+    return index
+
+
+def repo_dirs(repos_dir: str) -> List[str]:
+    """Repositories directly under repos_dir, sorted."""
+    with os.scandir(repos_dir) as it:
+        return sorted(entry.path for entry in it if entry.is_dir() and not entry.name.startswith("."))
+
+
+def is_repo_root(path: str) -> bool:
+    """A repository rather than a directory of repositories: it has a saved index, a build file or src/."""
+    if os.path.isfile(os.path.join(path, INDEX_FILENAME)) or os.path.isdir(os.path.join(path, "src")):
+        return True
+    return any(os.path.isfile(os.path.join(path, name)) for name in BUILD_FILES)
+
+
+def indexed_files(path: str, kind: Optional[str] = None, names: Optional[Iterable[str]] = None) -> List[IndexedFile]:
+    """
+    Files of a kind anywhere under path. path may be a repository (or a directory inside one
+    open in this process) or a directory of repositories, in which case each repository is
+    indexed on its own. A directory without subdirectories is taken as a repository.
+    """
+    path = os.path.abspath(path)
+    if _open_index(path) is not None or is_repo_root(path):
+        return get_index(path).files(kind=kind, names=names, under=path)
+    repos = repo_dirs(path)
+    if not repos:
+        return get_index(path).files(kind=kind, names=names, under=path)
+    files = []
+    for repo in repos:
+        files.extend(get_index(repo).files(kind=kind, names=names, under=repo))
+    return files
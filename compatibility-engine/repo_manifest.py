@@ -0,0 +1,130 @@
+import os
+import json
+import time
+import hashlib
+from typing import Dict, List, Optional, Tuple
+
+from repo_index import BUILD_FILES, RESOURCE_EXTENSIONS, get_index, refresh_index
+
+# Manifest of per-repo source tree hashes. Each repo gets a Merkle-style hash over its
+# .java, build and resource files; every pipeline stage records the hash it last ran
+# against, so a stage only reruns for repos whose inputs actually changed. The file list,
+# sizes and mtimes come from the shared repo index, so hashing does not walk the tree again.
+
+MANIFEST_FILENAME = ".consolidation_manifest.json"
+MANIFEST_VERSION = 1
+# Which hash a stage depends on: the whole tracked tree, or only the build files
+STAGE_INPUTS = {
+    "analysis": "tree",
+    "dependencies": "build",
+}
+
+
+def is_tracked(rel_path: str, name: str) -> bool:
+    if name.endswith(".java") or name in BUILD_FILES:
+        return True
+    return name.endswith(RESOURCE_EXTENSIONS) and "resources" in rel_path.split(os.sep)
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class RepoManifest:
+    def __init__(self, path: str):
+        self.path = path
+        self.data = {"version": MANIFEST_VERSION, "repos": {}}
+        if os.path.exists(path):
+            try:
+                with open(path) as f:
+                    loaded = json.load(f)
+                if loaded.get("version") == MANIFEST_VERSION:
+                    self.data = loaded
+            except (OSError, ValueError) as e:
+                print(f"[WARN] Ignoring unreadable manifest {path}: {e}")
+        self._current: Dict[str, Dict[str, str]] = {}
+
+    @classmethod
+    def for_repos_dir(cls, repos_dir: str) -> "RepoManifest":
+        return cls(os.path.join(repos_dir, MANIFEST_FILENAME))
+
+    def _entry(self, repo_dir: str) -> Dict:
+        return self.data["repos"].setdefault(os.path.basename(os.path.abspath(repo_dir)), {"files": {}, "stages": {}})
+
+    def _tree_hash(self, rel_dir: str, children: Dict[str, List[Tuple[str, str, Optional[str]]]]) -> Optional[str]:
+        lines = []
+        for kind, name, value in sorted(children.get(rel_dir, []), key=lambda child: child[1]):
+            if kind == "d":
+                value = self._tree_hash(os.path.join(rel_dir, name) if rel_dir else name, children)
+                if value is None:
+                    continue
+            lines.append(f"{kind} {name} {value}")
+        if not lines:
+            return None
+        return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+
+    def hashes(self, repo_dir: str) -> Dict[str, str]:
+        """Current {'tree': ..., 'build': ...} hashes of a repo, computed once per manifest instance."""
+        key = os.path.abspath(repo_dir)
+        if key not in self._current:
+            entry = self._entry(repo_dir)
+            old_files = entry.get("files", {})
+            new_files = {}
+            # Merkle layout: each directory hashes the sorted "f name sha" / "d name hash" lines of its children
+            children: Dict[str, List[Tuple[str, str, Optional[str]]]] = {}
+            dirs = set()
+            for indexed in get_index(key).files(under=key):
+                rel = os.path.relpath(indexed.path, key)
+                if not is_tracked(rel, indexed.name):
+                    continue
+                cached = old_files.get(rel)
+                # Unchanged size and mtime: reuse the recorded content hash instead of re-reading
+                if cached and cached[0] == indexed.size and cached[1] == indexed.mtime_ns:
+                    sha = cached[2]
+                else:
+                    sha = file_sha256(indexed.path)
+                new_files[rel] = [indexed.size, indexed.mtime_ns, sha]
+                children.setdefault(os.path.dirname(rel), []).append(("f", indexed.name, sha))
+                parent = os.path.dirname(rel)
+                while parent and parent not in dirs:
+                    dirs.add(parent)
+                    children.setdefault(os.path.dirname(parent), []).append(("d", os.path.basename(parent), None))
+                    parent = os.path.dirname(parent)
+            tree = self._tree_hash("", children) or ""
+            build = hashlib.sha256("\n".join(
+                f"{rel} {meta[2]}" for rel, meta in sorted(new_files.items()) if os.path.basename(rel) in BUILD_FILES
+            ).encode("utf-8")).hexdigest()
+            entry["files"] = new_files
+            self._current[key] = {"tree": tree, "build": build}
+        return self._current[key]
+
+    def stage_hash(self, repo_dir: str, stage: str) -> str:
+        return self.hashes(repo_dir)[STAGE_INPUTS[stage]]
+
+    def is_current(self, repo_dir: str, stage: str) -> bool:
+        recorded = self._entry(repo_dir)["stages"].get(stage)
+        return recorded is not None and recorded.get("hash") == self.stage_hash(repo_dir, stage)
+
+    def record(self, repo_dir: str, stage: str, rehash: bool = False):
+        """Mark a stage as done for the repo's current inputs; rehash for stages that modify the tree."""
+        if rehash:
+            self._current.pop(os.path.abspath(repo_dir), None)
+            refresh_index(repo_dir)
+        self._entry(repo_dir)["stages"][stage] = {"hash": self.stage_hash(repo_dir, stage), "at": time.time()}
+
+    def partition(self, repos: List[str], stage: str) -> Tuple[List[str], List[str]]:
+        """Split repos into (changed, unchanged) for a stage."""
+        changed, unchanged = [], []
+        for repo in repos:
+            (unchanged if self.is_current(repo, stage) else changed).append(repo)
+        return changed, unchanged
+
+    def save(self):
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.data, f)
+        os.replace(tmp_path, self.path)
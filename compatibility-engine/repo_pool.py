@@ -0,0 +1,101 @@
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, List, Optional, Sequence
+
+# Per-repo worker pool. Each repository is an independent unit of work (static analysis,
+# dependency extraction, summary), so with --jobs N they run in N worker processes.
+# A failing repo is reported and skipped; results always come back in input order.
+
+
+class RepoOutcome:
+    def __init__(self, repo: str, result: Any = None, error: Optional[str] = None, seconds: float = 0.0):
+        self.repo = repo
+        self.result = result
+        self.error = error
+        self.seconds = seconds
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _run_one(func: Callable, repo: str, item: Any, args: tuple) -> RepoOutcome:
+    start = time.monotonic()
+    try:
+        result = func(item, *args)
+    except Exception as e:
+        # Exceptions may not pickle back from the worker, so carry them as text
+        traceback.print_exc()
+        return RepoOutcome(repo, error=f"{type(e).__name__}: {e}", seconds=time.monotonic() - start)
+    return RepoOutcome(repo, result=result, seconds=time.monotonic() - start)
+
+
+class PoolProgress:
+    """Prints one line per finished repo: count, status, duration and elapsed time."""
+
+    def __init__(self, total: int, label: str = ""):
+        self.total = total
+        self.label = f"{label} " if label else ""
+        self.done = 0
+        self.failed = 0
+        self.start = time.monotonic()
+
+    def update(self, outcome: RepoOutcome):
+        self.done += 1
+        name = os.path.basename(outcome.repo.rstrip(os.sep))
+        if outcome.ok:
+            status = f"done in {outcome.seconds:.1f}s"
+        else:
+            self.failed += 1
+            status = f"FAILED after {outcome.seconds:.1f}s: {outcome.error}"
+        print(f"[{self.done}/{self.total}] {self.label}{name} {status} "
+              f"(elapsed {time.monotonic() - self.start:.1f}s)", flush=True)
+
+    def summary(self) -> str:
+        return (f"{self.label}{self.done - self.failed}/{self.total} repos succeeded, {self.failed} failed "
+                f"in {time.monotonic() - self.start:.1f}s")
+
+
+def run_per_repo(func: Callable, repos: Sequence[str], jobs: int = 1, label: str = "",
+                 args: tuple = (), items: Optional[Sequence] = None) -> List[RepoOutcome]:
+    """
+    Run func(repo, *args) for every repo and return RepoOutcome objects in the order of repos.
+    With items, func gets items[i] in place of repos[i] (outcomes are still labeled by repo).
+    jobs > 1 uses a process pool, so func and its arguments must be picklable (module-level).
+    """
+    repos = list(repos)
+    items = repos if items is None else list(items)
+    outcomes: List[Optional[RepoOutcome]] = [None] * len(repos)
+    if not repos:
+        return []
+    progress = PoolProgress(len(repos), label)
+    if jobs <= 1 or len(repos) == 1:
+        for i, repo in enumerate(repos):
+            outcomes[i] = _run_one(func, repo, items[i], args)
+            progress.update(outcomes[i])
+    else:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(repos))) as pool:
+            futures = {pool.submit(_run_one, func, repo, items[i], args): i for i, repo in enumerate(repos)}
+            for future in as_completed(futures):
+                i = futures[future]
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    # The worker process itself died (or the result could not be sent back)
+                    outcome = RepoOutcome(repos[i], error=f"{type(e).__name__}: {e}")
+                outcomes[i] = outcome
+                progress.update(outcome)
+    print(progress.summary(), flush=True)
+    return outcomes
+
+
+def parse_jobs(argv: Sequence[str], default: int = 1) -> int:
+    """Read '--jobs N' / '--jobs=N' from an argv list for the plain-script entry points."""
+    for i, arg in enumerate(argv):
+        if arg == "--jobs" and i + 1 < len(argv):
+            return max(1, int(argv[i + 1]))
+        if arg.startswith("--jobs="):
+            return max(1, int(arg.split("=", 1)[1]))
+    return default
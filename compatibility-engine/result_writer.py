@@ -0,0 +1,112 @@
+import os
+import csv
+import json
+from typing import Callable, Dict, Iterator, List, Optional
+
+# Append-only JSON Lines writer for conflict verdicts. Every record is flushed as soon as
+# it is written, so a crash loses at most the record in flight; --resume picks up from
+# the records already on disk. The classic .json array is derived from the JSONL at the end.
+
+
+def jsonl_path_for(output_path: str) -> str:
+    """api_conflict_results.json -> api_conflict_results.jsonl"""
+    root, ext = os.path.splitext(output_path)
+    return (root if ext == ".json" else output_path) + ".jsonl"
+
+
+def iter_jsonl(path: str) -> Iterator[Dict]:
+    """Lazily read records from a JSONL file, ignoring a truncated trailing line."""
+    if not os.path.exists(path):
+        return
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.endswith("\n"):
+                break
+            yield json.loads(line)
+
+
+def jsonl_to_json(jsonl_path: str, json_path: str):
+    """Stream a JSONL file into an indented JSON array (same layout as json.dump(indent=2))."""
+    with open(json_path, "w", encoding="utf-8") as out:
+        out.write("[")
+        first = True
+        for record in iter_jsonl(jsonl_path):
+            out.write("\n" if first else ",\n")
+            out.write("\n".join("  " + line for line in json.dumps(record, indent=2).splitlines()))
+            first = False
+        out.write("\n]" if not first else "]")
+
+
+class StreamingResultWriter:
+    """
+    Writes one JSON object per line to jsonl_path and, optionally, one row per record to a CSV.
+    With resume=True existing records are kept and their keys exposed through is_done().
+    """
+
+    def __init__(self, jsonl_path: str, key: Callable[[Dict], str], resume: bool = False,
+                 csv_path: Optional[str] = None, csv_fieldnames: Optional[List[str]] = None,
+                 csv_row: Optional[Callable[[Dict], Dict]] = None):
+        self.jsonl_path = jsonl_path
+        self.key = key
+        self.csv_path = csv_path
+        self.csv_row = csv_row
+        self.completed = set()
+        self.written = 0
+        self.skipped = 0
+        if resume:
+            self._recover()
+        elif os.path.exists(jsonl_path):
+            os.remove(jsonl_path)
+        self._file = open(jsonl_path, "a", encoding="utf-8")
+        self._csv_file = None
+        self._csv_writer = None
+        if csv_path:
+            self._csv_file = open(csv_path, "w", newline="", encoding="utf-8")
+            self._csv_writer = csv.DictWriter(self._csv_file, fieldnames=csv_fieldnames)
+            self._csv_writer.writeheader()
+            # Rebuild the CSV from the recovered records so it always mirrors the JSONL
+            for record in iter_jsonl(jsonl_path):
+                self._csv_writer.writerow(csv_row(record))
+            self._csv_file.flush()
+
+    def _recover(self):
+        """Load keys of completed records and drop a partially written trailing line."""
+        if not os.path.exists(self.jsonl_path):
+            return
+        good_bytes = 0
+        with open(self.jsonl_path, "rb") as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break
+                try:
+                    self.completed.add(self.key(json.loads(raw)))
+                except ValueError:
+                    break
+                good_bytes += len(raw)
+        with open(self.jsonl_path, "r+b") as f:
+            f.truncate(good_bytes)
+
+    def is_done(self, record_key: str) -> bool:
+        if record_key in self.completed:
+            self.skipped += 1
+            return True
+        return False
+
+    def write(self, record: Dict):
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        if self._csv_writer is not None:
+            self._csv_writer.writerow(self.csv_row(record))
+            self._csv_file.flush()
+        self.written += 1
+
+    def close(self):
+        self._file.close()
+        if self._csv_file is not None:
+            self._csv_file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
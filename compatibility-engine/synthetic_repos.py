@@ -0,0 +1,323 @@
+import os
+import json
+import random
+import shutil
+import argparse
+from typing import Dict, List
+
+from endpoint_matcher import normalize_path
+
+# Generator of Spring Boot repositories for benchmarks. Every repo is a Gradle project with
+# REST controllers (plus a service and a model class per controller), build.gradle
+# dependencies and application.properties / application.yml keys. Services draw resources,
+# dependency versions and config values from shared pools, so the usual conflicts appear:
+# overlapping routes, different versions of one library and keys set to different values.
+#
+# The output is deterministic for a seed. synthetic_manifest.json next to the repos records
+# the endpoints and dependencies that were generated, in analysis_result.json's field layout.
+#
+#   python synthetic_repos.py /tmp/synthetic --repos 8 --controllers 4 --endpoints 6
+
+MANIFEST_FILENAME = "synthetic_manifest.json"
+
+RESOURCES = [
+    "user", "order", "product", "invoice", "payment", "customer", "account", "shipment", "cart",
+    "review", "inventory", "catalog", "address", "notification", "report", "ticket", "coupon",
+    "subscription", "warehouse", "supplier", "refund", "promotion", "category", "session",
+]
+SUB_RESOURCES = ["history", "items", "notes", "attachments", "events", "status"]
+GET_VERBS = ["get", "fetch", "find", "load"]
+CREATE_VERBS = ["create", "add", "register", "save"]
+
+# (httpMethod, path template, handler name); {R} is the resource's class name and {Rs} its
+# plural. /{id} next to /search gives overlapping routes that only the LLM can judge
+ENDPOINT_TEMPLATES = [
+    ("GET", "", "list{Rs}"),
+    ("GET", "/{{id}}", "{get}{R}"),
+    ("GET", "/search", "search{Rs}"),
+    ("POST", "", "{create}{R}"),
+    ("PUT", "/{{id}}", "update{R}"),
+    ("DELETE", "/{{id}}", "delete{R}"),
+    ("GET", "/{{id}}/{sub}", "{get}{R}{Sub}"),
+    ("PATCH", "/{{id}}/status", "change{R}Status"),
+    ("GET", "/count", "count{Rs}"),
+    ("POST", "/{{id}}/{sub}", "add{R}{Sub}"),
+]
+MAPPING_ANNOTATIONS = {"GET": "GetMapping", "POST": "PostMapping", "PUT": "PutMapping",
+                       "DELETE": "DeleteMapping", "PATCH": "PatchMapping"}
+
+# (group:artifact, candidate versions); services pick one version each
+DEPENDENCY_POOL = [
+    ("com.fasterxml.jackson.core:jackson-databind", ["2.15.2", "2.16.1", "2.17.0"]),
+    ("org.apache.commons:commons-lang3", ["3.12.0", "3.13.0", "3.14.0"]),
+    ("com.google.guava:guava", ["31.1-jre", "32.1.3-jre", "33.0.0-jre"]),
+    ("org.projectlombok:lombok", ["1.18.28", "1.18.30"]),
+    ("io.micrometer:micrometer-registry-prometheus", ["1.11.5", "1.12.2"]),
+    ("org.mapstruct:mapstruct", ["1.5.3.Final", "1.5.5.Final"]),
+    ("commons-io:commons-io", ["2.11.0", "2.15.1"]),
+    ("org.postgresql:postgresql", ["42.6.0", "42.7.1"]),
+    ("io.jsonwebtoken:jjwt-api", ["0.11.5", "0.12.3"]),
+    ("org.springdoc:springdoc-openapi-starter-webmvc-ui", ["2.2.0", "2.3.0"]),
+]
+BOOT_VERSIONS = ["3.1.5", "3.2.2", "3.3.0", "3.4.0"]
+
+CONFIG_POOL = [
+    ("server.port", ["8080", "8081", "8082", "9000"]),
+    ("spring.datasource.url", ["jdbc:postgresql://db:5432/app", "jdbc:postgresql://db:5432/{service}"]),
+    ("spring.datasource.username", ["app", "{service}"]),
+    ("spring.jpa.hibernate.ddl-auto", ["validate", "update", "none"]),
+    ("logging.level.root", ["INFO", "WARN", "DEBUG"]),
+    ("management.endpoints.web.exposure.include", ["health,info", "health,info,prometheus", "*"]),
+    ("spring.jackson.default-property-inclusion", ["non_null", "always"]),
+    ("server.servlet.context-path", ["/", "/{service}"]),
+]
+
+
+def endpoint_templates(count: int) -> List:
+    """count templates; past the built-in ones, extra GET sub-routes are made up."""
+    extra = [("GET", f"/{{{{id}}}}/extra{i}", f"{{get}}{{R}}Extra{i}") for i in range(len(ENDPOINT_TEMPLATES), count)]
+    return ENDPOINT_TEMPLATES[:count] + extra
+
+
+def _cap(word: str) -> str:
+    return word[:1].upper() + word[1:]
+
+
+def _plural(word: str) -> str:
+    if word.endswith(("s", "x", "z", "ch", "sh")):
+        return word + "es"
+    if word.endswith("y") and word[-2:-1] not in "aeiou":
+        return word[:-1] + "ies"
+    return word + "s"
+
+
+def service_name(index: int) -> str:
+    return f"svc-{index:03d}"
+
+
+def _pool(pool: List, count: int, make) -> List:
+    """The first count entries of pool, extended with generated ones when count is larger."""
+    return list(pool[:count]) + [make(i) for i in range(len(pool), count)]
+
+
+def _controller_source(package: str, resource: str, base_path: str, endpoints: List[Dict]) -> str:
+    name = _cap(resource)
+    lines = [
+        f"package {package}.controller;",
+        "",
+        "import org.springframework.web.bind.annotation.*;",
+        f"import {package}.model.{name};",
+        f"import {package}.service.{name}Service;",
+        "",
+        "import java.util.List;",
+        "",
+        "@RestController",
+        f'@RequestMapping("{base_path}")',
+        f"public class {name}Controller {{",
+        f"    private final {name}Service service;",
+        "",
+        f"    public {name}Controller({name}Service service) {{",
+        "        this.service = service;",
+        "    }",
+    ]
+    for ep in endpoints:
+        annotation = MAPPING_ANNOTATIONS[ep["httpMethod"]]
+        mapping = f'@{annotation}("{ep["path"]}")' if ep["path"] else f"@{annotation}"
+        params = "@PathVariable(\"id\") Long id" if "{id}" in ep["path"] else ""
+        if ep["httpMethod"] in ("POST", "PUT", "PATCH"):
+            params = ", ".join(p for p in (params, f"@RequestBody {name} body") if p)
+        returns = f"List<{name}>" if ep["methodName"].startswith(("list", "search")) else name
+        lines += [
+            "",
+            f"    {mapping}",
+            f"    public {returns} {ep['methodName']}({params}) {{",
+            f"        return service.{'findAll' if returns.startswith('List') else 'handle'}();",
+            "    }",
+        ]
+    lines.append("}")
+    return "\n".join(lines) + "\n"
+
+
+def _service_source(package: str, resource: str) -> str:
+    name = _cap(resource)
+    return (f"package {package}.service;\n\n"
+            f"import org.springframework.stereotype.Service;\n"
+            f"import {package}.model.{name};\n\n"
+            f"import java.util.List;\n\n"
+            f"@Service\n"
+            f"public class {name}Service {{\n"
+            f"    public List<{name}> findAll() {{\n        return List.of();\n    }}\n\n"
+            f"    public {name} handle() {{\n        return new {name}();\n    }}\n"
+            f"}}\n")
+
+
+def _model_source(package: str, resource: str) -> str:
+    name = _cap(resource)
+    return (f"package {package}.model;\n\n"
+            f"public class {name} {{\n"
+            f"    private Long id;\n    private String name;\n\n"
+            f"    public Long getId() {{\n        return id;\n    }}\n\n"
+            f"    public void setId(Long id) {{\n        this.id = id;\n    }}\n\n"
+            f"    public String getName() {{\n        return name;\n    }}\n\n"
+            f"    public void setName(String name) {{\n        this.name = name;\n    }}\n"
+            f"}}\n")
+
+
+def _application_source(package: str, class_name: str) -> str:
+    return (f"package {package};\n\n"
+            f"import org.springframework.boot.SpringApplication;\n"
+            f"import org.springframework.boot.autoconfigure.SpringBootApplication;\n\n"
+            f"@SpringBootApplication\n"
+            f"public class {class_name} {{\n"
+            f"    public static void main(String[] args) {{\n"
+            f"        SpringApplication.run({class_name}.class, args);\n"
+            f"    }}\n"
+            f"}}\n")
+
+
+def _build_gradle(boot_version: str, package: str, dependencies: List[Dict]) -> str:
+    lines = [
+        "plugins {",
+        "    id 'java'",
+        f"    id 'org.springframework.boot' version '{boot_version}'",
+        "    id 'io.spring.dependency-management' version '1.1.4'",
+        "}",
+        "",
+        f"group = '{package}'",
+        "version = '0.0.1-SNAPSHOT'",
+        "",
+        "repositories {",
+        "    mavenCentral()",
+        "}",
+        "",
+        "dependencies {",
+        "    implementation 'org.springframework.boot:spring-boot-starter-web'",
+    ]
+    lines += [f"    implementation '{dep['name']}:{dep['version']}'" for dep in dependencies]
+    lines += ["    testImplementation 'org.springframework.boot:spring-boot-starter-test'", "}"]
+    return "\n".join(lines) + "\n"
+
+
+def _yaml_lines(config: Dict[str, str]) -> List[str]:
+    """Nested YAML for dotted keys (the pools never make a key both a leaf and a parent)."""
+    tree: Dict = {}
+    for key, value in config.items():
+        node = tree
+        *parents, leaf = key.split(".")
+        for part in parents:
+            node = node.setdefault(part, {})
+        node[leaf] = value
+    lines = []
+
+    def emit(node, depth):
+        for key, value in node.items():
+            if isinstance(value, dict):
+                lines.append(f"{'  ' * depth}{key}:")
+                emit(value, depth + 1)
+            else:
+                lines.append(f"{'  ' * depth}{key}: {json.dumps(value)}")
+
+    emit(tree, 0)
+    return lines
+
+
+def _write(path: str, content: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(content)
+
+
+def generate_repos(out_dir: str, repos: int = 4, controllers: int = 3, endpoints: int = 5, dependencies: int = 8,
+                   config_keys: int = 8, seed: int = 0, overlap: float = 0.5) -> Dict[str, Dict]:
+    """
+    Write `repos` repositories into out_dir (replacing what is there) and return the manifest:
+    {service: {"endpoints": [...], "dependencies": [...], "config": {...}}}. overlap is the share
+    of each service's controllers drawn from resources other services also expose.
+    """
+    rng = random.Random(seed)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.makedirs(out_dir)
+    resources = _pool(RESOURCES, controllers * (repos + 1), lambda i: f"entity{i}")
+    shared = resources[:max(1, controllers)]
+    # One base path per resource, so services sharing a resource share its routes
+    base_paths = {r: f"/api/{_plural(r)}" if rng.random() < 0.7 else f"/{_plural(r)}" for r in resources}
+    dependency_pool = _pool(DEPENDENCY_POOL, max(dependencies + dependencies // 2, 1),
+                            lambda i: (f"com.synthetic.lib:lib-{i}", ["1.0.0", "1.1.0", "2.0.0"]))
+    config_pool = _pool(CONFIG_POOL, max(config_keys, 1),
+                        lambda i: (f"app.settings.option-{i}", ["true", "false", str(i)]))
+    manifest = {}
+    for index in range(repos):
+        service = service_name(index)
+        package = f"com.synthetic.svc{index}"
+        repo_dir = os.path.join(out_dir, service)
+        java_dir = os.path.join(repo_dir, "src", "main", "java", *package.split("."))
+        # Shared resources produce cross-service conflicts, the rest are service-specific
+        own = resources[len(shared) + index * controllers:len(shared) + (index + 1) * controllers]
+        picked = [r for r in shared if rng.random() < overlap][:controllers]
+        picked += own[:controllers - len(picked)]
+        service_endpoints = []
+        for resource in picked:
+            base_path = base_paths[resource]
+            names = {"R": _cap(resource), "Rs": _cap(_plural(resource)), "get": rng.choice(GET_VERBS),
+                     "create": rng.choice(CREATE_VERBS)}
+            sub = rng.choice(SUB_RESOURCES)
+            controller_endpoints = []
+            for http_method, path, handler in endpoint_templates(endpoints):
+                path = path.format(sub=sub)
+                method_name = handler.format(Sub=_cap(sub), **names)
+                method_name = method_name[:1].lower() + method_name[1:]
+                full_path = normalize_path(path, base_path)
+                controller_endpoints.append({
+                    "className": f"{_cap(resource)}Controller", "methodName": method_name,
+                    "httpMethod": http_method, "path": path, "classPath": base_path,
+                    "fullPath": base_path + path, "route": full_path,
+                    "httpMethods": [http_method], "routeKeys": [f"{http_method} {full_path}"],
+                })
+            _write(os.path.join(java_dir, "controller", f"{_cap(resource)}Controller.java"),
+                   _controller_source(package, resource, base_path, controller_endpoints))
+            _write(os.path.join(java_dir, "service", f"{_cap(resource)}Service.java"), _service_source(package, resource))
+            _write(os.path.join(java_dir, "model", f"{_cap(resource)}.java"), _model_source(package, resource))
+            service_endpoints.extend(controller_endpoints)
+        app_class = f"Svc{index}Application"
+        _write(os.path.join(java_dir, f"{app_class}.java"), _application_source(package, app_class))
+
+        service_dependencies = [{"name": coordinate, "version": rng.choice(versions)}
+                                for coordinate, versions in rng.sample(dependency_pool, min(dependencies, len(dependency_pool)))]
+        _write(os.path.join(repo_dir, "build.gradle"),
+               _build_gradle(rng.choice(BOOT_VERSIONS), package, service_dependencies))
+        _write(os.path.join(repo_dir, "settings.gradle"), f"rootProject.name = '{service}'\n")
+
+        config = {"spring.application.name": service}
+        for key, values in rng.sample(config_pool, min(config_keys, len(config_pool))):
+            config[key] = rng.choice(values).format(service=service)
+        resources_dir = os.path.join(repo_dir, "src", "main", "resources")
+        if index % 2:
+            _write(os.path.join(resources_dir, "application.yml"), "\n".join(_yaml_lines(config)) + "\n")
+        else:
+            _write(os.path.join(resources_dir, "application.properties"),
+                   "".join(f"{key}={value}\n" for key, value in config.items()))
+
+        manifest[service] = {"endpoints": service_endpoints, "dependencies": service_dependencies, "config": config}
+    with open(os.path.join(out_dir, MANIFEST_FILENAME), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic Spring Boot repositories")
+    parser.add_argument("out_dir")
+    parser.add_argument("--repos", type=int, default=4)
+    parser.add_argument("--controllers", type=int, default=3, help="Controllers per repository")
+    parser.add_argument("--endpoints", type=int, default=5, help="Endpoints per controller")
+    parser.add_argument("--dependencies", type=int, default=8, help="Dependencies per repository")
+    parser.add_argument("--config-keys", type=int, default=8, help="Configuration keys per repository")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    manifest = generate_repos(args.out_dir, args.repos, args.controllers, args.endpoints, args.dependencies,
+                              args.config_keys, args.seed)
+    total = sum(len(m["endpoints"]) for m in manifest.values())
+    print(f"[LOG] {len(manifest)} repositories with {total} endpoints written to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The engine's modules import each other as top-level modules, as when run from compatibility-engine/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
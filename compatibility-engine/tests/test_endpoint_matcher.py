@@ -0,0 +1,63 @@
+from endpoint_index import iter_candidate_pairs
+from endpoint_matcher import PrefilterStats, endpoint_methods, prefilter_pair
+
+
+def _ep(service, http_method, path, methods=None, method_name="handle"):
+    ep = {"service": service, "httpMethod": http_method, "path": path, "className": "C", "methodName": method_name}
+    if methods is not None:
+        ep["httpMethods"] = methods
+    return ep
+
+
+def test_disjoint_method_sets_are_no_conflict():
+    a = _ep("a", "REQUEST", "/api/x", ["PUT", "POST"])
+    b = _ep("b", "REQUEST", "/api/x", ["GET", "DELETE"])
+    verdict, explanation = prefilter_pair(a, b)
+    assert verdict == "No Conflict"
+    assert "POST, PUT vs DELETE, GET" in explanation
+
+
+def test_identical_method_sets_collide():
+    a = _ep("a", "REQUEST", "/api/x", ["PUT", "POST"], "save")
+    b = _ep("b", "REQUEST", "/api/x", ["POST", "PUT"], "store")
+    assert prefilter_pair(a, b)[0] == "Conflict"
+
+
+def test_partially_overlapping_method_sets_go_to_the_llm():
+    a = _ep("a", "REQUEST", "/api/x", ["PUT", "POST"])
+    b = _ep("b", "POST", "/api/x", ["POST"])
+    assert prefilter_pair(a, b) is None
+
+
+def test_request_without_method_list_is_a_wildcard():
+    assert endpoint_methods(_ep("a", "REQUEST", "/api/x")) is None
+    assert endpoint_methods(_ep("a", "REQUEST", "/api/x", [])) is None
+    assert prefilter_pair(_ep("a", "REQUEST", "/api/x"), _ep("b", "DELETE", "/api/x")) is None
+
+
+def test_single_methods_still_compare_by_httpMethod():
+    verdict, explanation = prefilter_pair(_ep("a", "GET", "/api/x"), _ep("b", "POST", "/api/x"))
+    assert (verdict, explanation) == ("No Conflict", "HTTP methods differ (GET vs POST).")
+
+
+def test_index_skips_disjoint_method_sets_and_yields_each_pair_once():
+    items = [
+        ("a", _ep("a", "REQUEST", "/api/x", ["PUT", "POST"])),
+        ("b", _ep("b", "REQUEST", "/api/x", ["GET", "DELETE"])),
+        ("c", _ep("c", "REQUEST", "/api/x", ["POST", "PUT", "GET"])),
+        ("d", _ep("d", "REQUEST", "/api/x")),
+    ]
+    pairs = [(x[0], y[0]) for x, y in iter_candidate_pairs(items)]
+    assert sorted(pairs) == [("a", "c"), ("a", "d"), ("b", "c"), ("b", "d"), ("c", "d")]
+
+
+def test_screened_pairs_count_as_avoided_llm_calls():
+    stats = PrefilterStats()
+    stats.pruned = 10
+    for decision in [("No Conflict", ""), ("Conflict", ""), None, None, None]:
+        stats.record(decision)
+    stats.screened = 2
+    assert stats.sent_to_llm == 1
+    assert stats.llm_calls_avoided == 14
+    assert stats.as_dict()["sent_to_llm"] == 1
+    assert "2 screened by similarity, 1 sent to LLM" in stats.report()
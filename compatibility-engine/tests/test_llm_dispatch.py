@@ -0,0 +1,149 @@
+import asyncio
+import time
+
+import pytest
+
+from fake_llm import FakeChatModel, FakeRateLimitError, default_responder
+from llm_cache import LLMCache
+from llm_dispatch import DECIDED_BY_LLM, LLMDispatcher, TokenBucket, iter_windowed
+
+
+class InFlightChatModel(FakeChatModel):
+    """FakeChatModel that records the most calls it ever had in flight at once."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def ainvoke(self, prompt):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await super().ainvoke(prompt)
+        finally:
+            self.in_flight -= 1
+
+
+def _dispatcher(**kwargs):
+    # Backoff in milliseconds, so injected 429s do not slow the tests down
+    return LLMDispatcher(base_backoff=0.001, max_backoff=0.01, **kwargs)
+
+
+def _prompts(count):
+    return [f"prompt {i}" for i in range(count)]
+
+
+class ReversedChatModel(FakeChatModel):
+    """FakeChatModel whose later prompts ("prompt <i>") answer sooner."""
+
+    async def ainvoke(self, prompt):
+        await asyncio.sleep(0.002 * (10 - int(prompt.split()[-1])))
+        return self._respond(prompt)
+
+
+def test_results_come_back_in_prompt_order():
+    responses = _dispatcher().map(ReversedChatModel(), _prompts(10))
+    assert [r.content for r in responses] == [default_responder(p) for p in _prompts(10)]
+
+
+def test_concurrency_is_bounded():
+    llm = InFlightChatModel(latency=0.01)
+    _dispatcher(max_concurrency=3).map(llm, _prompts(20))
+    assert llm.max_in_flight == 3
+    assert llm.calls == 20
+
+
+def test_rate_limited_calls_are_retried():
+    llm = FakeChatModel(rate_limit_rate=0.3, seed=7)
+    dispatcher = _dispatcher()
+    responses = dispatcher.map(llm, _prompts(40))
+    assert [r.content for r in responses] == [default_responder(p) for p in _prompts(40)]
+    assert llm.rate_limited > 0
+    assert dispatcher.rate_limited == dispatcher.retries == llm.rate_limited
+    assert dispatcher.calls == llm.calls == 40 + llm.rate_limited
+
+
+def test_retries_stop_after_max_retries():
+    llm = FakeChatModel(rate_limit_rate=1.0)
+    dispatcher = _dispatcher(max_retries=2)
+    responses = dispatcher.map(llm, _prompts(3), return_exceptions=True)
+    assert all(isinstance(r, FakeRateLimitError) for r in responses)
+    assert llm.calls == 3 * 3
+    assert dispatcher.retries == 3 * 2
+    with pytest.raises(FakeRateLimitError):
+        _dispatcher(max_retries=0).map(llm, _prompts(1))
+
+
+def test_other_errors_are_not_retried():
+    def responder(text):
+        raise ValueError("bad prompt")
+
+    llm = FakeChatModel(responder=responder)
+    dispatcher = _dispatcher()
+    responses = dispatcher.map(llm, _prompts(2), return_exceptions=True)
+    assert all(isinstance(r, ValueError) for r in responses)
+    assert llm.calls == 2
+    assert dispatcher.retries == 0
+
+
+def test_map_cached_only_sends_cache_misses(tmp_path):
+    cache = LLMCache(str(tmp_path))
+    requests = [(prompt, "system", {"prompt": prompt}) for prompt in _prompts(6)]
+    llm = FakeChatModel(rate_limit_rate=0.2, seed=3)
+    first = _dispatcher().map_cached(llm, requests[:4], cache)
+    calls = llm.calls
+
+    dispatcher = _dispatcher()
+    answers = dispatcher.map_cached(llm, requests, cache)
+    assert answers[:4] == first
+    assert answers == [default_responder(p) for p in _prompts(6)]
+    # Only the two new prompts (and their injected 429s) reached the model
+    assert dispatcher.calls == llm.calls - calls
+    assert dispatcher.calls - dispatcher.retries == 2
+    assert cache.hits == 4
+    cache.close()
+
+
+def test_token_bucket_waits_for_refill():
+    # 1200 per minute = 20 per second; a drained bucket needs 0.1s for 2 more
+    bucket = TokenBucket(1200)
+
+    async def drain_and_acquire():
+        await bucket.acquire(1200)
+        start = time.monotonic()
+        await bucket.acquire(2)
+        return time.monotonic() - start
+
+    assert 0.08 <= asyncio.run(drain_and_acquire()) < 0.5
+
+
+def test_request_rate_limit_spaces_out_calls():
+    # 600 requests per minute is one call every 0.1s once the bucket is empty
+    dispatcher = _dispatcher(requests_per_minute=600)
+    dispatcher.request_bucket.tokens = 0
+    start = time.monotonic()
+    dispatcher.map(FakeChatModel(), _prompts(3))
+    assert time.monotonic() - start >= 0.25
+
+
+def test_iter_windowed_reports_who_decided_each_item():
+    llm = FakeChatModel(rate_limit_rate=0.2, seed=5)
+    windows = []
+
+    def decide(n):
+        return (f"even {n}", "prefilter") if n % 2 == 0 else None
+
+    def screen(items):
+        windows.append(list(items))
+        return [(f"screened {n}", "screen") if n % 3 == 0 else None for n in items]
+
+    results = list(iter_windowed(range(12), decide, lambda n: (f"prompt {n}", "system", n), lambda: llm,
+                                 _dispatcher(), window=3, screen=screen))
+    assert [n for n, _, _ in results] == list(range(12))
+    assert windows == [[1, 3, 5], [7, 9, 11]]
+    decided_by = {n: by for n, _, by in results}
+    assert [n for n in range(12) if decided_by[n] == DECIDED_BY_LLM] == [1, 5, 7, 11]
+    assert decided_by[3] == decided_by[9] == "screen"
+    assert dict((n, answer) for n, answer, _ in results)[5] == default_responder("prompt 5")
+    assert llm.calls - llm.rate_limited == 4
@@ -0,0 +1,65 @@
+import pytest
+
+from maven_version import ComparableVersion, is_prerelease, latest_version, sort_versions
+
+# Sequences from Maven's ComparableVersionTest, in ascending order
+QUALIFIER_ORDER = [
+    "1-alpha2snapshot", "1-alpha2", "1-alpha-123", "1-beta-2", "1-beta123", "1-m2", "1-m11",
+    "1-rc", "1-cr2", "1-rc123", "1-SNAPSHOT", "1", "1-sp", "1-sp2", "1-sp123", "1-abc", "1-def",
+    "1-pom-1", "1-1-snapshot", "1-1", "1-2", "1-123",
+]
+NUMBER_ORDER = [
+    "2.0", "2.0.a", "2-1", "2.0.2", "2.0.123", "2.1.0", "2.1-a", "2.1b", "2.1-c", "2.1-1",
+    "2.1.0.1", "2.2", "2.123", "11.a2", "11.a11", "11.b2", "11.b11", "11.m2", "11.m11", "11",
+    "11.a", "11b", "11c", "11m",
+]
+
+
+def _assert_ascending(versions):
+    for i, lower in enumerate(versions):
+        for higher in versions[i + 1:]:
+            assert ComparableVersion(lower) < ComparableVersion(higher), f"{lower} < {higher}"
+            assert not ComparableVersion(higher) < ComparableVersion(lower), f"{higher} < {lower}"
+
+
+def test_qualifier_order():
+    _assert_ascending(QUALIFIER_ORDER)
+
+
+def test_number_order():
+    _assert_ascending(NUMBER_ORDER)
+
+
+@pytest.mark.parametrize("left,right", [
+    ("1", "1.0"), ("1", "1.0.0"), ("1", "1-0"), ("1", "1.0-0"),
+    ("1a", "1-a"), ("1a", "1.0-a"), ("1.0.0a", "1-a"), ("1x", "1.0.0-x"),
+    ("1cr", "1rc"), ("1a1", "1-alpha-1"), ("1b2", "1-beta-2"), ("1m3", "1-milestone-3"),
+    ("1X", "1x"), ("1-SNAPSHOT", "1-snapshot"), ("1.SNAPSHOT", "1-SNAPSHOT"),
+    ("1-GA", "1"), ("1-final", "1"), ("1.RELEASE", "1"),
+])
+def test_equivalent_spellings(left, right):
+    assert ComparableVersion(left) == ComparableVersion(right)
+    assert hash(ComparableVersion(left)) == hash(ComparableVersion(right))
+
+
+def test_spring_style_versions():
+    _assert_ascending(["4.0.6.RELEASE", "5.3.39", "6.2.0-M1", "6.2.0-RC1", "6.2.0", "10.0"])
+
+
+@pytest.mark.parametrize("version,expected", [
+    ("6.2.0", False), ("4.0.6.RELEASE", False), ("2.1.0-SNAPSHOT", True),
+    ("6.2.0-M1", True), ("6.2.0-RC1", True), ("1.0.0-beta", True),
+])
+def test_is_prerelease(version, expected):
+    assert is_prerelease(version) is expected
+
+
+def test_sort_versions_keeps_non_plain_versions_first():
+    assert sort_versions(["10.0", "${spring.version}", "9.1", "9.1-SNAPSHOT"]) == \
+        ["${spring.version}", "9.1-SNAPSHOT", "9.1", "10.0"]
+
+
+def test_latest_version_prefers_releases():
+    assert latest_version(["6.1.14", "6.2.0-RC1", "6.1.9"]) == "6.1.14"
+    assert latest_version(["6.2.0-M1", "6.2.0-RC1"]) == "6.2.0-RC1"
+    assert latest_version(["[1.0,2.0)"]) is None
@@ -0,0 +1,71 @@
+import json
+import os
+
+import pytest
+
+import repo_index
+from repo_index import INDEX_FILENAME, KIND_OUTPUT, get_index, indexed_files, read_text
+
+
+@pytest.fixture(autouse=True)
+def fresh_indexes(monkeypatch):
+    monkeypatch.setattr(repo_index, "_indexes", {})
+
+
+def _write(path, text=""):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def _repos(tmp_path):
+    repos_dir = tmp_path / "work" / "repos"
+    for name in ("svc-a", "svc-b"):
+        _write(str(repos_dir / name / "build.gradle"))
+        _write(str(repos_dir / name / "src" / "main" / "java" / "App.java"), "package demo;\n")
+    return repos_dir
+
+
+def test_stray_index_in_an_ancestor_is_ignored(tmp_path):
+    repos_dir = _repos(tmp_path)
+    _write(str(tmp_path / INDEX_FILENAME), json.dumps({"version": repo_index.INDEX_VERSION, "dirs": {}, "files": {}}))
+    index = get_index(str(repos_dir / "svc-a"))
+    assert index.root == str(repos_dir / "svc-a")
+    assert [f.name for f in index.files(kind="java")] == ["App.java"]
+    names = sorted(os.path.basename(os.path.dirname(f.path)) for f in indexed_files(str(repos_dir), kind="build"))
+    assert names == ["svc-a", "svc-b"]
+
+
+def test_files_resolve_through_their_repository(tmp_path):
+    repos_dir = _repos(tmp_path)
+    java_file = str(repos_dir / "svc-b" / "src" / "main" / "java" / "App.java")
+    with pytest.raises(ValueError):
+        get_index(java_file)
+    assert get_index(java_file, str(repos_dir)).root == str(repos_dir / "svc-b")
+    assert get_index(java_file) is get_index(str(repos_dir / "svc-b"))
+    assert read_text(java_file) == "package demo;\n"
+
+
+def test_read_text_without_an_open_index_builds_none(tmp_path):
+    repos_dir = _repos(tmp_path)
+    java_file = str(repos_dir / "svc-a" / "src" / "main" / "java" / "App.java")
+    assert read_text(java_file) == "package demo;\n"
+    assert repo_index._indexes == {}
+    assert not os.path.exists(os.path.join(os.path.dirname(java_file), INDEX_FILENAME))
+
+
+def test_a_single_repository_without_a_saved_index_is_indexed_itself(tmp_path):
+    repos_dir = _repos(tmp_path)
+    repo = repos_dir / "svc-a"
+    _write(str(repo / "analysis_result.json"), "{}")
+    found = indexed_files(str(repo), kind=KIND_OUTPUT, names=["analysis_result.json"])
+    assert [f.path for f in found] == [str(repo / "analysis_result.json")]
+    assert os.path.isfile(repo / INDEX_FILENAME)
+    assert not os.path.exists(repo / "src" / INDEX_FILENAME)
+
+
+def test_a_directory_without_subdirectories_is_a_repository(tmp_path):
+    repo = tmp_path / "results-only"
+    _write(str(repo / "analysis_result.json"), "{}")
+    found = indexed_files(str(repo), kind=KIND_OUTPUT, names=["analysis_result.json"])
+    assert [f.path for f in found] == [str(repo / "analysis_result.json")]
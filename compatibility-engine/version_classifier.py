@@ -0,0 +1,109 @@
+from typing import Dict, List, Optional, Tuple
+
+from maven_version import is_plain_version, latest_version, major_minor, major_version, sort_versions
+
+# Local verdicts for dependency version conflicts. Clear cases are settled here: a single
+# version everywhere, drift within one major version, and Spring Framework / Spring Boot
+# major upgrades whose alignment is known. Everything else (other major-version splits,
+# 0.x lines, ranges, unresolved versions) is ambiguous and goes to the LLM.
+
+SPRING_FRAMEWORK_GROUP = "org.springframework"
+SPRING_BOOT_GROUP = "org.springframework.boot"
+
+# Spring Boot minor line -> Spring Framework minor line it is built on
+SPRING_BOOT_TO_FRAMEWORK = {
+    "1.0": "4.0", "1.1": "4.0", "1.2": "4.1", "1.3": "4.2", "1.4": "4.3", "1.5": "4.3",
+    "2.0": "5.0", "2.1": "5.1", "2.2": "5.2", "2.3": "5.2", "2.4": "5.3", "2.5": "5.3", "2.6": "5.3", "2.7": "5.3",
+    "3.0": "6.0", "3.1": "6.0", "3.2": "6.1", "3.3": "6.1", "3.4": "6.2", "3.5": "6.2",
+}
+# Platform baselines that make a major Spring upgrade a migration rather than a version bump
+SPRING_MAJOR_NOTES = {
+    5: "Java 8+ baseline",
+    6: "Java 17+ baseline and the javax.* -> jakarta.* namespace move of Jakarta EE 9",
+}
+
+
+def boot_lines_for_framework(framework_line: str) -> List[str]:
+    return [boot for boot, framework in SPRING_BOOT_TO_FRAMEWORK.items() if framework == framework_line]
+
+
+def _spring_alignment(version: str, is_boot: bool) -> str:
+    line = major_minor(version)
+    if is_boot:
+        framework = SPRING_BOOT_TO_FRAMEWORK.get(line)
+        return f"Spring Boot {line} (Spring Framework {framework})" if framework else f"Spring Boot {line}"
+    boots = boot_lines_for_framework(line)
+    if not boots:
+        return f"Spring Framework {line}"
+    boot_range = boots[0] if len(boots) == 1 else f"{boots[0]}-{boots[-1]}"
+    return f"Spring Framework {line} (Spring Boot {boot_range})"
+
+
+def classify_dependency(dep_name: str, versions_services: Dict[str, List[str]]) -> Optional[Tuple[str, str]]:
+    """Return (verdict, explanation) when the versions settle the question, or None if the LLM should decide."""
+    versions = list(versions_services.keys())
+    if len(versions) == 1:
+        services = sorted(set(versions_services[versions[0]]))
+        return "No Conflict", f"All services ({', '.join(services)}) use {dep_name} {versions[0]}."
+    if not all(is_plain_version(v) for v in versions):
+        return None
+    ordered = sort_versions(versions)
+    latest = latest_version(versions)
+    majors = {major_version(v) for v in versions}
+    group = dep_name.split(":", 1)[0]
+    if len(majors) == 1:
+        major = majors.pop()
+        if major is None or major == 0:
+            # 0.x lines make no compatibility promise between minors
+            return None
+        return "Conflict", (
+            f"Versions {', '.join(ordered)} differ only within major version {major}, which is backward compatible "
+            f"under semantic versioning. Align all services on {latest}."
+        )
+    if group in (SPRING_FRAMEWORK_GROUP, SPRING_BOOT_GROUP):
+        is_boot = group == SPRING_BOOT_GROUP
+        framework_major = major_version(SPRING_BOOT_TO_FRAMEWORK.get(major_minor(latest), "")) if is_boot else major_version(latest)
+        note = SPRING_MAJOR_NOTES.get(framework_major)
+        lines = []
+        for version in ordered:
+            services = sorted(set(versions_services[version]))
+            lines.append(f"{version} -> {_spring_alignment(version, is_boot)} used by {', '.join(services)}")
+        return "Conflict", (
+            "Services are on different major Spring lines: " + "; ".join(lines) + ". "
+            f"Moving to {latest} is a coordinated Spring Boot/Spring Framework migration"
+            + (f" ({note})" if note else "") + ", not a drop-in upgrade. "
+            f"Migrate the older services together with their Spring Boot version, then align on {latest}."
+        )
+    return None
+
+
+def format_classifier_reasoning(verdict: str, explanation: str) -> str:
+    """Render a local verdict in the same shape as an LLM answer."""
+    return f"{verdict}\n\n{explanation} (Decided by the version classifier; no LLM call was made.)"
+
+
+class VersionClassifierStats:
+    """Counters for how many dependencies were settled without the LLM."""
+
+    def __init__(self):
+        self.total = 0
+        self.no_conflict = 0
+        self.conflict = 0
+        self.ambiguous = 0
+
+    def record(self, decision: Optional[Tuple[str, str]]):
+        self.total += 1
+        if decision is None:
+            self.ambiguous += 1
+        elif decision[0] == "No Conflict":
+            self.no_conflict += 1
+        else:
+            self.conflict += 1
+
+    def report(self) -> str:
+        avoided = self.no_conflict + self.conflict
+        pct = (100.0 * avoided / self.total) if self.total else 0.0
+        return (
+            f"Version classifier: {self.total} shared dependencies, {self.no_conflict} no-conflict, "
+            f"{self.conflict} settled conflicts, {self.ambiguous} sent to LLM ({avoided} LLM calls avoided, {pct:.1f}%)"
+        )
@@ -0,0 +1,182 @@
+import os
+import sys
+import time
+import argparse
+from collections import Counter
+
+from java_classifier import JavaClassifier
+
+# Accuracy and throughput of the declaration-based Java classifier against the substring
+# heuristic it replaced. Accuracy is measured on the labelled fixture corpus below; with
+# --repos, both classifiers also run over every .java file of a repos directory to report
+# throughput and how often they disagree. Nothing is written.
+#
+#   python iMCE/bench_java_classifier.py
+#   python iMCE/bench_java_classifier.py --repos repos --repeat 3
+
+
+def legacy_classify(file_path, content):
+    """The substring heuristic classify_java_file used before (kept here for comparison)."""
+    filename = os.path.basename(file_path).lower()
+    content_lower = content.lower()
+    if '@springbootapplication' in content_lower:
+        return 'main'
+    elif '@controller' in content_lower or '@restcontroller' in content_lower:
+        return 'controller'
+    elif '@service' in content_lower or 'service' in filename:
+        return 'service'
+    elif '@repository' in content_lower or 'repository' in filename or 'dao' in filename:
+        return 'repository'
+    elif '@entity' in content_lower or '@document' in content_lower or 'model' in filename or 'entity' in filename:
+        return 'model'
+    elif '@configuration' in content_lower or 'config' in filename:
+        return 'config'
+    elif 'dto' in filename or 'request' in filename or 'response' in filename:
+        return 'dto'
+    elif 'exception' in filename or 'error' in filename:
+        return 'exception'
+    elif 'util' in filename or 'helper' in filename:
+        return 'util'
+    elif 'test' in filename:
+        return 'test'
+    else:
+        return 'other'
+
+
+# (path, source, expected category)
+CORPUS = [
+    ("src/main/java/com/acme/OrdersApplication.java",
+     "package com.acme;\n@SpringBootApplication\npublic class OrdersApplication { public static void main(String[] a) {} }", "main"),
+    ("src/main/java/com/acme/web/OrderController.java",
+     "package com.acme.web;\nimport org.springframework.web.bind.annotation.*;\n@RestController\n@RequestMapping(\"/orders\")\npublic class OrderController {}", "controller"),
+    ("src/main/java/com/acme/web/PageController.java",
+     "package com.acme.web;\n@Controller\npublic class PageController { String home() { return \"index\"; } }", "controller"),
+    ("src/main/java/com/acme/web/ServiceStatusController.java",
+     "package com.acme.web;\n@RestController\npublic class ServiceStatusController { private final OrderService service; }", "controller"),
+    ("src/main/java/com/acme/service/OrderService.java",
+     "package com.acme.service;\n@Service\npublic class OrderService { private final OrderRepository repo; }", "service"),
+    ("src/main/java/com/acme/service/PaymentServiceImpl.java",
+     "package com.acme.service;\npublic class PaymentServiceImpl implements PaymentService {}", "service"),
+    ("src/main/java/com/acme/integration/OrderEventHandler.java",
+     "package com.acme.integration;\n@Component\npublic class OrderEventHandler {\n  @ServiceActivator(inputChannel = \"orders\")\n  public void handle(Object o) {}\n}", "other"),
+    ("src/main/java/com/acme/repo/OrderRepository.java",
+     "package com.acme.repo;\npublic interface OrderRepository extends JpaRepository<Order, Long> {}", "repository"),
+    ("src/main/java/com/acme/repo/CustomerStore.java",
+     "package com.acme.repo;\n@Repository\npublic class CustomerStore { }", "repository"),
+    ("src/main/java/com/acme/repo/LegacyOrderDao.java",
+     "package com.acme.repo;\npublic class LegacyOrderDao { }", "repository"),
+    ("src/main/java/com/acme/model/Order.java",
+     "package com.acme.model;\nimport jakarta.persistence.*;\n@Entity\n@Table(name = \"orders\")\npublic class Order { @Id Long id; }", "model"),
+    ("src/main/java/com/acme/model/AuditLog.java",
+     "package com.acme.model;\n@Document(collection = \"audit\")\npublic class AuditLog { }", "model"),
+    ("src/main/java/com/acme/model/Address.java",
+     "package com.acme.model;\n@Embeddable\npublic class Address { String street; }", "model"),
+    ("src/main/java/com/acme/config/SecurityConfig.java",
+     "package com.acme.config;\n@Configuration\n@EnableWebSecurity\npublic class SecurityConfig { }", "config"),
+    ("src/main/java/com/acme/config/CacheSetup.java",
+     "package com.acme.config;\n@EnableCaching\npublic class CacheSetup { }", "config"),
+    ("src/main/java/com/acme/config/MailProperties.java",
+     "package com.acme.config;\n@ConfigurationProperties(prefix = \"mail\")\npublic class MailProperties { }", "config"),
+    ("src/main/java/com/acme/dto/CreateOrderRequest.java",
+     "package com.acme.dto;\npublic class CreateOrderRequest { String sku; }", "dto"),
+    ("src/main/java/com/acme/dto/OrderSummary.java",
+     "package com.acme.dto;\npublic record OrderSummary(Long id, String status) { }", "dto"),
+    ("src/main/java/com/acme/dto/ServiceHealthDto.java",
+     "package com.acme.dto;\npublic class ServiceHealthDto { String name; }", "dto"),
+    ("src/main/java/com/acme/error/OrderNotFoundException.java",
+     "package com.acme.error;\npublic class OrderNotFoundException extends RuntimeException { }", "exception"),
+    ("src/main/java/com/acme/error/InsufficientStock.java",
+     "package com.acme.error;\npublic class InsufficientStock extends IllegalStateException { }", "exception"),
+    ("src/main/java/com/acme/error/GlobalExceptionHandler.java",
+     "package com.acme.error;\n@RestControllerAdvice\npublic class GlobalExceptionHandler {\n  @ExceptionHandler(OrderNotFoundException.class) void h() {}\n}", "exception"),
+    ("src/main/java/com/acme/util/DateUtils.java",
+     "package com.acme.util;\npublic final class DateUtils { private DateUtils() {} }", "util"),
+    ("src/main/java/com/acme/util/ModelMapperHelper.java",
+     "package com.acme.util;\npublic class ModelMapperHelper { }", "util"),
+    ("src/main/java/com/acme/util/ConfigurableClock.java",
+     "package com.acme.util;\npublic class ConfigurableClock { }", "other"),
+    ("src/main/java/com/acme/events/OrderCreated.java",
+     "package com.acme.events;\n/* Publishes to the @Service bus; see @RestController docs */\npublic class OrderCreated { String text = \"@Entity\"; }", "other"),
+    ("src/main/java/com/acme/web/Views.java",
+     "package com.acme.web;\npublic interface Views { }", "other"),
+    ("src/test/java/com/acme/web/OrderControllerTest.java",
+     "package com.acme.web;\n@WebMvcTest(OrderController.class)\nclass OrderControllerTest { @Autowired MockMvc mvc; }", "test"),
+    ("src/test/java/com/acme/service/OrderServiceTests.java",
+     "package com.acme.service;\n@ExtendWith(MockitoExtension.class)\nclass OrderServiceTests { }", "test"),
+    ("src/test/java/com/acme/support/Fixtures.java",
+     "package com.acme.support;\npublic class Fixtures { }", "test"),
+    ("src/main/java/com/acme/latest/LatestOrders.java",
+     "package com.acme.latest;\npublic class LatestOrders { }", "other"),
+]
+
+
+def accuracy(classify):
+    wrong = []
+    for path, source, expected in CORPUS:
+        got = classify(path, source)
+        if got != expected:
+            wrong.append((path, expected, got))
+    return 1 - len(wrong) / len(CORPUS), wrong
+
+
+def throughput(classify, files, repeat):
+    """(files/s, MB/s) over files, each classified repeat times."""
+    size = sum(len(content) for _, content in files)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for path, content in files:
+            classify(path, content)
+    seconds = max(time.perf_counter() - start, 1e-9)
+    return len(files) * repeat / seconds, size * repeat / seconds / 1e6
+
+
+def load_repo_files(repos_dir):
+    files = []
+    for root, dirs, names in os.walk(repos_dir):
+        dirs[:] = [d for d in dirs if not d.startswith(".") and d not in ("build", "target", "node_modules")]
+        for name in names:
+            if name.endswith(".java"):
+                path = os.path.join(root, name)
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    files.append((path, f.read()))
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Java file classifier")
+    parser.add_argument("--repos", help="Also classify every .java file under this directory")
+    parser.add_argument("--repeat", type=int, default=200, help="Passes over the files for the throughput numbers")
+    args = parser.parse_args()
+
+    classifier = JavaClassifier()
+    uncached = lambda path, content: (classifier.clear(), classifier.classify(path, content))[1]
+    print(f"Fixture corpus: {len(CORPUS)} files")
+    for label, classify in (("substring heuristic", legacy_classify), ("declaration classifier", classifier.classify)):
+        score, wrong = accuracy(classify)
+        print(f"  {label:24} accuracy {score:6.1%}")
+        for path, expected, got in wrong:
+            print(f"      {os.path.basename(path):32} expected {expected:10} got {got}")
+
+    files = [(path, source) for path, source, _ in CORPUS]
+    repeat = args.repeat
+    if args.repos:
+        files = load_repo_files(args.repos)
+        repeat = max(1, args.repeat // 100)
+        legacy = [legacy_classify(path, content) for path, content in files]
+        current = [classifier.classify(path, content) for path, content in files]
+        changed = Counter((old, new) for old, new in zip(legacy, current) if old != new)
+        print(f"\n{args.repos}: {len(files)} .java files, {sum(changed.values())} classified differently")
+        for (old, new), count in changed.most_common(10):
+            print(f"  {old:10} -> {new:10} {count}")
+
+    print(f"\nThroughput ({len(files)} files x {repeat}):")
+    for label, classify in (("substring heuristic", legacy_classify), ("declaration, uncached", uncached),
+                            ("declaration, cached", classifier.classify)):
+        files_per_s, mb_per_s = throughput(classify, files, repeat)
+        print(f"  {label:24} {files_per_s:10.0f} files/s {mb_per_s:8.1f} MB/s")
+    print(classifier.report())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,311 @@
+import os
+import re
+import time
+from functools import lru_cache
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Tuple
+
+try:
+    import yaml
+except ImportError:  # YAML configs are then copied as plain resources
+    yaml = None
+
+# Key-level merge of the services' configuration files. Every .properties file and every
+# application*/bootstrap*.yml is parsed into (key, value) pairs; YAML documents are flattened
+# to the dotted keys Spring uses (lists as key[0]), and profile-specific files and documents
+# (application-dev.yml, spring.config.activate.on-profile) go to their own profile group.
+#
+# Keys of Spring's own files (application*/bootstrap*) are indexed by the relaxed-binding form
+# (lower case, dashes dropped), so server.max-http-header-size and server.maxHttpHeaderSize
+# are the same key; other bundles (messages.properties, ...) are merged on the exact key. A key set to
+# different values by different files is a conflict: the first value is kept and, depending
+# on the strategy, the others are left as comments, kept under <service>.<key>, or moved to
+# a per-service profile file. The merged output is always .properties.
+
+STRATEGY_FIRST = "first"
+STRATEGY_NAMESPACE = "namespace"
+STRATEGY_PROFILE = "profile"
+STRATEGIES = (STRATEGY_FIRST, STRATEGY_NAMESPACE, STRATEGY_PROFILE)
+
+SPRING_BASES = ("application", "bootstrap")
+SPRING_CONFIG_RE = re.compile(r'^(application|bootstrap)(?:-([\w.-]+))?\.(properties|ya?ml)$')
+PROFILE_KEYS = ("spring.config.activate.on-profile", "spring.profiles")
+# Profile names, and YAML map keys Spring binds without [brackets]
+PLAIN_NAME_RE = re.compile(r'^[\w.-]+$')
+# Logical .properties line: key up to the first unescaped separator, then the value
+PROPERTY_RE = re.compile(r'((?:\\.|[^\\=:\s])*)[ \t\f]*[=:]?[ \t\f]*(.*)', re.DOTALL)
+ESCAPE_RE = re.compile(r'\\(u[0-9a-fA-F]{4}|.)', re.DOTALL)
+ESCAPES = {"t": "\t", "n": "\n", "r": "\r", "f": "\f"}
+RELAXED_RE = re.compile(r'\[[^\]]*\]|[^\[]+')
+# Characters written escaped; only these go through a Python callback
+KEY_SPECIAL_RE = re.compile(r'[\\ =:#!\t\n\r\f]|[^\x00-\x7e]')
+VALUE_SPECIAL_RE = re.compile(r'[\\\t\n\r\f]|[^\x00-\x7e]')
+ESCAPE_CHARS = {"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r", "\f": "\\f"}
+
+
+class ConfigError(Exception):
+    pass
+
+
+class ConfigFile(NamedTuple):
+    path: str
+    base: str  # output file stem: application, bootstrap, messages, ...
+    sections: List[Tuple[Optional[str], List[Tuple[str, str]]]]  # (profile, [(key, value)])
+
+
+def is_config_file(path: str) -> bool:
+    """Files merged by key: every .properties file, and Spring's application/bootstrap YAML when PyYAML is available."""
+    name = os.path.basename(path)
+    if name.endswith(".properties"):
+        return True
+    match = SPRING_CONFIG_RE.match(name)
+    return match is not None and yaml is not None
+
+
+@lru_cache(maxsize=65536)
+def canonical_key(key: str) -> str:
+    """Relaxed-binding form of a property name; map keys in [brackets] are kept as written."""
+    return RELAXED_RE.sub(lambda m: m.group() if m.group().startswith("[") else m.group().lower().replace("-", ""), key)
+
+
+def _unescape(text: str) -> str:
+    def replace(match):
+        escape = match.group(1)
+        if escape.startswith("u") and len(escape) == 5:
+            return chr(int(escape[1:], 16))
+        return ESCAPES.get(escape, escape)
+    if "\\" not in text:
+        return text
+    unescaped = ESCAPE_RE.sub(replace, text)
+    if "\\u" in text:
+        # Characters outside the BMP are written as two \uXXXX surrogates
+        unescaped = unescaped.encode("utf-16", "surrogatepass").decode("utf-16")
+    return unescaped
+
+
+def parse_properties(lines) -> List[Tuple[str, str]]:
+    """(key, value) pairs of a .properties stream, following java.util.Properties.load."""
+    entries, logical = [], None
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if logical is None:
+            line = line.lstrip(" \t\f")
+            if not line or line[0] in "#!":
+                continue
+            logical = ""
+        else:
+            line = line.lstrip(" \t\f")  # continuation line
+        trailing = len(line) - len(line.rstrip("\\"))
+        if trailing % 2:
+            logical += line[:-1]
+            continue
+        logical += line
+        match = PROPERTY_RE.match(logical)
+        entries.append((_unescape(match.group(1)), _unescape(match.group(2))))
+        logical = None
+    if logical:
+        match = PROPERTY_RE.match(logical)
+        entries.append((_unescape(match.group(1)), _unescape(match.group(2))))
+    return entries
+
+
+def _scalar(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+def flatten_yaml(node, prefix: str = "", out: Optional[List[Tuple[str, str]]] = None) -> List[Tuple[str, str]]:
+    """Dotted (key, value) pairs of one YAML document, the way Spring flattens it."""
+    out = [] if out is None else out
+    if isinstance(node, dict):
+        for key, value in node.items():
+            key = _scalar(key)
+            if prefix and not PLAIN_NAME_RE.match(key):
+                name = f"{prefix}[{key}]"  # map key with characters Spring would drop
+            else:
+                name = f"{prefix}.{key}" if prefix else key
+            flatten_yaml(value, name, out)
+    elif isinstance(node, list):
+        if not node:
+            out.append((prefix, ""))
+        for i, value in enumerate(node):
+            flatten_yaml(value, f"{prefix}[{i}]", out)
+    elif prefix:
+        out.append((prefix, _scalar(node)))
+    return out
+
+
+def _is_profile_key(key: str) -> bool:
+    """The key activating a YAML document (spring.profiles.active and friends are ordinary keys)."""
+    return key.split("[", 1)[0] in PROFILE_KEYS
+
+
+def _document_profiles(entries: List[Tuple[str, str]], path: str) -> List[str]:
+    values = [value for key, value in entries if _is_profile_key(key)]
+    profiles = [p.strip() for value in values for p in value.split(",") if p.strip()]
+    if all(PLAIN_NAME_RE.match(p) for p in profiles):
+        return profiles
+    print(f"[WARN] {path}: profile expression '{', '.join(values)}' is merged into the default profile")
+    return []
+
+
+def _read_text(path: str) -> str:
+    with open(path, "rb") as f:
+        data = f.read()
+    try:
+        return data.decode("utf-8")
+    except UnicodeDecodeError:
+        return data.decode("latin-1")  # the .properties default encoding
+
+
+def load_config_file(path: str) -> ConfigFile:
+    """Parse one configuration file into its profile sections."""
+    name = os.path.basename(path)
+    match = SPRING_CONFIG_RE.match(name)
+    base, file_profile = (match.group(1), match.group(2)) if match else (os.path.splitext(name)[0], None)
+    if name.endswith(".properties"):
+        return ConfigFile(path, base, [(file_profile, parse_properties(_read_text(path).splitlines()))])
+    if yaml is None:
+        raise ConfigError("PyYAML is not installed")
+    sections = []
+    try:
+        documents = list(yaml.safe_load_all(_read_text(path)))
+    except yaml.YAMLError as e:
+        raise ConfigError(f"invalid YAML: {e}")
+    for document in documents:
+        entries = flatten_yaml(document)
+        profiles = _document_profiles(entries, path)
+        if profiles:
+            entries = [(k, v) for k, v in entries if not _is_profile_key(k)]
+            sections.extend((profile, entries) for profile in profiles)
+        elif entries:
+            sections.append((file_profile, entries))
+    return ConfigFile(path, base, sections)
+
+
+def _escape(match) -> str:
+    c = match.group()
+    if c in ESCAPE_CHARS:
+        return ESCAPE_CHARS[c]
+    if ord(c) > 126:
+        # ASCII output reads the same whatever encoding Spring assumes
+        data = c.encode("utf-16-be")
+        return "".join(f"\\u{int.from_bytes(data[i:i + 2], 'big'):04x}" for i in range(0, len(data), 2))
+    return "\\" + c
+
+
+def _escape_key(key: str) -> str:
+    return KEY_SPECIAL_RE.sub(_escape, key)
+
+
+def _escape_value(value: str) -> str:
+    escaped = VALUE_SPECIAL_RE.sub(_escape, value)
+    return "\\" + escaped if escaped.startswith(" ") else escaped
+
+
+@lru_cache(maxsize=None)
+def _service_name(service: str) -> str:
+    return re.sub(r"[^a-z0-9-]+", "-", os.path.basename(service.rstrip(os.sep)).lower()).strip("-") or "service"
+
+
+class _Key:
+    __slots__ = ("key", "values")
+
+    def __init__(self, key: str):
+        self.key = key  # spelling of the first file that set it
+        # value -> [(service, source path)], in first-seen order
+        self.values: "OrderedDict[str, List[Tuple[str, str]]]" = OrderedDict()
+
+
+class ConfigMerger:
+    """Indexed key map of all configuration files, grouped by output file (base name and profile)."""
+
+    def __init__(self, strategy: str = STRATEGY_FIRST):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Unknown config merge strategy '{strategy}' (expected one of {', '.join(STRATEGIES)})")
+        self.strategy = strategy
+        self.started = time.perf_counter()
+        # (base, profile) -> key (relaxed for Spring's files) -> _Key
+        self.groups: "OrderedDict[Tuple[str, Optional[str]], OrderedDict[str, _Key]]" = OrderedDict()
+        self.files = 0
+        self.keys = 0
+        self.conflicts: List[dict] = []
+
+    def add(self, service: str, config: ConfigFile):
+        self.files += 1
+        relaxed = SPRING_CONFIG_RE.match(os.path.basename(config.path)) is not None
+        for profile, entries in config.sections:
+            group = self.groups.setdefault((config.base, profile), OrderedDict())
+            for key, value in entries:
+                canonical = canonical_key(key) if relaxed else key
+                entry = group.get(canonical)
+                if entry is None:
+                    entry = group[canonical] = _Key(key)
+                    self.keys += 1
+                entry.values.setdefault(value, []).append((service, config.path))
+
+    @staticmethod
+    def file_name(base: str, profile: Optional[str]) -> str:
+        return f"{base}-{profile}.properties" if profile else f"{base}.properties"
+
+    def write(self, target_dir: str) -> List[str]:
+        """Write the merged files into target_dir and return their paths. Conflicts are collected in self.conflicts."""
+        outputs: "OrderedDict[str, List[str]]" = OrderedDict()
+        self.conflicts = []
+        for (base, profile), group in self.groups.items():
+            name = self.file_name(base, profile)
+            lines = outputs.setdefault(name, [
+                "# Merged configuration from multiple microservices",
+                "# Generated by iMCE consolidation orchestrator",
+                "",
+            ])
+            for entry in group.values():
+                (value, origins), *others = entry.values.items()
+                if others:
+                    self._conflict(name, base, profile, entry, lines, outputs)
+                lines.append(f"{_escape_key(entry.key)}={_escape_value(value)}")
+
+        os.makedirs(target_dir, exist_ok=True)
+        written = []
+        for name, lines in outputs.items():
+            path = os.path.join(target_dir, name)
+            with open(path, "w", encoding="ascii", newline="\n") as f:
+                f.write("\n".join(lines) + "\n")
+            written.append(path)
+        return written
+
+    def _conflict(self, name, base, profile, entry, lines, outputs):
+        values = [{"value": value, "services": [s for s, _ in origins], "sources": [p for _, p in origins]}
+                  for value, origins in entry.values.items()]
+        # Profiles only apply to Spring's own files; other bundles (messages, ...) keep the alternatives as comments
+        strategy = self.strategy if self.strategy != STRATEGY_PROFILE or base in SPRING_BASES else STRATEGY_FIRST
+        self.conflicts.append({"file": name, "key": entry.key, "values": values, "resolution": strategy})
+        services = lambda value: list(dict.fromkeys(_service_name(s) for s in value["services"]))
+        lines.append(f"# CONFLICT: kept value of {', '.join(services(values[0]))}")
+        if strategy == STRATEGY_FIRST:
+            for other in values[1:]:
+                lines.append(f"# {', '.join(services(other))}: {_escape_key(entry.key)}={_escape_value(other['value'])}")
+        elif strategy == STRATEGY_NAMESPACE:
+            for value in values:
+                for service in services(value):
+                    lines.append(f"{service}.{_escape_key(entry.key)}={_escape_value(value['value'])}")
+        else:
+            for value in values:
+                for service in services(value):
+                    service_profile = f"{profile}-{service}" if profile else service
+                    service_lines = outputs.setdefault(self.file_name(base, service_profile), [
+                        f"# Values of {service} that conflict with other services",
+                        f"# Activate with spring.profiles.active={service_profile}",
+                        "",
+                    ])
+                    service_lines.append(f"{_escape_key(entry.key)}={_escape_value(value['value'])}")
+
+    def report(self) -> str:
+        seconds = max(time.perf_counter() - self.started, 1e-9)
+        return (f"Config merge: {self.files} files, {self.keys} keys in {len(self.groups)} groups, "
+                f"{len(self.conflicts)} conflicts ({self.strategy}) in {seconds:.2f}s")
@@ -6,52 +6,61 @@ from visualization import generate_service_structure_mermaid, write_mermaid_to_m
 import subprocess
 import shutil
 import re
-import requests
-import zipfile
-import io
+import argparse
+import sys
+import time
+import hashlib
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# The repo index lives in compatibility-engine and is shared with its stages
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "compatibility-engine"))
+from repo_index import KIND_JAVA, KIND_RESOURCE, get_index, read_text
+from repo_pool import run_per_repo
+from llm_cache import model_name_of
+from pipeline_trace import configure_tracing, traced, traced_invoke
+from symbol_relocation import PACKAGE_RE, Relocation
+from java_classifier import JavaClassifier
+from scaffold_cache import DEFAULT_CACHE_DIR, DEFAULT_PARAMS, carry_over, replace_directory, scaffold_into
+from config_merge import STRATEGIES, STRATEGY_FIRST, ConfigError, ConfigMerger, is_config_file, load_config_file, yaml
 
 # Placeholder for compatibility engine integration
 # from compatibility_engine import ...
 
 CONSOLIDATED_DIR = "consolidated-service"
 REPOS_DIR = "repos"
+CONFIG_CONFLICTS_FILE = "config_merge_conflicts.json"
+# One per process: pool workers classify with their own cache
+JAVA_CLASSIFIER = JavaClassifier()
+# Copy phase: the package declaration is looked for in the first HEADER_BYTES of a file
+HEADER_BYTES = 64 * 1024
+COPY_BUFFER_BYTES = 1024 * 1024
+# First package declaration at the start of a line (optionally after a UTF-8 BOM), so a
+# "package x;" inside a comment or string further down is left alone
+PACKAGE_DECLARATION_RE = re.compile(rb'(?:^|(?<=\xef\xbb\xbf))[ \t]*(package\s+[\w.]+\s*;)', re.MULTILINE)
 
-def purge_and_scaffold():
-    # 1. Purge consolidated-service/
-    import shutil
-    if os.path.exists('consolidated-service'):
-        for filename in os.listdir('consolidated-service'):
-            file_path = os.path.join('consolidated-service', filename)
-            try:
-                if os.path.isfile(file_path) or os.path.islink(file_path):
-                    os.unlink(file_path)
-                elif os.path.isdir(file_path):
-                    shutil.rmtree(file_path)
-            except Exception as e:
-                print(f'[WARN] Failed to delete {file_path}: {e}')
-    # 2. Create ms-imce subfolder
-    target_dir = os.path.join('consolidated-service', 'ms-imce')
+@traced()
+def purge_and_scaffold(params=None, offline=False, cache_dir=DEFAULT_CACHE_DIR, consolidated_dir=CONSOLIDATED_DIR):
+    """Reset consolidated-service/ to a fresh Spring Boot scaffold in ms-imce/ (swapped in whole, see scaffold_cache).
+    The previous output's other files are carried over so the merge can skip the unchanged ones; returns
+    (target_dir, carried-over paths), to be passed to execute_merge_plan, which removes those it does not produce."""
+    params = params or DEFAULT_PARAMS
+
+    def build(staging):
+        return scaffold_into(staging, params, cache_dir, offline), carry_over(consolidated_dir, staging)
+
+    source, carried = replace_directory(consolidated_dir, build)
+    target_dir = os.path.join(consolidated_dir, params["baseDir"])
     os.makedirs(target_dir, exist_ok=True)
-    # 3. Scaffold Spring Boot app using Spring Initializr
-    print('[LOG] Downloading Spring Boot scaffold from Initializr...')
-    url = (
-        'https://start.spring.io/starter.zip?'
-        'type=gradle-project&language=java&bootVersion=3.4.0'
-        '&baseDir=ms-imce&groupId=com.imce.app&artifactId=ms-imce'
-        '&name=ms-imce&packageName=com.imce.app&javaVersion=21'
-        '&dependencies=web,data-jpa,actuator'
-    )
-    r = requests.get(url)
-    z = zipfile.ZipFile(io.BytesIO(r.content))
-    z.extractall('consolidated-service')
-    print('[LOG] Spring Boot scaffold created in consolidated-service/ms-imce/')
-    return target_dir
+    print(f'[LOG] Spring Boot scaffold ({source}) created in {target_dir}/, {len(carried)} files of the previous output kept')
+    return target_dir, [os.path.join(consolidated_dir, path) for path in carried]
 
 # Step 1: Discover microservice repos
 
 def find_microservice_repos(base_dir):
     print(f"[LOG] Scanning for microservice repos in '{base_dir}'...")
-    repos = [os.path.join(base_dir, d) for d in os.listdir(base_dir) if os.path.isdir(os.path.join(base_dir, d))]
+    repos = [os.path.join(base_dir, d) for d in sorted(os.listdir(base_dir)) if os.path.isdir(os.path.join(base_dir, d))]
     print(f"[LOG] Found {len(repos)} repos: {repos}")
     return repos
 
@@ -70,6 +79,7 @@ def extract_service_summary(repo_dir):
     # TODO: Load from analysis results, extracted_dependencies.json, etc.
     return summary
 
+@traced()
 def run_compatibility_engine():
     print("[LOG] Running compatibility-engine CLI for API and dependency conflict analysis...")
     # Use the compatibility-engine's virtual environment
@@ -129,6 +139,7 @@ def summarize_compatibility_results(compatibility_recs, max_items=10):
 
 # Step 3: LLM planning
 
+@traced()
 def generate_merge_plan(service_summaries, compatibility_recs):
     print("[LOG] Generating merge plan using LLM...")
     llm = ChatOpenAI(model="gpt-4", temperature=0)
@@ -143,7 +154,7 @@ def generate_merge_plan(service_summaries, compatibility_recs):
         "Generate a detailed, step-by-step plan to consolidate these services into a single Java microservice. "
         "Include which files to merge, how to resolve conflicts (using the compatibility-engine's recommendations), and any refactoring needed. Output the plan as a JSON checklist."
     )
-    plan = llm.invoke(prompt_text)
+    plan = traced_invoke(llm, prompt_text, model_name_of(llm))
     print("[LOG] Merge plan received from LLM.")
     # Save the full plan to a file (ensure string)
     plan_str = plan.content if isinstance(plan.content, str) else str(plan.content)
@@ -165,106 +176,240 @@ def parse_merge_plan(plan):
 
 def find_java_files(repo_path):
     """Find all Java source files in a repository."""
-    java_files = []
-    for root, dirs, files in os.walk(repo_path):
-        for file in files:
-            if file.endswith('.java'):
-                java_files.append(os.path.join(root, file))
-    return java_files
+    return get_index(repo_path).paths(kind=KIND_JAVA, under=repo_path)
 
 def extract_package_from_java(file_path):
     """Extract package declaration from a Java file."""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-            package_match = re.search(r'package\s+([\w\.]+)\s*;', content)
-            if package_match:
-                return package_match.group(1)
+        content = read_text(file_path)
+        package_match = re.search(r'package\s+([\w\.]+)\s*;', content)
+        if package_match:
+            return package_match.group(1)
     except Exception as e:
         print(f"[WARN] Could not read {file_path}: {e}")
     return None
 
 def classify_java_file(file_path, content=None):
-    """Classify Java file into Spring Boot package categories."""
+    """Classify Java file into Spring Boot package categories (see java_classifier)."""
     if content is None:
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = read_text(file_path)
         except:
             return 'other'
-    
-    filename = os.path.basename(file_path).lower()
-    content_lower = content.lower()
-    
-    # Spring Boot main application
-    if '@springbootapplication' in content_lower:
-        return 'main'
-    # Controllers
-    elif '@controller' in content_lower or '@restcontroller' in content_lower:
-        return 'controller'
-    # Services
-    elif '@service' in content_lower or 'service' in filename:
-        return 'service'
-    # Repositories
-    elif '@repository' in content_lower or 'repository' in filename or 'dao' in filename:
-        return 'repository'
-    # Entities/Models
-    elif '@entity' in content_lower or '@document' in content_lower or 'model' in filename or 'entity' in filename:
-        return 'model'
-    # Configuration
-    elif '@configuration' in content_lower or 'config' in filename:
-        return 'config'
-    # DTOs
-    elif 'dto' in filename or 'request' in filename or 'response' in filename:
-        return 'dto'
-    # Exceptions
-    elif 'exception' in filename or 'error' in filename:
-        return 'exception'
-    # Utilities
-    elif 'util' in filename or 'helper' in filename:
-        return 'util'
-    # Tests
-    elif 'test' in filename:
-        return 'test'
-    else:
-        return 'other'
+    return JAVA_CLASSIFIER.classify(file_path, content)
 
 def find_resource_files(repo_path):
     """Find all resource files (properties, yml, xml, etc.)."""
     resource_files = []
-    resource_extensions = ['.properties', '.yml', '.yaml', '.xml', '.json', '.sql']
-    
-    for root, dirs, files in os.walk(repo_path):
+    for resource in get_index(repo_path).files(kind=KIND_RESOURCE, under=repo_path):
         # Look specifically in resources directories
+        root = os.path.join(repo_path, os.path.relpath(os.path.dirname(resource.path), os.path.abspath(repo_path)))
         if 'resources' in root or 'config' in root:
-            for file in files:
-                if any(file.endswith(ext) for ext in resource_extensions):
-                    resource_files.append(os.path.join(root, file))
+            resource_files.append(resource.path)
     return resource_files
 
-def merge_properties_files(source_files, target_path):
-    """Merge multiple .properties files intelligently."""
-    merged_content = []
-    merged_content.append("# Merged configuration from multiple microservices")
-    merged_content.append("# Generated by iMCE consolidation orchestrator")
-    merged_content.append("")
-    
-    for source_file in source_files:
+@traced()
+def merge_config_files(repo_configs, target_dir, strategy=STRATEGY_FIRST):
+    """Merge the services' parsed configuration files key by key into target_dir and report conflicting keys.
+    Returns the paths of the merged files."""
+    merger = ConfigMerger(strategy)
+    for repo, configs in repo_configs:
+        for config in configs:
+            merger.add(repo, config)
+    written = merger.write(target_dir)
+    for conflict in merger.conflicts[:10]:
+        values = "; ".join(f"{', '.join(os.path.basename(s) for s in v['services'])}={v['value']!r}" for v in conflict["values"])
+        print(f"[WARN] Config conflict {conflict['file']} {conflict['key']}: {values}")
+    if len(merger.conflicts) > 10:
+        print(f"[WARN] ... {len(merger.conflicts) - 10} more config conflicts")
+    with open(CONFIG_CONFLICTS_FILE, "w") as f:
+        json.dump(merger.conflicts, f, indent=2)
+    print(merger.report())
+    print(f"[LOG] Wrote {len(written)} merged config files; conflicts in {CONFIG_CONFLICTS_FILE}")
+    return written
+
+@traced()
+def plan_repo_merge(repo):
+    """Read and classify one repository's files (runs in a worker process).
+    Returns {'java': [(source, file_type, new_package, old_package)], 'resources': [...], 'config': [ConfigFile],
+    'errors': [...]}; the rewrite itself happens later, when the file is copied."""
+    plan = {"java": [], "resources": [], "config": [], "errors": []}
+    for resource_file in find_resource_files(repo):
+        if is_config_file(resource_file):
+            try:
+                plan["config"].append(load_config_file(resource_file))
+                continue
+            except (ConfigError, OSError) as e:
+                plan["errors"].append(f"Could not merge {resource_file} by key ({e}); copying it as is")
+        plan["resources"].append(resource_file)
+    for java_file in find_java_files(repo):
         try:
-            with open(source_file, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                if content:
-                    merged_content.append(f"# === From {source_file} ===")
-                    merged_content.append(content)
-                    merged_content.append("")
+            content = get_index(repo).read(java_file)
+            
+            # Classify the file
+            file_type = classify_java_file(java_file, content)
+            if file_type == 'main':
+                plan["java"].append((java_file, file_type, None, None))
+                continue
+            
+            # Package declaration to match new structure
+            new_package = "com.imce.app" if file_type == 'test' else f"com.imce.app.{file_type}"
+            package_match = PACKAGE_RE.search(content)
+            plan["java"].append((java_file, file_type, new_package, package_match.group(2) if package_match else ""))
         except Exception as e:
-            print(f"[WARN] Could not read {source_file}: {e}")
-    
-    os.makedirs(os.path.dirname(target_path), exist_ok=True)
-    with open(target_path, 'w', encoding='utf-8') as f:
-        f.write('\n'.join(merged_content))
+            plan["errors"].append(f"Failed to process {java_file}: {e}")
+    return plan
+
+COUNTERS = ("files", "written", "unchanged", "failed", "bytes_read", "bytes_written")
+
+class MergeStats:
+    """Throughput counters for the copy/rewrite phase of execute_merge_plan (updated from I/O threads)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.files = 0
+        self.written = 0
+        self.unchanged = 0
+        self.failed = 0
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def record(self, bytes_read, bytes_written):
+        with self.lock:
+            self.files += 1
+            self.bytes_read += bytes_read
+            self.bytes_written += bytes_written
+            if bytes_written:
+                self.written += 1
+            else:
+                self.unchanged += 1
 
-def execute_merge_plan(merge_plan, repos, consolidated_dir):
+    def record_failure(self):
+        with self.lock:
+            self.failed += 1
+
+    def counts(self):
+        return {name: getattr(self, name) for name in COUNTERS}
+
+    def absorb(self, counts):
+        """Add the counters of a copy batch that ran in a worker process."""
+        with self.lock:
+            for name in COUNTERS:
+                setattr(self, name, getattr(self, name) + counts[name])
+
+    def report(self):
+        seconds = max(time.perf_counter() - self.started, 1e-9)
+        return (f"[LOG] Copied {self.files} files ({self.written} written, {self.unchanged} unchanged, {self.failed} failed) "
+                f"in {seconds:.2f}s: {self.files / seconds:.0f} files/s, "
+                f"{self.bytes_read / seconds / 1e6:.1f} MB/s read, {self.bytes_written / seconds / 1e6:.1f} MB/s written")
+
+def _same_content(target, size, chunks):
+    """True if target has exactly `size` bytes and the same sha256 as the concatenated chunks."""
+    if not os.path.isfile(target) or os.path.getsize(target) != size:
+        return False
+    expected = hashlib.sha256()
+    for chunk in chunks:
+        expected.update(chunk)
+    actual = hashlib.sha256()
+    with open(target, 'rb') as f:
+        for block in iter(lambda: f.read(COPY_BUFFER_BYTES), b''):
+            actual.update(block)
+    return expected.digest() == actual.digest()
+
+def _rest_of(f):
+    return iter(lambda: f.read(COPY_BUFFER_BYTES), b'')
+
+def rewrite_java_file(source, target, new_package, relocation=None, old_package=""):
+    """Copy a Java file to target with its package declaration replaced. With a relocation,
+    imports and references to moved types are rewritten too, which needs the whole file;
+    without one only the header block is rewritten and the rest is streamed.
+    An identical target is left untouched. Returns (bytes_read, bytes_written)."""
+    if relocation is not None:
+        with open(source, 'rb') as f:
+            data = f.read()
+        own = os.path.splitext(os.path.basename(source))[0]
+        text = relocation.rewrite(data.decode('utf-8', errors='surrogateescape'), old_package, own, new_package)
+        out = text.encode('utf-8', errors='surrogateescape')
+        if _same_content(target, len(out), [out]):
+            return len(data), 0
+        with open(target, 'wb') as f:
+            f.write(out)
+        return len(data), len(out)
+    size = os.path.getsize(source)
+    with open(source, 'rb') as f:
+        header = f.read(HEADER_BYTES)
+        match = PACKAGE_DECLARATION_RE.search(header)
+        if match is None and len(header) == HEADER_BYTES:
+            # No declaration in the first block (very long license header): take the whole file
+            header += f.read()
+            match = PACKAGE_DECLARATION_RE.search(header)
+        consumed = f.tell()
+        if match is not None:
+            header = header[:match.start(1)] + f"package {new_package};".encode('utf-8') + header[match.end(1):]
+        out_size = size - consumed + len(header)
+        if _same_content(target, out_size, itertools.chain([header], _rest_of(f))):
+            return size, 0
+        f.seek(consumed)
+        with open(target, 'wb') as out:
+            out.write(header)
+            shutil.copyfileobj(f, out, COPY_BUFFER_BYTES)
+    return size, out_size
+
+def copy_resource_file(source, target):
+    """Copy a resource file unless target already has the same content. Returns (bytes_read, bytes_written)."""
+    size = os.path.getsize(source)
+    with open(source, 'rb') as f:
+        if _same_content(target, size, _rest_of(f)):
+            return size, 0
+    shutil.copy2(source, target)
+    return size, size
+
+@traced()
+def copy_repo_files(batch):
+    """Copy one repository's files (runs in a worker process; the copies themselves go
+    through a thread pool). Returns the batch's MergeStats counters."""
+    stats = MergeStats()
+    with ThreadPoolExecutor(max_workers=batch["io_workers"]) as pool:
+        futures = {}
+        for source, target, new_package, old_package in batch["java"]:
+            future = pool.submit(rewrite_java_file, source, target, new_package, batch["relocation"], old_package)
+            futures[future] = (source, target)
+        for source, target in batch["resources"]:
+            futures[pool.submit(copy_resource_file, source, target)] = (source, target)
+        for future in as_completed(futures):
+            source, target = futures[future]
+            try:
+                stats.record(*future.result())
+            except Exception as e:
+                stats.record_failure()
+                print(f"[ERROR] Failed to copy {source} -> {target}: {e}")
+                # Do not leave a carried-over copy of an earlier run in place
+                if os.path.exists(target):
+                    os.unlink(target)
+    return stats.counts()
+
+def remove_stale_files(previous_files, targets):
+    """Delete the files carried over from the previous output that this merge did not produce,
+    and the directories that leaves empty. Returns how many files were removed."""
+    targets = {os.path.abspath(t) for t in targets}
+    removed = 0
+    for path in previous_files:
+        if os.path.abspath(path) in targets or not os.path.lexists(path):
+            continue
+        os.unlink(path)
+        removed += 1
+        try:
+            os.removedirs(os.path.dirname(path))
+        except OSError:
+            pass  # not empty
+    return removed
+
+@traced()
+def execute_merge_plan(merge_plan, repos, consolidated_dir, jobs=1, io_workers=None, relocate=True,
+                       config_strategy=STRATEGY_FIRST, previous_files=()):
+    """Copy and merge the repositories into consolidated_dir and return the copy phase's MergeStats.
+    previous_files are the files purge_and_scaffold carried over; those not produced again are removed."""
     print("[LOG] Executing merge plan...")
     
     # Package structure for consolidated service
@@ -288,87 +433,84 @@ def execute_merge_plan(merge_plan, repos, consolidated_dir):
     
     for dir_path in package_dirs.values():
         os.makedirs(dir_path, exist_ok=True)
+    os.makedirs(target_resources_dir, exist_ok=True)
+    
+    # Reading and classifying runs per repository in parallel; target names are assigned in
+    # repo order so duplicate renames are the same on every run
+    repo_plans = [o.result for o in run_per_repo(plan_repo_merge, repos, jobs=jobs, label="plan")]
     
     # Process each repository
-    all_properties_files = []
+    repo_configs = []
     file_counter = {}  # Track duplicate filenames
+    claimed_resources = set()
+    batches = []
     
-    for repo in repos:
+    # Every target name is assigned before anything is copied, so the relocation map of a
+    # repository is complete when its files are rewritten
+    for repo, repo_plan in zip(repos, repo_plans):
         print(f"[LOG] Processing repository: {repo}")
+        batch = {"java": [], "resources": [], "relocation": Relocation() if relocate else None, "io_workers": io_workers}
+        batches.append(batch)
+        if repo_plan is None:
+            continue
+        for error in repo_plan["errors"]:
+            print(f"[ERROR] {error}")
         
         # Process Java files
-        java_files = find_java_files(repo)
-        for java_file in java_files:
-            try:
-                with open(java_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Classify the file
-                file_type = classify_java_file(java_file, content)
-                filename = os.path.basename(java_file)
-                
-                # Skip main application files (we already have one)
-                if file_type == 'main':
-                    print(f"[LOG] Skipping main application file: {java_file}")
-                    continue
-                
-                # Handle duplicate filenames
-                base_name = os.path.splitext(filename)[0]
-                if filename in file_counter:
-                    file_counter[filename] += 1
-                    new_filename = f"{base_name}_{file_counter[filename]}.java"
-                    print(f"[LOG] Renaming duplicate {filename} -> {new_filename}")
-                    filename = new_filename
-                else:
-                    file_counter[filename] = 1
-                
-                # Determine target directory
-                target_dir = package_dirs.get(file_type, package_dirs['other'])
-                target_file = os.path.join(target_dir, filename)
-                
-                # Update package declaration to match new structure
-                new_package = f"com.imce.app.{file_type}" if file_type != 'main' else "com.imce.app"
-                if file_type == 'test':
-                    new_package = "com.imce.app"
-                
-                # Replace package declaration
-                updated_content = re.sub(
-                    r'package\s+[\w\.]+\s*;',
-                    f'package {new_package};',
-                    content
-                )
-                
-                # Write the file
-                with open(target_file, 'w', encoding='utf-8') as f:
-                    f.write(updated_content)
-                
-                print(f"[LOG] Copied and organized: {java_file} -> {target_file}")
-                
-            except Exception as e:
-                print(f"[ERROR] Failed to process {java_file}: {e}")
-        
-        # Collect resource files
-        resource_files = find_resource_files(repo)
-        for resource_file in resource_files:
-            if resource_file.endswith('.properties'):
-                all_properties_files.append(resource_file)
+        for java_file, file_type, new_package, old_package in repo_plan["java"]:
+            filename = os.path.basename(java_file)
+            
+            # Skip main application files (we already have one)
+            if file_type == 'main':
+                print(f"[LOG] Skipping main application file: {java_file}")
+                continue
+            
+            # Handle duplicate filenames
+            base_name = os.path.splitext(filename)[0]
+            new_base_name = base_name
+            if filename in file_counter:
+                file_counter[filename] += 1
+                new_base_name = f"{base_name}_{file_counter[filename]}"
+                new_filename = f"{new_base_name}.java"
+                print(f"[LOG] Renaming duplicate {filename} -> {new_filename}")
+                filename = new_filename
             else:
-                # Copy other resource files directly
-                filename = os.path.basename(resource_file)
-                target_file = os.path.join(target_resources_dir, filename)
-                
-                if not os.path.exists(target_file):
-                    try:
-                        shutil.copy2(resource_file, target_file)
-                        print(f"[LOG] Copied resource: {resource_file} -> {target_file}")
-                    except Exception as e:
-                        print(f"[ERROR] Failed to copy {resource_file}: {e}")
+                file_counter[filename] = 1
+            
+            # Determine target directory
+            target_dir = package_dirs.get(file_type, package_dirs['other'])
+            target_file = os.path.join(target_dir, filename)
+            if relocate:
+                batch["relocation"].add(old_package, base_name, new_package, new_base_name)
+            batch["java"].append((java_file, target_file, new_package, old_package))
+        
+        # Configuration files are merged by key below; other resources are copied directly
+        repo_configs.append((repo, repo_plan["config"]))
+        for resource_file in repo_plan["resources"]:
+            # The first repository providing a name wins
+            filename = os.path.basename(resource_file)
+            target_file = os.path.join(target_resources_dir, filename)
+            if filename in claimed_resources:
+                continue
+            claimed_resources.add(filename)
+            batch["resources"].append((resource_file, target_file))
+    
+    # Rewriting is CPU work, so repositories are copied in worker processes; each one streams
+    # its files through a thread pool
+    stats = MergeStats()
+    for outcome in run_per_repo(copy_repo_files, repos, jobs=jobs, label="copy", items=batches):
+        if outcome.ok:
+            stats.absorb(outcome.result)
+    print(stats.report())
     
-    # Merge all properties files
-    if all_properties_files:
-        target_properties = os.path.join(target_resources_dir, 'application.properties')
-        merge_properties_files(all_properties_files, target_properties)
-        print(f"[LOG] Merged {len(all_properties_files)} properties files -> {target_properties}")
+    # Merge configuration files key by key
+    if yaml is None:
+        print("[WARN] PyYAML is not installed: application/bootstrap .yml files are copied, not merged")
+    targets = [target for batch in batches for _, target, *_ in batch["java"] + batch["resources"]]
+    if any(configs for _, configs in repo_configs):
+        targets += merge_config_files(repo_configs, target_resources_dir, config_strategy)
+    if previous_files:
+        print(f"[LOG] Removed {remove_stale_files(previous_files, targets)} files of the previous output that were not merged again")
     
     print("[LOG] Merge execution complete.")
     print(f"[LOG] Consolidated Spring Boot application structure created in: {consolidated_dir}")
@@ -378,15 +520,17 @@ def execute_merge_plan(merge_plan, repos, consolidated_dir):
             file_count = len([f for f in os.listdir(pkg_dir) if f.endswith('.java')])
             if file_count > 0:
                 print(f"  - {pkg_type}: {file_count} files")
+    return stats
 
 # Main orchestration
 
-def main():
+def main(jobs=1, relocate=True, config_strategy=STRATEGY_FIRST, offline=False, scaffold_cache_dir=DEFAULT_CACHE_DIR):
     print("[LOG] Starting iMCE consolidation orchestrator...")
     # os.makedirs(CONSOLIDATED_DIR, exist_ok=True) # This line is removed as consolidation_dir is now scaffolded
-    target_dir = purge_and_scaffold()
+    target_dir, previous_files = purge_and_scaffold(offline=offline, cache_dir=scaffold_cache_dir)
     repos = find_microservice_repos(REPOS_DIR)
-    service_summaries = [extract_service_summary(r) for r in repos]
+    service_summaries = [o.result for o in run_per_repo(extract_service_summary, repos, jobs=jobs, label="summary")
+                         if o.ok and o.result is not None]
     print("[LOG] Generating live service structure visualization...")
     mermaid_str = generate_service_structure_mermaid(service_summaries)
     write_mermaid_to_markdown(mermaid_str)
@@ -398,8 +542,26 @@ def main():
     print("\n--- Merge Plan (Step-by-step) ---\n")
     with open("consolidation_merge_plan.json") as f:
         merge_plan = json.load(f)
-    execute_merge_plan(merge_plan, repos, consolidated_dir=target_dir)
+    execute_merge_plan(merge_plan, repos, consolidated_dir=target_dir, jobs=jobs, relocate=relocate,
+                       config_strategy=config_strategy, previous_files=previous_files)
     print("[LOG] Consolidation orchestrator run complete.")
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="iMCE consolidation orchestrator")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="Repositories to process in parallel (worker processes)")
+    parser.add_argument("--no-relocate", action="store_true",
+                        help="Only rewrite package declarations; leave imports and references to moved classes as they are")
+    parser.add_argument("--config-strategy", choices=STRATEGIES, default=STRATEGY_FIRST,
+                        help="Keys set to different values by several services: keep the first value (first), also keep "
+                             "every value as <service>.<key> (namespace), or move each value to a per-service profile (profile)")
+    parser.add_argument("--offline", action="store_true",
+                        help="Never contact start.spring.io; use a cached or the bundled Spring Boot scaffold")
+    parser.add_argument("--scaffold-cache-dir", default=DEFAULT_CACHE_DIR, help="Directory for cached Initializr templates")
+    parser.add_argument("--trace", help="Write spans and LLM call metrics (this run and the compatibility-engine runs it starts) "
+                                        "to this JSON Lines file and print a summary table at the end")
+    parser.add_argument("--progress", action="store_true", help="Show a live progress bar with an ETA for LLM calls")
+    args = parser.parse_args()
+    if args.trace or args.progress:
+        configure_tracing(args.trace, args.progress)
+    main(jobs=args.jobs, relocate=not args.no_relocate, config_strategy=args.config_strategy,
+         offline=args.offline, scaffold_cache_dir=args.scaffold_cache_dir) 
\ No newline at end of file
@@ -0,0 +1,166 @@
+import os
+import re
+import hashlib
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+
+# Classifies Java sources into the consolidated service's package categories from their
+# top-level declaration instead of substring scans over the whole file: the file is tokenized
+# only up to the '{' of its first type declaration (comments and string literals skipped),
+# and the decision uses that type's annotations, kind, supertypes and name. Results are cached
+# by content hash, so identical files (copied utilities, generated code) are classified once.
+
+TOKEN_RE = re.compile(r'''
+    //[^\n]*|/\*.*?\*/|"""(?:\\.|[^\\])*?"""|"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])+'
+  | (?P<name>(?:@[ \t]*)?[A-Za-z_$][\w$]*(?:[ \t]*\.[ \t]*[A-Za-z_$][\w$]*)*)
+  | (?P<punct>[(){};<>])
+''', re.VERBOSE | re.DOTALL)
+# Leading whitespace, comments and package/import statements, skipped in one regex match
+HEADER_RE = re.compile(r'(?:\s+|//[^\n]*|/\*.*?\*/|(?:package|import)\b[^;]*;)*', re.DOTALL)
+TYPE_KEYWORDS = {"class", "interface", "enum", "record"}
+CACHE_SIZE = 100_000
+
+MAIN_ANNOTATIONS = {"SpringBootApplication"}
+TEST_ANNOTATIONS = {
+    "SpringBootTest", "WebMvcTest", "DataJpaTest", "DataMongoTest", "WebFluxTest", "JsonTest", "RestClientTest",
+    "ExtendWith", "RunWith", "TestConfiguration", "AutoConfigureMockMvc", "Testcontainers",
+}
+ANNOTATION_CATEGORIES = [
+    ({"RestControllerAdvice", "ControllerAdvice"}, "exception"),
+    ({"RestController", "Controller"}, "controller"),
+    ({"Service"}, "service"),
+    ({"Repository"}, "repository"),
+    ({"Entity", "Document", "Table", "Embeddable", "MappedSuperclass"}, "model"),
+    ({"Configuration", "ConfigurationProperties"}, "config"),
+]
+REPOSITORY_SUPERTYPES = {
+    "Repository", "CrudRepository", "ListCrudRepository", "PagingAndSortingRepository", "JpaRepository",
+    "MongoRepository", "ReactiveCrudRepository", "ReactiveMongoRepository", "JpaSpecificationExecutor",
+}
+# CamelCase name suffixes, checked in order (longest/most specific first)
+NAME_SUFFIXES = [
+    ("Controller", "controller"),
+    ("ServiceImpl", "service"), ("Service", "service"),
+    ("RepositoryImpl", "repository"), ("Repository", "repository"), ("DaoImpl", "repository"), ("Dao", "repository"),
+    ("DTO", "dto"), ("Dto", "dto"), ("Request", "dto"), ("Response", "dto"), ("Payload", "dto"),
+    ("Entity", "model"), ("Model", "model"),
+    ("Configuration", "config"), ("Config", "config"), ("Properties", "config"),
+    ("Exception", "exception"), ("Error", "exception"), ("ExceptionHandler", "exception"),
+    ("Utils", "util"), ("Util", "util"), ("Helper", "util"), ("Helpers", "util"),
+]
+TEST_NAME_SUFFIXES = ("Test", "Tests", "IT", "TestCase")
+
+
+class JavaDeclaration(NamedTuple):
+    kind: Optional[str]  # class / interface / enum / record / @interface, None if no type was found
+    name: Optional[str]
+    annotations: Tuple[str, ...]  # simple names of the annotations on the type
+    supertypes: Tuple[str, ...]  # simple names in extends / implements
+
+
+def _simple(name: str) -> str:
+    return re.sub(r"\s+", "", name).rsplit(".", 1)[-1]
+
+
+def scan_declaration(content: str) -> JavaDeclaration:
+    """Tokenize up to the body of the first top-level type declaration."""
+    annotations, supertypes = [], []
+    kind = name = None
+    depth = 0  # parentheses of annotation arguments / record components
+    generics = 0  # type parameters and arguments
+    for match in TOKEN_RE.finditer(content, HEADER_RE.match(content).end()):
+        group = match.lastgroup
+        if group is None:
+            continue
+        token = match.group(group)
+        if group == "punct":
+            if token == "(":
+                depth += 1
+            elif token == ")":
+                depth = max(depth - 1, 0)
+            elif token == "<":
+                generics += 1
+            elif token == ">":
+                generics = max(generics - 1, 0)
+            elif token == "{" and depth == 0 and kind is not None:
+                break
+            continue
+        if depth or generics:
+            continue
+        if token.startswith("@"):
+            simple = _simple(token[1:])
+            if simple == "interface":
+                kind = "@interface"
+            elif kind is None:
+                annotations.append(simple)
+        elif kind is None and token in TYPE_KEYWORDS:
+            kind = token
+        elif kind is not None and name is None:
+            name = token
+        elif kind is not None and token not in ("extends", "implements", "permits"):
+            supertypes.append(_simple(token))
+    return JavaDeclaration(kind, name, tuple(annotations), tuple(supertypes))
+
+
+def classify_declaration(declaration: JavaDeclaration, file_name: str, in_test_tree: bool = False) -> str:
+    name = declaration.name or os.path.splitext(file_name)[0]
+    annotations = set(declaration.annotations)
+    if annotations & MAIN_ANNOTATIONS:
+        return "main"
+    if in_test_tree or annotations & TEST_ANNOTATIONS or name.endswith(TEST_NAME_SUFFIXES):
+        return "test"
+    for names, category in ANNOTATION_CATEGORIES:
+        if annotations & names:
+            return category
+    if any(a.startswith("Enable") for a in annotations):
+        return "config"
+    supertypes = set(declaration.supertypes)
+    if declaration.kind == "interface" and supertypes & REPOSITORY_SUPERTYPES:
+        return "repository"
+    if any(s.endswith(("Exception", "Error")) or s == "Throwable" for s in supertypes):
+        return "exception"
+    for suffix, category in NAME_SUFFIXES:
+        if name.endswith(suffix):
+            return category
+    if declaration.kind == "record":
+        return "dto"
+    return "other"
+
+
+def is_test_tree(path: str) -> bool:
+    parts = os.path.normpath(path).split(os.sep)
+    return any(parts[i] == "src" and parts[i + 1] == "test" for i in range(len(parts) - 1))
+
+
+class JavaClassifier:
+    """Declaration-based classifier with a bounded cache keyed by content hash (plus the file name and test-tree flag)."""
+
+    def __init__(self, cache_size: int = CACHE_SIZE):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[bytes, str, bool], str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def classify(self, path: str, content: str) -> str:
+        file_name = os.path.basename(path)
+        in_test_tree = is_test_tree(path)
+        key = (hashlib.blake2b(content.encode("utf-8", "surrogateescape"), digest_size=16).digest(), file_name, in_test_tree)
+        category = self._cache.get(key)
+        if category is not None:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return category
+        self.misses += 1
+        category = classify_declaration(scan_declaration(content), file_name, in_test_tree)
+        self._cache[key] = category
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return category
+
+    def clear(self):
+        self._cache.clear()
+        self.hits = self.misses = 0
+
+    def report(self) -> str:
+        total = self.hits + self.misses
+        return f"Java classifier: {total} files, {self.hits} cache hits, {self.misses} scanned"
@@ -0,0 +1,176 @@
+import os
+import json
+import shutil
+import hashlib
+import zipfile
+from typing import List
+from urllib.parse import urlencode
+
+import requests
+
+# Spring Boot scaffold for the consolidated service. Initializr zips are cached on disk keyed
+# by the request parameters, so a run downloads a template at most once; without network (or
+# with --offline) the template bundled in scaffold_template/ is used instead. The bundled copy
+# matches DEFAULT_PARAMS minus the Gradle wrapper, so build it with an installed Gradle.
+#
+# The output directory is rebuilt next to the old one and swapped in with two renames, so it
+# is never seen half-purged and a failed scaffold leaves the previous output in place. Files of
+# the previous output that the scaffold does not provide are hard-linked into the new tree
+# (carry_over), so a re-run finds its unchanged files in place and does not write them again.
+
+INITIALIZR_URL = "https://start.spring.io/starter.zip"
+DEFAULT_PARAMS = {
+    "type": "gradle-project",
+    "language": "java",
+    "bootVersion": "3.4.0",
+    "baseDir": "ms-imce",
+    "groupId": "com.imce.app",
+    "artifactId": "ms-imce",
+    "name": "ms-imce",
+    "packageName": "com.imce.app",
+    "javaVersion": "21",
+    "dependencies": "web,data-jpa,actuator",
+}
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".scaffold_cache")
+BUNDLED_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scaffold_template")
+DOWNLOAD_TIMEOUT_SECONDS = 30
+
+
+def template_key(params: dict) -> str:
+    """Cache key of an Initializr request; dependency order does not matter."""
+    normalized = dict(params)
+    normalized["dependencies"] = ",".join(sorted(d.strip() for d in params.get("dependencies", "").split(",") if d.strip()))
+    return hashlib.sha256(json.dumps(normalized, sort_keys=True).encode("utf-8")).hexdigest()[:24]
+
+
+def cached_template(params: dict, cache_dir: str = DEFAULT_CACHE_DIR) -> str:
+    return os.path.join(cache_dir, f"{template_key(params)}.zip")
+
+
+def download_template(params: dict, cache_dir: str = DEFAULT_CACHE_DIR, timeout: float = DOWNLOAD_TIMEOUT_SECONDS) -> str:
+    """Download an Initializr zip into the cache (atomically) and return its path."""
+    path = cached_template(params, cache_dir)
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with requests.get(f"{INITIALIZR_URL}?{urlencode(params)}", stream=True, timeout=timeout) as response:
+            response.raise_for_status()
+            with open(tmp_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=1024 * 1024):
+                    f.write(chunk)
+        with zipfile.ZipFile(tmp_path) as z:
+            verify_zip(z)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+    with open(os.path.join(cache_dir, f"{template_key(params)}.json"), "w") as f:
+        json.dump(params, f, indent=2)
+    return path
+
+
+def verify_zip(z: zipfile.ZipFile):
+    bad = z.testzip()
+    if bad is not None:
+        raise zipfile.BadZipFile(f"corrupt member {bad}")
+
+
+def discard_template(params: dict, cache_dir: str = DEFAULT_CACHE_DIR):
+    for path in (cached_template(params, cache_dir), os.path.join(cache_dir, f"{template_key(params)}.json")):
+        if os.path.exists(path):
+            os.unlink(path)
+
+
+def extract_template(zip_path: str, target_dir: str):
+    """
+    Extract straight from the cached zip, keeping executable bits (gradlew) that extractall drops.
+    A corrupt or truncated zip raises BadZipFile before anything is written.
+    """
+    with zipfile.ZipFile(zip_path) as z:
+        verify_zip(z)
+        for member in z.infolist():
+            extracted = z.extract(member, target_dir)
+            mode = (member.external_attr >> 16) & 0o777
+            if mode and not member.is_dir():
+                os.chmod(extracted, mode)
+
+
+def scaffold_into(target_dir: str, params: dict, cache_dir: str = DEFAULT_CACHE_DIR, offline: bool = False) -> str:
+    """Write the scaffold into target_dir; returns where it came from (cache, download or bundled)."""
+    path = cached_template(params, cache_dir)
+    if os.path.exists(path):
+        try:
+            extract_template(path, target_dir)
+            return "cache"
+        except zipfile.BadZipFile as e:
+            # A corrupt cache entry is dropped and handled like a cache miss
+            print(f"[WARN] Cached scaffold {path} is unreadable ({e}); discarding it")
+            discard_template(params, cache_dir)
+    if not offline:
+        path = None
+        try:
+            print("[LOG] Downloading Spring Boot scaffold from Initializr...")
+            path = download_template(params, cache_dir)
+        except (requests.RequestException, OSError, zipfile.BadZipFile) as e:
+            print(f"[WARN] Initializr download failed ({e}); using the bundled template")
+        if path is not None:
+            extract_template(path, target_dir)
+            return "download"
+    if params != DEFAULT_PARAMS:
+        print("[WARN] The bundled template is built for the default Initializr parameters")
+    shutil.copytree(BUNDLED_TEMPLATE_DIR, target_dir, dirs_exist_ok=True)
+    return "bundled"
+
+
+def carry_over(previous_dir: str, staging_dir: str) -> List[str]:
+    """
+    Hard-link the files of previous_dir that staging_dir does not have into staging_dir (copying
+    where links are not supported). Returns the carried-over paths, relative to staging_dir.
+    Nothing in previous_dir is modified; it is only replaced once the new tree is swapped in.
+    """
+    carried = []
+    if not os.path.isdir(previous_dir):
+        return carried
+    for root, _, files in os.walk(previous_dir):
+        relative_root = os.path.relpath(root, previous_dir)
+        for name in files:
+            relative = os.path.normpath(os.path.join(relative_root, name))
+            target = os.path.join(staging_dir, relative)
+            if os.path.lexists(target):
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            try:
+                os.link(os.path.join(root, name), target)
+            except OSError:
+                shutil.copy2(os.path.join(root, name), target)
+            carried.append(relative)
+    return carried
+
+
+def replace_directory(output_dir: str, build):
+    """
+    Rebuild output_dir with build(staging_dir) in a sibling directory, then swap it in.
+    The old tree is only deleted after the swap; if build fails the old output is untouched.
+    """
+    output_dir = os.path.abspath(output_dir)
+    staging = f"{output_dir}.new-{os.getpid()}"
+    retired = f"{output_dir}.old-{os.getpid()}"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    try:
+        result = build(staging)
+    except BaseException:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+    had_output = os.path.exists(output_dir)
+    if had_output:
+        os.rename(output_dir, retired)
+    try:
+        os.rename(staging, output_dir)
+    except OSError:
+        if had_output:
+            os.rename(retired, output_dir)
+        raise
+    if had_output:
+        shutil.rmtree(retired, ignore_errors=True)
+    return result
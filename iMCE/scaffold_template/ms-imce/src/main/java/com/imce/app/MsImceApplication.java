@@ -0,0 +1,13 @@
+package com.imce.app;
+
+import org.springframework.boot.SpringApplication;
+import org.springframework.boot.autoconfigure.SpringBootApplication;
+
+@SpringBootApplication
+public class MsImceApplication {
+
+	public static void main(String[] args) {
+		SpringApplication.run(MsImceApplication.class, args);
+	}
+
+}
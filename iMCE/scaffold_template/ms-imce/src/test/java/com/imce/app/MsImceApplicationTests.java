@@ -0,0 +1,13 @@
+package com.imce.app;
+
+import org.junit.jupiter.api.Test;
+import org.springframework.boot.test.context.SpringBootTest;
+
+@SpringBootTest
+class MsImceApplicationTests {
+
+	@Test
+	void contextLoads() {
+	}
+
+}
@@ -0,0 +1,154 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Relocation of Java types moved by the merge: every class gets a new package (and, for
+# duplicate file names, a new simple name like Foo_2), so imports, fully qualified references
+# and simple-name references in every copied file have to follow.
+#
+# One Relocation holds the moves of one repository, since a file only refers to types of its
+# own service. Fully qualified names are kept in a trie keyed by name segment. A file is
+# scanned once with a single tokenizer regex (comments and string literals are skipped), and
+# each qualified name is looked up segment by segment in the trie, so the rewrite is linear in
+# the size of the source no matter how many types are relocated.
+
+TOKEN_RE = re.compile(r'''
+    (?P<skip>//[^\n]*|/\*.*?\*/|"""(?:\\.|[^\\])*?"""|"(?:\\.|[^"\\\n])*"|'(?:\\.|[^'\\\n])+')
+  | (?P<name>[A-Za-z_$][\w$]*(?:\.[A-Za-z_$][\w$]*)*)
+''', re.VERBOSE | re.DOTALL)
+PACKAGE_RE = re.compile(r'(?:^|(?<=\ufeff))[ \t]*(package\s+([\w.]+)\s*;)[ \t]*\n?', re.MULTILINE)
+IMPORT_RE = re.compile(r'^[ \t]*import\s+(static\s+)?([\w$.]+?)(\.\*)?\s*;[ \t]*\n?', re.MULTILINE)
+# Marks the end of a fully qualified name in a trie node (segments are never empty)
+TERMINAL = ""
+
+
+class Relocation:
+    def __init__(self):
+        # old FQN -> (new package, new simple name)
+        self.types: Dict[str, Tuple[str, str]] = {}
+        # old package -> {simple name: old FQN}
+        self.packages: Dict[str, Dict[str, str]] = {}
+        self._trie: Dict = {}
+
+    def add(self, old_package: str, simple: str, new_package: str, new_simple: Optional[str] = None):
+        old_fqn = f"{old_package}.{simple}" if old_package else simple
+        self.types[old_fqn] = (new_package, new_simple or simple)
+        self.packages.setdefault(old_package, {})[simple] = old_fqn
+        if old_package:
+            node = self._trie
+            for segment in old_fqn.split("."):
+                node = node.setdefault(segment, {})
+            node[TERMINAL] = old_fqn
+
+    def new_fqn(self, old_fqn: str) -> str:
+        new_package, new_simple = self.types[old_fqn]
+        return f"{new_package}.{new_simple}" if new_package else new_simple
+
+    def match(self, segments: List[str]) -> Tuple[int, Optional[str]]:
+        """Longest relocated FQN that is a prefix of segments, as (segment count, old FQN)."""
+        node, best = self._trie, (0, None)
+        for i, segment in enumerate(segments):
+            node = node.get(segment)
+            if node is None:
+                break
+            if TERMINAL in node:
+                best = (i + 1, node[TERMINAL])
+        return best
+
+    def _simple_names(self, old_package: str, own: str, imports: List[Tuple[str, str, bool]]) -> Dict[str, Tuple[str, bool]]:
+        """
+        Simple name -> (old FQN, needs an import) in one file, following Java's shadowing order:
+        the file's own type, then single-type imports, then its package, then on-demand imports.
+        """
+        names: Dict[str, Tuple[str, bool]] = {}
+        for package, _, wildcard in imports:
+            if wildcard:
+                for simple, fqn in self.packages.get(package, {}).items():
+                    names.setdefault(simple, (fqn, True))
+        for simple, fqn in self.packages.get(old_package, {}).items():
+            names[simple] = (fqn, True)
+        for fqn, simple, wildcard in imports:
+            if wildcard:
+                continue
+            if fqn in self.types:
+                names[simple] = (fqn, False)
+            else:
+                # A single-type import of anything else (e.g. Spring's @Service) shadows the package
+                names.pop(simple, None)
+        own_fqn = f"{old_package}.{own}" if old_package else own
+        if own_fqn in self.types:
+            names[own] = (own_fqn, False)
+        return names
+
+    def rewrite(self, text: str, old_package: str, own: str, new_package: str) -> str:
+        """
+        Rewrite one Java source: package declaration, imports of relocated types (on-demand
+        imports of relocated packages become single-type imports of what the file uses),
+        fully qualified references and simple names of renamed types. Types the file used
+        from its old package without an import get one when they now live elsewhere.
+        """
+        edits: List[Tuple[int, int, str]] = []
+        package_match = PACKAGE_RE.search(text)
+        insert_at = 0
+        if package_match is not None:
+            edits.append((package_match.start(1), package_match.end(1), f"package {new_package};"))
+            insert_at = package_match.end()
+        protected = [(package_match.start(), package_match.end())] if package_match is not None else []
+
+        imports = []
+        for match in IMPORT_RE.finditer(text):
+            if match.group(1):
+                continue  # static imports are rewritten as qualified names below
+            name, wildcard = match.group(2), bool(match.group(3))
+            imports.append((name, name.rsplit(".", 1)[-1], wildcard))
+            if wildcard and name in self.packages:
+                # The package no longer exists after the merge
+                edits.append((match.start(), match.end(), ""))
+                protected.append((match.start(), match.end()))
+            insert_at = max(insert_at, match.end())
+        names = self._simple_names(old_package, own, imports)
+
+        added = {}
+        spans = iter(sorted(protected))
+        span = next(spans, None)
+        for match in TOKEN_RE.finditer(text):
+            if match.lastgroup != "name":
+                continue
+            start, end = match.span()
+            while span is not None and span[1] <= start:
+                span = next(spans, None)
+            if span is not None and span[0] <= start < span[1]:
+                continue
+            if start and text[start - 1] == ".":
+                continue  # member access, not the start of a type reference
+            token = match.group()
+            segments = token.split(".")
+            first = segments[0]
+            if first not in names and first not in self._trie:
+                continue
+            count, old_fqn = self.match(segments) if len(segments) > 1 else (0, None)
+            if old_fqn is not None:
+                replacement = ".".join([self.new_fqn(old_fqn)] + segments[count:])
+            elif first in names:
+                old_fqn, needs_import = names[first]
+                target_package, target_simple = self.types[old_fqn]
+                if needs_import and target_package != new_package:
+                    added[self.new_fqn(old_fqn)] = True
+                replacement = ".".join([target_simple] + segments[1:])
+            else:
+                continue
+            if replacement != token:
+                edits.append((start, end, replacement))
+
+        if added:
+            block = "".join(f"import {fqn};\n" for fqn in sorted(added))
+            if package_match is not None and insert_at == package_match.end():
+                block = ("\n" if not text[:insert_at].endswith("\n\n") else "") + block
+            edits.append((insert_at, insert_at, block))
+
+        pieces, position = [], 0
+        for start, end, replacement in sorted(edits, key=lambda edit: (edit[0], edit[1])):
+            pieces.append(text[position:start])
+            pieces.append(replacement)
+            position = end
+        pieces.append(text[position:])
+        return "".join(pieces)
@@ -0,0 +1,92 @@
+import pytest
+
+from config_merge import ConfigMerger, _escape_key, _escape_value, load_config_file, parse_properties
+
+
+def test_comments_blank_lines_and_separators():
+    assert parse_properties([
+        "# a comment",
+        "! another comment",
+        "",
+        "a=1",
+        "b: 2",
+        "c 3",
+        "  spaced   =   value  ",
+        "empty",
+    ]) == [("a", "1"), ("b", "2"), ("c", "3"), ("spaced", "value  "), ("empty", "")]
+
+
+def test_line_continuations():
+    assert parse_properties([
+        "servers = one, \\",
+        "    two, \\",
+        "\tthree",
+        "next=1",
+    ]) == [("servers", "one, two, three"), ("next", "1")]
+
+
+def test_continuation_rules_follow_java():
+    assert parse_properties([
+        "# a comment ending in a backslash does not continue \\",
+        "even=ends\\\\",
+        "odd=continues\\\\\\",
+        "here",
+        "last=dangling\\",
+    ]) == [("even", "ends\\"), ("odd", "continues\\here"), ("last", "dangling")]
+
+
+def test_escapes():
+    assert parse_properties([
+        "key\\ with\\:colon = value",
+        "tab\\tkey value\\n",
+        "uni=caf\\u00e9",
+        "surrogates=\\uD83D\\uDE00",
+        "other=\\q",
+    ]) == [
+        ("key with:colon", "value"),
+        ("tab\tkey", "value\n"),
+        ("uni", "café"),
+        ("surrogates", "\U0001F600"),
+        ("other", "q"),
+    ]
+
+
+@pytest.mark.parametrize("key,value", [
+    ("key with:colon", "  leading spaces"),
+    ("a=b#c!d", "back\\slash"),
+    ("café", "\U0001F600\tand\nnewline"),
+])
+def test_escaped_entries_parse_back(key, value):
+    line = f"{_escape_key(key)}={_escape_value(value)}"
+    assert line.isascii()
+    assert parse_properties([line]) == [(key, value)]
+
+
+def _merge(tmp_path, name, services):
+    merger = ConfigMerger()
+    for service, text in services:
+        path = tmp_path / service / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text)
+        merger.add(service, load_config_file(str(path)))
+    merger.write(str(tmp_path / "out"))
+    return merger, (tmp_path / "out" / name).read_text().splitlines()[3:]
+
+
+def test_spring_config_keys_use_relaxed_binding(tmp_path):
+    merger, lines = _merge(tmp_path, "application.properties", [
+        ("svc-a", "server.max-http-header-size=8KB\n"),
+        ("svc-b", "server.maxHttpHeaderSize=16KB\n"),
+    ])
+    assert lines == ["# CONFLICT: kept value of svc-a", "# svc-b: server.max-http-header-size=16KB",
+                     "server.max-http-header-size=8KB"]
+    assert len(merger.conflicts) == 1
+
+
+def test_other_bundles_merge_on_the_exact_key(tmp_path):
+    merger, lines = _merge(tmp_path, "messages.properties", [
+        ("svc-a", "greeting.userName=Hello\ngreeting.username=Hi\n"),
+        ("svc-b", "greeting.user-name=Hey\n"),
+    ])
+    assert lines == ["greeting.userName=Hello", "greeting.username=Hi", "greeting.user-name=Hey"]
+    assert merger.conflicts == []
@@ -0,0 +1,64 @@
+import os
+
+import pytest
+
+import repo_index
+from consolidation_orchestrator import execute_merge_plan, purge_and_scaffold
+
+
+@pytest.fixture(autouse=True)
+def workdir(tmp_path, monkeypatch):
+    # Output paths (consolidated-service/, config_merge_conflicts.json) are relative to the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(repo_index, "_indexes", {})
+
+
+def _write(path, text):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def _repo(tmp_path):
+    repo = str(tmp_path / "repos" / "orders")
+    java = os.path.join(repo, "src", "main", "java", "com", "a")
+    _write(os.path.join(repo, "build.gradle"), "plugins { id 'java' }\n")
+    _write(os.path.join(java, "web", "OrderController.java"),
+           "package com.a.web;\n\nimport com.a.model.Order;\n\n"
+           "@RestController\npublic class OrderController {\n    Order order;\n}\n")
+    _write(os.path.join(java, "model", "Order.java"), "package com.a.model;\n\n@Entity\npublic class Order {\n}\n")
+    _write(os.path.join(repo, "src", "main", "resources", "data.sql"), "insert into orders values (1);\n")
+    _write(os.path.join(repo, "src", "main", "resources", "schema.sql"), "create table orders (id bigint);\n")
+    return repo
+
+
+def _merge(tmp_path, repos):
+    repo_index._indexes.clear()
+    target_dir, previous_files = purge_and_scaffold(offline=True, cache_dir=str(tmp_path / "cache"))
+    return target_dir, execute_merge_plan({}, repos, consolidated_dir=target_dir, previous_files=previous_files)
+
+
+def test_rerun_skips_unchanged_files(tmp_path):
+    repo = _repo(tmp_path)
+    _, first = _merge(tmp_path, [repo])
+    assert (first.written, first.unchanged, first.failed) == (4, 0, 0)
+
+    _, second = _merge(tmp_path, [repo])
+    assert (second.written, second.unchanged, second.failed) == (0, 4, 0)
+
+
+def test_rerun_removes_files_no_longer_merged(tmp_path):
+    repo = _repo(tmp_path)
+    target_dir, _ = _merge(tmp_path, [repo])
+    resources = os.path.join(target_dir, "src", "main", "resources")
+    assert os.path.exists(os.path.join(resources, "schema.sql"))
+
+    os.unlink(os.path.join(repo, "src", "main", "resources", "schema.sql"))
+    _write(os.path.join(repo, "src", "main", "resources", "data.sql"), "insert into orders values (2);\n")
+    _, stats = _merge(tmp_path, [repo])
+    assert (stats.written, stats.unchanged) == (1, 2)
+    assert not os.path.exists(os.path.join(resources, "schema.sql"))
+    with open(os.path.join(resources, "data.sql")) as f:
+        assert f.read() == "insert into orders values (2);\n"
+    # The scaffold itself is always fresh
+    assert os.path.exists(os.path.join(target_dir, "build.gradle"))
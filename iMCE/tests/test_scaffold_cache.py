@@ -0,0 +1,54 @@
+import os
+import zipfile
+
+import pytest
+
+import scaffold_cache
+from scaffold_cache import DEFAULT_PARAMS, cached_template, scaffold_into
+
+
+def _truncated(path):
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("ms-imce/build.gradle", "plugins {}\n" * 100)
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:len(data) // 2])
+
+
+def _bad_crc(path):
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED) as z:
+        z.writestr("ms-imce/settings.gradle", "rootProject.name = 'ms-imce'\n")
+        z.writestr("ms-imce/build.gradle", "plugins {}\n")
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data.replace(b"plugins", b"PLUGINS", 1))
+
+
+@pytest.mark.parametrize("corrupt", [_truncated, _bad_crc])
+def test_corrupt_cache_entry_falls_back_to_the_bundled_template(tmp_path, monkeypatch, corrupt):
+    bundled = tmp_path / "bundled" / "ms-imce"
+    bundled.mkdir(parents=True)
+    (bundled / "build.gradle").write_text("// bundled\n")
+    monkeypatch.setattr(scaffold_cache, "BUNDLED_TEMPLATE_DIR", str(bundled.parent))
+    cache_dir = str(tmp_path / "cache")
+    os.makedirs(cache_dir)
+    corrupt(cached_template(DEFAULT_PARAMS, cache_dir))
+    target = tmp_path / "out"
+
+    assert scaffold_into(str(target), DEFAULT_PARAMS, cache_dir, offline=True) == "bundled"
+    assert not os.path.exists(cached_template(DEFAULT_PARAMS, cache_dir))
+    assert sorted(os.listdir(target / "ms-imce")) == ["build.gradle"]
+    assert (target / "ms-imce" / "build.gradle").read_text() == "// bundled\n"
+
+
+def test_valid_cache_entry_is_extracted(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    os.makedirs(cache_dir)
+    with zipfile.ZipFile(cached_template(DEFAULT_PARAMS, cache_dir), "w") as z:
+        z.writestr("ms-imce/build.gradle", "// cached\n")
+    target = tmp_path / "out"
+
+    assert scaffold_into(str(target), DEFAULT_PARAMS, cache_dir, offline=True) == "cache"
+    assert (target / "ms-imce" / "build.gradle").read_text() == "// cached\n"
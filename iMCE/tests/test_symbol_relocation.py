@@ -0,0 +1,132 @@
+from symbol_relocation import Relocation
+
+
+def _service_a():
+    relocation = Relocation()
+    relocation.add("com.a.svc", "OrderService", "com.merged.service")
+    relocation.add("com.a.model", "Order", "com.merged.model")
+    relocation.add("com.a.model", "Customer", "com.merged.model")
+    return relocation
+
+
+def test_package_and_single_type_imports_are_rewritten():
+    source = (
+        "package com.a.web;\n"
+        "\n"
+        "import com.a.svc.OrderService;\n"
+        "import org.springframework.stereotype.Service;\n"
+        "\n"
+        "public class OrderController {\n"
+        "    private final OrderService service;\n"
+        "}\n"
+    )
+    assert _service_a().rewrite(source, "com.a.web", "OrderController", "com.merged.web") == (
+        "package com.merged.web;\n"
+        "\n"
+        "import com.merged.service.OrderService;\n"
+        "import org.springframework.stereotype.Service;\n"
+        "\n"
+        "public class OrderController {\n"
+        "    private final OrderService service;\n"
+        "}\n"
+    )
+
+
+def test_on_demand_import_becomes_imports_of_the_types_used():
+    source = (
+        "package com.a.web;\n"
+        "\n"
+        "import com.a.model.*;\n"
+        "\n"
+        "public class OrderController {\n"
+        "    Order order;\n"
+        "}\n"
+    )
+    assert _service_a().rewrite(source, "com.a.web", "OrderController", "com.merged.web") == (
+        "package com.merged.web;\n"
+        "\n"
+        "import com.merged.model.Order;\n"
+        "\n"
+        "public class OrderController {\n"
+        "    Order order;\n"
+        "}\n"
+    )
+
+
+def test_fully_qualified_names_are_rewritten_outside_comments_and_strings():
+    source = (
+        "package com.a.web;\n"
+        "\n"
+        "public class OrderController {\n"
+        "    // returns a com.a.model.Order\n"
+        "    String name = \"com.a.model.Order\";\n"
+        "    com.a.model.Order find() { return new com.a.model.Order(); }\n"
+        "    com.a.model.Customer.Address address;\n"
+        "}\n"
+    )
+    rewritten = _service_a().rewrite(source, "com.a.web", "OrderController", "com.merged.web")
+    assert "// returns a com.a.model.Order\n" in rewritten
+    assert "String name = \"com.a.model.Order\";" in rewritten
+    assert "com.merged.model.Order find() { return new com.merged.model.Order(); }" in rewritten
+    assert "com.merged.model.Customer.Address address;" in rewritten
+
+
+def test_renamed_types_follow_in_simple_and_qualified_references():
+    relocation = Relocation()
+    relocation.add("com.b.model", "Order", "com.merged.model", "Order_2")
+    relocation.add("com.b.model", "Item", "com.merged.model")
+    source = (
+        "package com.b.model;\n"
+        "\n"
+        "public class Item {\n"
+        "    Order order;\n"
+        "    com.b.model.Order.Status status;\n"
+        "}\n"
+    )
+    assert relocation.rewrite(source, "com.b.model", "Item", "com.merged.model") == (
+        "package com.merged.model;\n"
+        "\n"
+        "public class Item {\n"
+        "    Order_2 order;\n"
+        "    com.merged.model.Order_2.Status status;\n"
+        "}\n"
+    )
+
+
+def test_same_package_types_moved_elsewhere_get_an_import():
+    relocation = Relocation()
+    relocation.add("com.a", "OrderService", "com.merged.service")
+    relocation.add("com.a", "OrderController", "com.merged.web")
+    source = (
+        "package com.a;\n"
+        "\n"
+        "public class OrderController {\n"
+        "    OrderService service;\n"
+        "}\n"
+    )
+    assert relocation.rewrite(source, "com.a", "OrderController", "com.merged.web") == (
+        "package com.merged.web;\n"
+        "\n"
+        "import com.merged.service.OrderService;\n"
+        "\n"
+        "public class OrderController {\n"
+        "    OrderService service;\n"
+        "}\n"
+    )
+
+
+def test_single_type_import_shadows_a_relocated_package_type():
+    relocation = Relocation()
+    relocation.add("com.a", "Service", "com.merged.service", "Service_2")
+    source = (
+        "package com.a;\n"
+        "\n"
+        "import org.springframework.stereotype.Service;\n"
+        "\n"
+        "@Service\n"
+        "public class OrderService {\n"
+        "}\n"
+    )
+    rewritten = relocation.rewrite(source, "com.a", "OrderService", "com.merged.service")
+    assert "@Service\n" in rewritten
+    assert "Service_2" not in rewritten
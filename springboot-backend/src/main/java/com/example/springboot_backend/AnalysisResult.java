@@ -7,10 +7,13 @@ public class AnalysisResult {
     public Map<String, Object> config;
     public List<RestEndpoint> endpoints;
     public MigrationResult migrationResult;
+    public EndpointScanStats endpointScanStats;
 
-    public AnalysisResult(Map<String, Object> config, List<RestEndpoint> endpoints, MigrationResult migrationResult) {
+    public AnalysisResult(Map<String, Object> config, List<RestEndpoint> endpoints, MigrationResult migrationResult,
+                          EndpointScanStats endpointScanStats) {
         this.config = config;
         this.endpoints = endpoints;
         this.migrationResult = migrationResult;
+        this.endpointScanStats = endpointScanStats;
     }
 } 
\ No newline at end of file
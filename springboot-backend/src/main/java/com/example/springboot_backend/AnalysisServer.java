@@ -0,0 +1,96 @@
+package com.example.springboot_backend;
+
+import java.io.BufferedReader;
+import java.io.File;
+import java.io.IOException;
+import java.io.InputStream;
+import java.io.InputStreamReader;
+import java.io.PrintStream;
+import java.nio.charset.StandardCharsets;
+import com.fasterxml.jackson.databind.JsonNode;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import com.fasterxml.jackson.databind.node.ObjectNode;
+import org.slf4j.Logger;
+import org.slf4j.LoggerFactory;
+
+// Line-delimited JSON-RPC 2.0 server so one warm JVM can analyze many repositories.
+// Methods: "analyze" {repo, persist}, "ping", "shutdown".
+public class AnalysisServer {
+    private static final Logger logger = LoggerFactory.getLogger(AnalysisServer.class);
+    private static final ObjectMapper mapper = new ObjectMapper();
+
+    static final int PARSE_ERROR = -32700;
+    static final int METHOD_NOT_FOUND = -32601;
+    static final int INVALID_PARAMS = -32602;
+    static final int ANALYSIS_FAILED = -32000;
+
+    public static void serve(InputStream in, PrintStream out) throws IOException {
+        BufferedReader reader = new BufferedReader(new InputStreamReader(in, StandardCharsets.UTF_8));
+        logger.info("Analysis server ready");
+        String line;
+        while ((line = reader.readLine()) != null) {
+            if (line.isBlank()) continue;
+            ObjectNode response = handle(line);
+            out.println(mapper.writeValueAsString(response));
+            out.flush();
+            if (response.path("result").path("shutdown").asBoolean(false)) break;
+        }
+        logger.info("Analysis server stopped");
+    }
+
+    static ObjectNode handle(String line) {
+        JsonNode request;
+        try {
+            request = mapper.readTree(line);
+        } catch (IOException e) {
+            return error(null, PARSE_ERROR, "Invalid JSON: " + e.getMessage());
+        }
+        JsonNode id = request.get("id");
+        String method = request.path("method").asText("");
+        switch (method) {
+            case "ping":
+                return result(id, mapper.createObjectNode().put("pong", true));
+            case "shutdown":
+                return result(id, mapper.createObjectNode().put("shutdown", true));
+            case "analyze":
+                return analyze(id, request.path("params"));
+            default:
+                return error(id, METHOD_NOT_FOUND, "Unknown method: " + method);
+        }
+    }
+
+    private static ObjectNode analyze(JsonNode id, JsonNode params) {
+        String repoPath = params.path("repo").asText(null);
+        String validationError = RepoAnalysisModule.validateRepoPath(repoPath);
+        if (validationError != null) {
+            return error(id, INVALID_PARAMS, validationError);
+        }
+        try {
+            File repoDir = new File(repoPath);
+            long start = System.nanoTime();
+            AnalysisResult result = RepoAnalysisModule.analyze(repoDir);
+            if (params.path("persist").asBoolean(false)) {
+                ResultSerializer.serializeToJson(result, new File(repoDir, "analysis_result.json"));
+            }
+            logger.info("Analyzed {} in {} ms", repoPath, (System.nanoTime() - start) / 1_000_000);
+            return result(id, mapper.valueToTree(result));
+        } catch (RuntimeException e) {
+            logger.error("Analysis failed for {}", repoPath, e);
+            return error(id, ANALYSIS_FAILED, "Analysis failed: " + e.getMessage());
+        }
+    }
+
+    private static ObjectNode result(JsonNode id, JsonNode result) {
+        ObjectNode response = mapper.createObjectNode().put("jsonrpc", "2.0");
+        response.set("id", id);
+        response.set("result", result);
+        return response;
+    }
+
+    private static ObjectNode error(JsonNode id, int code, String message) {
+        ObjectNode response = mapper.createObjectNode().put("jsonrpc", "2.0");
+        response.set("id", id);
+        response.putObject("error").put("code", code).put("message", message);
+        return response;
+    }
+}
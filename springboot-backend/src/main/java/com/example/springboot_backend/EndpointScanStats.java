@@ -0,0 +1,60 @@
+package com.example.springboot_backend;
+
+import java.util.ArrayList;
+import java.util.Comparator;
+import java.util.List;
+
+// Timing of one RestControllerAnalyzer pass: how many files the byte prefilter let through,
+// and how long reading and parsing took per file. Serialized with the analysis result.
+public class EndpointScanStats {
+    static final int SLOWEST_FILES = 10;
+
+    public int filesListed;
+    public int filesSkipped;
+    public int filesParsed;
+    public int parseFailures;
+    public long bytesRead;
+    public long listMillis;
+    public long wallMillis;
+    public double readMillisTotal;
+    public double parseMillisTotal;
+    public double parseMillisMedian;
+    public double parseMillisP95;
+    public double parseMillisMax;
+    public int threads;
+    public List<FileTiming> slowestFiles = new ArrayList<>();
+
+    public static class FileTiming {
+        public String path;
+        public double readMillis;
+        public double parseMillis;
+
+        public FileTiming(String path, double readMillis, double parseMillis) {
+            this.path = path;
+            this.readMillis = readMillis;
+            this.parseMillis = parseMillis;
+        }
+    }
+
+    // Aggregate the per-file timings of the files that were parsed
+    void summarize(List<FileTiming> parsed) {
+        List<FileTiming> byParseTime = new ArrayList<>(parsed);
+        byParseTime.sort(Comparator.comparingDouble((FileTiming t) -> t.parseMillis).reversed());
+        int n = byParseTime.size();
+        if (n > 0) {
+            parseMillisMax = byParseTime.get(0).parseMillis;
+            parseMillisMedian = byParseTime.get(n / 2).parseMillis;
+            parseMillisP95 = byParseTime.get(Math.min(n - 1, (int) (n * 0.05))).parseMillis;
+        }
+        slowestFiles = new ArrayList<>(byParseTime.subList(0, Math.min(SLOWEST_FILES, n)));
+    }
+
+    @Override
+    public String toString() {
+        return String.format(
+            "%d files listed, %d skipped by prefilter, %d parsed (%d failed) on %d threads; "
+                + "read %.1f ms, parse %.1f ms (median %.2f, p95 %.2f, max %.2f); wall %d ms",
+            filesListed, filesSkipped, filesParsed, parseFailures, threads,
+            readMillisTotal, parseMillisTotal, parseMillisMedian, parseMillisP95, parseMillisMax, wallMillis);
+    }
+}
@@ -1,6 +1,8 @@
 package com.example.springboot_backend;
 
 import java.io.File;
+import java.io.IOException;
+import java.io.PrintStream;
 import java.util.Map;
 import java.util.List;
 import org.slf4j.Logger;
@@ -11,28 +13,52 @@ public class RepoAnalysisModule {
 
     public static void main(String[] args) {
         if (args.length == 0) {
-            logger.info("Usage: java RepoAnalysisModule <repo-folder>");
+            logger.info("Usage: java RepoAnalysisModule <repo-folder> | --server");
+            return;
+        }
+        if (args[0].equals("--server")) {
+            // Keep log output off the protocol stream: stdout carries JSON-RPC responses only
+            PrintStream protocolOut = System.out;
+            System.setOut(System.err);
+            try {
+                AnalysisServer.serve(System.in, protocolOut);
+            } catch (IOException e) {
+                logger.error("Analysis server terminated", e);
+            }
             return;
         }
         String repoPath = args[0];
-        if (!repoPath.startsWith("./repos")) {
-            logger.error("Error: Only repositories inside ./repos can be analyzed.");
+        String error = validateRepoPath(repoPath);
+        if (error != null) {
+            logger.error(error);
             return;
         }
         File repoDir = new File(repoPath);
+        AnalysisResult result = analyze(repoDir);
+        ResultSerializer.serializeToJson(result, new File(repoDir, "analysis_result.json"));
+        logger.info("Analysis complete. Results written to analysis_result.json");
+    }
+
+    // Returns an error message if the path may not be analyzed, or null if it is valid
+    static String validateRepoPath(String repoPath) {
+        if (repoPath == null || !repoPath.startsWith("./repos")) {
+            return "Error: Only repositories inside ./repos can be analyzed.";
+        }
+        File repoDir = new File(repoPath);
         if (!repoDir.exists() || !repoDir.isDirectory()) {
-            logger.error("Error: Provided path does not exist or is not a directory.");
-            return;
+            return "Error: Provided path does not exist or is not a directory.";
         }
+        return null;
+    }
+
+    static AnalysisResult analyze(File repoDir) {
         // 1. Aggregate configuration
         Map<String, Object> config = ConfigAggregator.aggregateConfig(repoDir);
         // 2. Extract REST endpoints
-        List<RestEndpoint> endpoints = RestControllerAnalyzer.extractEndpoints(repoDir);
+        EndpointScanStats endpointScanStats = new EndpointScanStats();
+        List<RestEndpoint> endpoints = RestControllerAnalyzer.extractEndpoints(repoDir, endpointScanStats);
         // 3. Detect Maven and migrate to Gradle
         MigrationResult migrationResult = MavenToGradleMigrator.migrateIfMaven(repoDir);
-        // 4. Output results
-        AnalysisResult result = new AnalysisResult(config, endpoints, migrationResult);
-        ResultSerializer.serializeToJson(result, new File(repoDir, "analysis_result.json"));
-        logger.info("Analysis complete. Results written to analysis_result.json");
+        return new AnalysisResult(config, endpoints, migrationResult, endpointScanStats);
     }
-} 
\ No newline at end of file
+}
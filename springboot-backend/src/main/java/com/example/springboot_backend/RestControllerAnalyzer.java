@@ -1,54 +1,163 @@
 package com.example.springboot_backend;
 
+import java.io.ByteArrayInputStream;
 import java.io.File;
+import java.nio.charset.StandardCharsets;
+import java.nio.file.Files;
+import java.util.Comparator;
 import java.util.List;
 import java.util.ArrayList;
+import java.util.concurrent.ExecutionException;
+import java.util.concurrent.ForkJoinPool;
 import org.slf4j.Logger;
 import org.slf4j.LoggerFactory;
 import com.github.javaparser.JavaParser;
+import com.github.javaparser.ParseResult;
 import com.github.javaparser.ast.CompilationUnit;
 import com.github.javaparser.ast.body.ClassOrInterfaceDeclaration;
 import com.github.javaparser.ast.body.MethodDeclaration;
 import com.github.javaparser.ast.expr.AnnotationExpr;
+import com.github.javaparser.ast.expr.Expression;
 import com.github.javaparser.ast.expr.NormalAnnotationExpr;
 import com.github.javaparser.ast.expr.SingleMemberAnnotationExpr;
 import com.github.javaparser.ast.expr.MemberValuePair;
-import com.github.javaparser.utils.SourceRoot;
-import java.nio.file.Paths;
-import java.util.Optional;
 import java.io.IOException;
+import java.util.Optional;
 
+// Endpoints of every @RestController in a repository. Files are read as bytes and only those
+// that mention RestController are parsed; the rest never reach JavaParser. Reads and parses run
+// on a work-stealing ForkJoinPool, one JavaParser per thread (instances are not thread-safe).
 public class RestControllerAnalyzer {
     private static final Logger logger = LoggerFactory.getLogger(RestControllerAnalyzer.class);
+    private static final byte[] PREFILTER_NEEDLE = "RestController".getBytes(StandardCharsets.US_ASCII);
+    private static final ForkJoinPool POOL = new ForkJoinPool(Runtime.getRuntime().availableProcessors());
+    private static final ThreadLocal<JavaParser> PARSERS = ThreadLocal.withInitial(JavaParser::new);
+
+    // Endpoints found in one file, with its timings
+    private static class FileScan {
+        final List<RestEndpoint> endpoints = new ArrayList<>();
+        boolean parsed;
+        boolean failed;
+        long bytes;
+        EndpointScanStats.FileTiming timing;
+    }
 
     public static List<RestEndpoint> extractEndpoints(File repoDir) {
-        List<RestEndpoint> endpoints = new ArrayList<>();
+        return extractEndpoints(repoDir, new EndpointScanStats());
+    }
+
+    public static List<RestEndpoint> extractEndpoints(File repoDir, EndpointScanStats stats) {
+        long start = System.nanoTime();
         List<File> javaFiles = new ArrayList<>();
         findJavaFiles(repoDir, javaFiles);
-        JavaParser parser = new JavaParser();
-        for (File file : javaFiles) {
-            try {
-                Optional<CompilationUnit> cuOpt = parser.parse(file).getResult();
-                if (!cuOpt.isPresent()) continue;
-                CompilationUnit cu = cuOpt.get();
-                cu.findAll(ClassOrInterfaceDeclaration.class).forEach(clazz -> {
-                    boolean isRestController = clazz.getAnnotations().stream()
-                        .anyMatch(a -> a.getNameAsString().equals("RestController"));
-                    if (isRestController) {
-                        String className = clazz.getNameAsString();
-                        clazz.getMethods().forEach(method -> {
-                            extractEndpointFromMethod(className, method, endpoints);
-                        });
-                        logger.info("Found @RestController: {}", className);
-                    }
-                });
-            } catch (IOException e) {
-                logger.error("Failed to parse Java file: {}", file.getPath(), e);
+        // Sorted so the endpoint order does not depend on directory listing order
+        javaFiles.sort(Comparator.comparing(File::getPath));
+        stats.listMillis = (System.nanoTime() - start) / 1_000_000;
+        stats.filesListed = javaFiles.size();
+        stats.threads = POOL.getParallelism();
+
+        List<FileScan> scans;
+        try {
+            scans = POOL.submit(() -> javaFiles.parallelStream().map(RestControllerAnalyzer::scanFile).toList()).get();
+        } catch (InterruptedException e) {
+            Thread.currentThread().interrupt();
+            throw new IllegalStateException("Interrupted while analyzing " + repoDir, e);
+        } catch (ExecutionException e) {
+            throw new IllegalStateException("Endpoint extraction failed for " + repoDir, e.getCause());
+        }
+
+        List<RestEndpoint> endpoints = new ArrayList<>();
+        List<EndpointScanStats.FileTiming> parsedTimings = new ArrayList<>();
+        for (FileScan scan : scans) {
+            endpoints.addAll(scan.endpoints);
+            stats.bytesRead += scan.bytes;
+            stats.readMillisTotal += scan.timing.readMillis;
+            if (scan.failed) stats.parseFailures++;
+            if (!scan.parsed) {
+                if (!scan.failed) stats.filesSkipped++;
+                continue;
             }
+            stats.filesParsed++;
+            stats.parseMillisTotal += scan.timing.parseMillis;
+            parsedTimings.add(scan.timing);
         }
+        stats.summarize(parsedTimings);
+        stats.wallMillis = (System.nanoTime() - start) / 1_000_000;
+        logger.info("Endpoint scan of {}: {}", repoDir, stats);
         return endpoints;
     }
 
+    private static FileScan scanFile(File file) {
+        FileScan scan = new FileScan();
+        long start = System.nanoTime();
+        byte[] content;
+        try {
+            content = Files.readAllBytes(file.toPath());
+        } catch (IOException e) {
+            logger.error("Failed to read Java file: {}", file.getPath(), e);
+            scan.failed = true;
+            scan.timing = new EndpointScanStats.FileTiming(file.getPath(), millisSince(start), 0);
+            return scan;
+        }
+        long read = System.nanoTime();
+        scan.bytes = content.length;
+        if (!mayDeclareController(content)) {
+            scan.timing = new EndpointScanStats.FileTiming(file.getPath(), millisBetween(start, read), 0);
+            return scan;
+        }
+        scan.parsed = true;
+        try {
+            ParseResult<CompilationUnit> result = PARSERS.get().parse(new ByteArrayInputStream(content));
+            if (!result.isSuccessful()) {
+                logger.warn("Problems parsing Java file {}: {}", file.getPath(), result.getProblems());
+                scan.failed = true;
+            }
+            // A partially recovered unit still yields the endpoints it has
+            result.getResult().ifPresent(cu -> cu.findAll(ClassOrInterfaceDeclaration.class).forEach(clazz -> {
+                boolean isRestController = clazz.getAnnotations().stream()
+                    .anyMatch(a -> simpleName(a).equals("RestController"));
+                if (isRestController) {
+                    String className = clazz.getNameAsString();
+                    ClassMapping classMapping = classMapping(clazz);
+                    clazz.getMethods().forEach(method -> {
+                        extractEndpointFromMethod(className, classMapping, method, scan.endpoints);
+                    });
+                    logger.info("Found @RestController: {}", className);
+                }
+            }));
+        } catch (RuntimeException e) {
+            // One file the parser chokes on must not fail the whole repository
+            logger.error("Failed to parse Java file: {}", file.getPath(), e);
+            scan.failed = true;
+        }
+        scan.timing = new EndpointScanStats.FileTiming(file.getPath(), millisBetween(start, read), millisSince(read));
+        return scan;
+    }
+
+    // Byte-level prefilter: a file that never spells RestController cannot declare one
+    // (simple or qualified annotation name alike), so it is not worth a parse
+    static boolean mayDeclareController(byte[] content) {
+        byte first = PREFILTER_NEEDLE[0];
+        int last = content.length - PREFILTER_NEEDLE.length;
+        outer:
+        for (int i = 0; i <= last; i++) {
+            if (content[i] != first) continue;
+            for (int j = 1; j < PREFILTER_NEEDLE.length; j++) {
+                if (content[i + j] != PREFILTER_NEEDLE[j]) continue outer;
+            }
+            return true;
+        }
+        return false;
+    }
+
+    private static double millisBetween(long startNanos, long endNanos) {
+        return (endNanos - startNanos) / 1_000_000.0;
+    }
+
+    private static double millisSince(long startNanos) {
+        return millisBetween(startNanos, System.nanoTime());
+    }
+
     private static void findJavaFiles(File dir, List<File> javaFiles) {
         if (dir == null || !dir.exists()) return;
         File[] files = dir.listFiles();
@@ -62,40 +171,94 @@ public class RestControllerAnalyzer {
         }
     }
 
-    private static void extractEndpointFromMethod(String className, MethodDeclaration method, List<RestEndpoint> endpoints) {
+    // Class-level @RequestMapping: path prefixes and the request methods it narrows handlers to
+    private static class ClassMapping {
+        List<String> prefixes = List.of("");
+        List<String> methods = List.of();
+    }
+
+    private static ClassMapping classMapping(ClassOrInterfaceDeclaration clazz) {
+        ClassMapping mapping = new ClassMapping();
+        for (AnnotationExpr annotation : clazz.getAnnotations()) {
+            if (!simpleName(annotation).equals("RequestMapping")) continue;
+            attribute(annotation, "value", "path").ifPresent(value -> mapping.prefixes = stringValues(value));
+            attribute(annotation, "method").ifPresent(value -> mapping.methods = requestMethods(value));
+        }
+        return mapping;
+    }
+
+    private static void extractEndpointFromMethod(String className, ClassMapping classMapping, MethodDeclaration method,
+                                                  List<RestEndpoint> endpoints) {
         for (AnnotationExpr annotation : method.getAnnotations()) {
-            String annotationName = annotation.getNameAsString();
-            String httpMethod = null;
-            String path = null;
+            String annotationName = simpleName(annotation);
+            List<String> httpMethods;
             switch (annotationName) {
-                case "GetMapping": httpMethod = "GET"; break;
-                case "PostMapping": httpMethod = "POST"; break;
-                case "PutMapping": httpMethod = "PUT"; break;
-                case "DeleteMapping": httpMethod = "DELETE"; break;
-                case "PatchMapping": httpMethod = "PATCH"; break;
-                case "RequestMapping": httpMethod = "REQUEST"; break;
+                case "GetMapping": httpMethods = List.of("GET"); break;
+                case "PostMapping": httpMethods = List.of("POST"); break;
+                case "PutMapping": httpMethods = List.of("PUT"); break;
+                case "DeleteMapping": httpMethods = List.of("DELETE"); break;
+                case "PatchMapping": httpMethods = List.of("PATCH"); break;
+                case "RequestMapping":
+                    // Without a method attribute the handler takes whatever the class allows, by default everything
+                    httpMethods = attribute(annotation, "method").map(RestControllerAnalyzer::requestMethods).orElse(List.of());
+                    if (httpMethods.isEmpty()) httpMethods = classMapping.methods;
+                    if (httpMethods.isEmpty()) httpMethods = RestEndpoint.ALL_METHODS;
+                    break;
                 default: continue;
             }
-            // Extract path value
-            if (annotation.isSingleMemberAnnotationExpr()) {
-                path = ((SingleMemberAnnotationExpr) annotation).getMemberValue().toString().replaceAll("^\"|\"$", "");
-            } else if (annotation.isNormalAnnotationExpr()) {
-                for (MemberValuePair pair : ((NormalAnnotationExpr) annotation).getPairs()) {
-                    if (pair.getNameAsString().equals("value") || pair.getNameAsString().equals("path")) {
-                        path = pair.getValue().toString().replaceAll("^\"|\"$", "");
-                    }
-                    if (annotationName.equals("RequestMapping") && pair.getNameAsString().equals("method")) {
-                        String methodValue = pair.getValue().toString();
-                        if (methodValue.contains("GET")) httpMethod = "GET";
-                        else if (methodValue.contains("POST")) httpMethod = "POST";
-                        else if (methodValue.contains("PUT")) httpMethod = "PUT";
-                        else if (methodValue.contains("DELETE")) httpMethod = "DELETE";
-                        else if (methodValue.contains("PATCH")) httpMethod = "PATCH";
-                    }
+            List<String> paths = attribute(annotation, "value", "path")
+                .map(RestControllerAnalyzer::stringValues).orElse(List.of("/"));
+            // One endpoint per (prefix, path) combination, as Spring registers them
+            for (String prefix : classMapping.prefixes) {
+                for (String path : paths) {
+                    endpoints.add(new RestEndpoint(className, method.getNameAsString(), path, prefix, httpMethods));
                 }
             }
-            if (path == null) path = "/";
-            endpoints.add(new RestEndpoint(className, method.getNameAsString(), httpMethod, path));
         }
     }
-} 
\ No newline at end of file
+
+    // Simple name of an annotation, also when it is written fully qualified
+    static String simpleName(AnnotationExpr annotation) {
+        return annotation.getName().getIdentifier();
+    }
+
+    // The first of the named attributes that is set; a single-member annotation's value counts as "value"
+    private static Optional<Expression> attribute(AnnotationExpr annotation, String... names) {
+        List<String> wanted = List.of(names);
+        if (annotation.isSingleMemberAnnotationExpr()) {
+            return wanted.contains("value")
+                ? Optional.of(((SingleMemberAnnotationExpr) annotation).getMemberValue()) : Optional.empty();
+        }
+        if (annotation.isNormalAnnotationExpr()) {
+            for (MemberValuePair pair : ((NormalAnnotationExpr) annotation).getPairs()) {
+                if (wanted.contains(pair.getNameAsString())) return Optional.of(pair.getValue());
+            }
+        }
+        return Optional.empty();
+    }
+
+    // String literals of an attribute (one, or an array of them). Anything else, such as a constant
+    // or a concatenation, is kept as its source text in parentheses, which marks the route unresolved.
+    private static List<String> stringValues(Expression value) {
+        List<Expression> values = value.isArrayInitializerExpr()
+            ? value.asArrayInitializerExpr().getValues() : List.of(value);
+        List<String> strings = new ArrayList<>();
+        for (Expression element : values) {
+            strings.add(element.isStringLiteralExpr() ? element.asStringLiteralExpr().asString() : "(" + element + ")");
+        }
+        return strings.isEmpty() ? List.of("") : strings;
+    }
+
+    // RequestMethod.GET, GET or {RequestMethod.GET, RequestMethod.POST}
+    private static List<String> requestMethods(Expression value) {
+        List<Expression> values = value.isArrayInitializerExpr()
+            ? value.asArrayInitializerExpr().getValues() : List.of(value);
+        List<String> methods = new ArrayList<>();
+        for (Expression element : values) {
+            String text = element.toString();
+            String method = text.substring(text.lastIndexOf('.') + 1);
+            if (RestEndpoint.ALL_METHODS.contains(method) && !methods.contains(method)) methods.add(method);
+        }
+        return methods;
+    }
+}
@@ -1,15 +1,80 @@
 package com.example.springboot_backend;
 
+import java.util.ArrayList;
+import java.util.List;
+
 public class RestEndpoint {
+    // Request methods a mapping without a method attribute accepts
+    static final List<String> ALL_METHODS = List.of("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS");
+    static final String ANY_METHOD = "REQUEST";
+
     public String className;
     public String methodName;
-    public String httpMethod;
-    public String path;
+    public String httpMethod;          // the one method mapped, or REQUEST when the handler takes several
+    public String path;                // method-level path as written; (Expression) when it is not a literal
+    public String classPath;           // class-level @RequestMapping prefix, "" when there is none
+    public String fullPath;            // classPath + path with a leading slash; null if either is not a literal
+    public String route;               // fullPath with every path variable as {}; null if fullPath is
+    public List<String> httpMethods;   // every method the handler answers
+    public List<String> routeKeys;     // "METHOD route" per method, for joining endpoints across services
 
     public RestEndpoint(String className, String methodName, String httpMethod, String path) {
+        this(className, methodName, path, "", httpMethod == null || httpMethod.equals(ANY_METHOD) ? ALL_METHODS : List.of(httpMethod));
+    }
+
+    public RestEndpoint(String className, String methodName, String path, String classPath, List<String> httpMethods) {
         this.className = className;
         this.methodName = methodName;
-        this.httpMethod = httpMethod;
         this.path = path;
+        this.classPath = classPath == null ? "" : classPath;
+        this.httpMethods = List.copyOf(httpMethods);
+        this.httpMethod = this.httpMethods.size() == 1 ? this.httpMethods.get(0) : ANY_METHOD;
+        this.fullPath = joinPaths(this.classPath, path);
+        this.route = fullPath == null ? null : canonicalRoute(fullPath);
+        this.routeKeys = new ArrayList<>();
+        if (route != null) {
+            for (String method : this.httpMethods) {
+                routeKeys.add(method + " " + route);
+            }
+        }
+    }
+
+    // "/api" + "users/{id}/" -> "/api/users/{id}"; null when either part is an unresolved expression
+    static String joinPaths(String prefix, String path) {
+        StringBuilder joined = new StringBuilder();
+        for (String part : new String[] {prefix, path}) {
+            if (part == null) continue;
+            if (!isLiteralPath(part)) return null;
+            for (String segment : part.split("/")) {
+                if (!segment.isEmpty()) joined.append('/').append(segment);
+            }
+        }
+        return joined.length() == 0 ? "/" : joined.toString();
+    }
+
+    // Same template as endpoint_matcher.normalize_path: {name} and {name:regex} become {}
+    static String canonicalRoute(String fullPath) {
+        StringBuilder route = new StringBuilder(fullPath.length());
+        int depth = 0;
+        for (int i = 0; i < fullPath.length(); i++) {
+            char c = fullPath.charAt(i);
+            if (c == '{') {
+                if (depth == 0) route.append("{}");
+                depth++;
+            } else if (c == '}' && depth > 0) {
+                depth--;
+            } else if (depth == 0) {
+                route.append(c);
+            }
+        }
+        return route.toString();
+    }
+
+    private static boolean isLiteralPath(String path) {
+        for (int i = 0; i < path.length(); i++) {
+            char c = path.charAt(i);
+            if (c == '"' || c == '+' || c == ',' || c == '(' || c == ')' || Character.isWhitespace(c)) return false;
+        }
+        return true;
     }
-} 
\ No newline at end of file
+}
@@ -0,0 +1,52 @@
+package com.example.springboot_backend;
+
+import org.junit.jupiter.api.Test;
+import com.fasterxml.jackson.databind.JsonNode;
+import com.fasterxml.jackson.databind.ObjectMapper;
+import java.io.ByteArrayInputStream;
+import java.io.ByteArrayOutputStream;
+import java.io.PrintStream;
+import java.nio.charset.StandardCharsets;
+import static org.junit.jupiter.api.Assertions.*;
+
+public class AnalysisServerTest {
+    private final ObjectMapper mapper = new ObjectMapper();
+
+    private String[] serve(String requests) throws Exception {
+        ByteArrayOutputStream buffer = new ByteArrayOutputStream();
+        AnalysisServer.serve(
+            new ByteArrayInputStream(requests.getBytes(StandardCharsets.UTF_8)),
+            new PrintStream(buffer, true, StandardCharsets.UTF_8)
+        );
+        return buffer.toString(StandardCharsets.UTF_8).split("\n");
+    }
+
+    @Test
+    void testPingAndShutdownStopsServer() throws Exception {
+        String[] lines = serve("""
+            {"jsonrpc":"2.0","id":1,"method":"ping"}
+            {"jsonrpc":"2.0","id":2,"method":"shutdown"}
+            {"jsonrpc":"2.0","id":3,"method":"ping"}
+            """);
+        assertEquals(2, lines.length);
+        JsonNode pong = mapper.readTree(lines[0]);
+        assertEquals(1, pong.get("id").asInt());
+        assertTrue(pong.path("result").path("pong").asBoolean());
+        assertTrue(mapper.readTree(lines[1]).path("result").path("shutdown").asBoolean());
+    }
+
+    @Test
+    void testAnalyzeRejectsPathsOutsideRepos() throws Exception {
+        String[] lines = serve("{\"jsonrpc\":\"2.0\",\"id\":7,\"method\":\"analyze\",\"params\":{\"repo\":\"/tmp\"}}\n");
+        JsonNode response = mapper.readTree(lines[0]);
+        assertEquals(7, response.get("id").asInt());
+        assertEquals(AnalysisServer.INVALID_PARAMS, response.path("error").path("code").asInt());
+    }
+
+    @Test
+    void testMalformedAndUnknownRequests() throws Exception {
+        String[] lines = serve("not json\n{\"jsonrpc\":\"2.0\",\"id\":4,\"method\":\"bogus\"}\n");
+        assertEquals(AnalysisServer.PARSE_ERROR, mapper.readTree(lines[0]).path("error").path("code").asInt());
+        assertEquals(AnalysisServer.METHOD_NOT_FOUND, mapper.readTree(lines[1]).path("error").path("code").asInt());
+    }
+}
@@ -4,6 +4,7 @@ import org.junit.jupiter.api.Test;
 import org.junit.jupiter.api.io.TempDir;
 import java.io.File;
 import java.io.FileWriter;
+import java.nio.charset.StandardCharsets;
 import java.nio.file.Path;
 import java.util.List;
 import static org.junit.jupiter.api.Assertions.*;
@@ -30,4 +31,134 @@ public class RestControllerAnalyzerTest {
         assertTrue(endpoints.stream().anyMatch(e -> e.httpMethod.equals("GET") && e.path.equals("/hello")));
         assertTrue(endpoints.stream().anyMatch(e -> e.httpMethod.equals("POST") && e.path.equals("/submit")));
     }
-} 
\ No newline at end of file
+
+    @Test
+    void testPrefilterSkipsFilesWithoutControllers(@TempDir Path tempDir) throws Exception {
+        File pkg = new File(tempDir.toFile(), "src/main/java/demo");
+        assertTrue(pkg.mkdirs());
+        try (FileWriter writer = new FileWriter(new File(pkg, "OrderController.java"))) {
+            writer.write("""
+                package demo;
+                @RestController
+                public class OrderController {
+                    @DeleteMapping("/orders/{id}")
+                    public void delete() {}
+                }
+            """);
+        }
+        for (int i = 0; i < 20; i++) {
+            try (FileWriter writer = new FileWriter(new File(pkg, "Model" + i + ".java"))) {
+                writer.write("package demo;\npublic class Model" + i + " { int id; }\n");
+            }
+        }
+        try (FileWriter writer = new FileWriter(new File(pkg, "Broken.java"))) {
+            writer.write("@RestController public class Broken { void x( }");
+        }
+
+        EndpointScanStats stats = new EndpointScanStats();
+        List<RestEndpoint> endpoints = RestControllerAnalyzer.extractEndpoints(tempDir.toFile(), stats);
+        assertEquals(1, endpoints.size());
+        assertEquals("DELETE", endpoints.get(0).httpMethod);
+        assertEquals(22, stats.filesListed);
+        assertEquals(20, stats.filesSkipped);
+        assertEquals(2, stats.filesParsed);
+        assertEquals(1, stats.parseFailures);
+        assertEquals(2, stats.slowestFiles.size());
+        assertTrue(stats.threads >= 1);
+    }
+
+    @Test
+    void testMayDeclareController() {
+        assertTrue(RestControllerAnalyzer.mayDeclareController("@RestController class A {}".getBytes(StandardCharsets.UTF_8)));
+        assertFalse(RestControllerAnalyzer.mayDeclareController("@Controller class A {}".getBytes(StandardCharsets.UTF_8)));
+        assertFalse(RestControllerAnalyzer.mayDeclareController("RestControlle".getBytes(StandardCharsets.UTF_8)));
+        assertFalse(RestControllerAnalyzer.mayDeclareController(new byte[0]));
+    }
+
+    @Test
+    void testClassLevelPrefixAndCanonicalRouteKeys(@TempDir Path tempDir) throws Exception {
+        File javaFile = new File(tempDir.toFile(), "UserController.java");
+        try (FileWriter writer = new FileWriter(javaFile)) {
+            writer.write("""
+                import org.springframework.web.bind.annotation.*;
+                @RestController
+                @RequestMapping("/api/users")
+                public class UserController {
+                    @GetMapping("{userName}")
+                    public String get() { return ""; }
+                    @RequestMapping(value = {"/a", "/b/"}, method = {RequestMethod.PUT, RequestMethod.POST})
+                    public void update() {}
+                    @RequestMapping("/any")
+                    public void any() {}
+                    @GetMapping(Routes.CONSTANT)
+                    public void constant() {}
+                }
+            """);
+        }
+        List<RestEndpoint> endpoints = RestControllerAnalyzer.extractEndpoints(tempDir.toFile());
+        assertEquals(5, endpoints.size());
+
+        RestEndpoint get = endpoints.get(0);
+        assertEquals("/api/users", get.classPath);
+        assertEquals("{userName}", get.path);
+        assertEquals("/api/users/{userName}", get.fullPath);
+        assertEquals("/api/users/{}", get.route);
+        assertEquals(List.of("GET /api/users/{}"), get.routeKeys);
+
+        RestEndpoint updateA = endpoints.get(1);
+        RestEndpoint updateB = endpoints.get(2);
+        assertEquals("REQUEST", updateA.httpMethod);
+        assertEquals(List.of("PUT", "POST"), updateA.httpMethods);
+        assertEquals(List.of("PUT /api/users/a", "POST /api/users/a"), updateA.routeKeys);
+        assertEquals("/api/users/b", updateB.fullPath);
+
+        RestEndpoint any = endpoints.get(3);
+        assertEquals("REQUEST", any.httpMethod);
+        assertEquals(RestEndpoint.ALL_METHODS, any.httpMethods);
+        assertEquals(RestEndpoint.ALL_METHODS.size(), any.routeKeys.size());
+
+        RestEndpoint constant = endpoints.get(4);
+        assertEquals("(Routes.CONSTANT)", constant.path);
+        assertNull(constant.route);
+        assertTrue(constant.routeKeys.isEmpty());
+    }
+
+    @Test
+    void testClassLevelMethodsApplyToPlainRequestMapping(@TempDir Path tempDir) throws Exception {
+        File javaFile = new File(tempDir.toFile(), "PingController.java");
+        try (FileWriter writer = new FileWriter(javaFile)) {
+            writer.write("""
+                @RestController
+                @RequestMapping(path = "ping", method = RequestMethod.GET)
+                public class PingController {
+                    @RequestMapping
+                    public String ping() { return "pong"; }
+                }
+            """);
+        }
+        List<RestEndpoint> endpoints = RestControllerAnalyzer.extractEndpoints(tempDir.toFile());
+        assertEquals(1, endpoints.size());
+        assertEquals("GET", endpoints.get(0).httpMethod);
+        assertEquals("/ping", endpoints.get(0).fullPath);
+        assertEquals(List.of("GET /ping"), endpoints.get(0).routeKeys);
+    }
+
+    @Test
+    void testFullyQualifiedAnnotations(@TempDir Path tempDir) throws Exception {
+        File javaFile = new File(tempDir.toFile(), "OrderController.java");
+        try (FileWriter writer = new FileWriter(javaFile)) {
+            writer.write("""
+                @org.springframework.web.bind.annotation.RestController
+                @org.springframework.web.bind.annotation.RequestMapping("/orders")
+                public class OrderController {
+                    @org.springframework.web.bind.annotation.DeleteMapping("/{id}")
+                    public void delete() {}
+                }
+            """);
+        }
+        List<RestEndpoint> endpoints = RestControllerAnalyzer.extractEndpoints(tempDir.toFile());
+        assertEquals(1, endpoints.size());
+        assertEquals("DELETE", endpoints.get(0).httpMethod);
+        assertEquals("/orders/{id}", endpoints.get(0).fullPath);
+    }
+}
@@ -0,0 +1,32 @@
+package com.example.springboot_backend;
+
+import org.junit.jupiter.api.Test;
+import java.util.List;
+import static org.junit.jupiter.api.Assertions.*;
+
+public class RestEndpointTest {
+    @Test
+    void testJoinPaths() {
+        assertEquals("/api/users/{id}", RestEndpoint.joinPaths("/api/", "users/{id}/"));
+        assertEquals("/orders", RestEndpoint.joinPaths("", "//orders"));
+        assertEquals("/", RestEndpoint.joinPaths("", "/"));
+        assertNull(RestEndpoint.joinPaths("/api", "(Paths.BASE + \"/x\")"));
+        assertNull(RestEndpoint.joinPaths("(Paths.BASE)", "/x"));
+    }
+
+    @Test
+    void testCanonicalRouteCollapsesVariables() {
+        assertEquals("/users/{}/files/{}.{}", RestEndpoint.canonicalRoute("/users/{id}/files/{name}.{ext}"));
+        assertEquals("/v/{}", RestEndpoint.canonicalRoute("/v/{version:\\d{1}}"));
+    }
+
+    @Test
+    void testLegacyConstructorKeepsSingleMethod() {
+        RestEndpoint endpoint = new RestEndpoint("A", "m", "DELETE", "items/{id}");
+        assertEquals("DELETE", endpoint.httpMethod);
+        assertEquals("", endpoint.classPath);
+        assertEquals(List.of("DELETE /items/{}"), endpoint.routeKeys);
+        RestEndpoint any = new RestEndpoint("A", "m", "REQUEST", "/x");
+        assertEquals(RestEndpoint.ALL_METHODS, any.httpMethods);
+    }
+}